@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+bench_excel.py
+
+메타데이터 엑셀 저장 / 읽기 시간과 최대 메모리(peak RSS) 비교.
+
+- pandas write : DataFrame.to_excel (기존 ExcelDataModel.save / ExcelController.save_metadata)
+- stream write : model/excel.write_rows (openpyxl write_only, 행을 하나씩 기록)
+- pandas read  : pd.read_excel → df.iterrows() (기존 ShotGridModel.load_excel / iter_rows)
+- stream read  : model/excel.iter_rows (read_only, 행 tuple generator)
+
+    python benchmarks/bench_excel.py                        # 10k / 50k / 100k 행
+    python benchmarks/bench_excel.py --rows 10000 --keep /tmp/excel_bench
+
+- 경우마다 새 파이썬 프로세스에서 실행해 peak RSS 가 서로 섞이지 않게 한다.
+  (RSS = import 후 기준값 / 측정 후 최대값, Linux ru_maxrss 기준)
+- 행은 SequenceRecord.as_row() 와 같은 12 열.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import subprocess
+import importlib.util
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_ROWS = (10_000, 50_000, 100_000)
+COLUMNS = ["SEQ", "SHOT", "VER", "SCAN", "FRANGE", "TCODE", "COLORSPACE",
+           "DATETIME", "CAM", "MOVIE", "FCHECK", "THUMB"]
+CASES = ("pandas_write", "stream_write", "pandas_read", "stream_read")
+
+
+def _load(name, rel_path):
+    # app 패키지는 sgtk 를 import 하므로 모듈 파일만 직접 로드
+    spec = importlib.util.spec_from_file_location(name, ROOT / rel_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _rows(n):
+    for i in range(n):
+        seq = f"S{i // 100:03d}"
+        shot = f"{seq}_SH{i % 100 * 10:04d}"
+        yield (seq, shot, f"v{i % 7 + 1:03d}", f"/show/scan/20250516/{seq}/{shot}",
+               "1001-1100", "01:00:00:00", "ACES - ACEScg", "2025-05-16 12:00:00",
+               "ARRI ALEXA 35", "", "OK", "")
+
+
+def _max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+# ─── 자식 프로세스: 경우 하나만 실행 ────────────────────────────
+def _child(case, rows, path):
+    import pandas as pd
+    excel = _load("excel", "python/app/model/excel.py")
+    base = _max_rss_mb()
+
+    t0 = time.perf_counter()
+    count = 0
+    if case == "pandas_write":
+        df = pd.DataFrame.from_records(list(_rows(rows)), columns=COLUMNS)
+        df.to_excel(path, index=False)
+        count = len(df)
+    elif case == "stream_write":
+        count = excel.write_rows(Path(path), COLUMNS, _rows(rows))
+    elif case == "pandas_read":
+        df = pd.read_excel(path)
+        for _, row in df.iterrows():
+            count += 1 if row["SHOT"] else 0
+    elif case == "stream_read":
+        it = excel.iter_rows(Path(path))
+        shot = COLUMNS.index("SHOT")
+        next(it)
+        for row in it:
+            count += 1 if row[shot] else 0
+    elapsed = time.perf_counter() - t0
+
+    print(json.dumps({"case": case, "rows": count, "sec": elapsed,
+                      "base_mb": base, "peak_mb": _max_rss_mb()}))
+
+
+def _run_child(case, rows, path):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", case, "--rows", str(rows), "--path", str(path)],
+        capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        print(f"[ERROR] {case} {rows}: {out.stderr.strip().splitlines()[-1:]}")
+        return None
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, action="append", help="행 수 (여러 번 지정 가능)")
+    parser.add_argument("--keep", help="엑셀 파일을 남길 폴더 (기본: 임시 폴더 후 삭제)")
+    parser.add_argument("--child", choices=CASES, help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.rows[0], args.path)
+        return 0
+
+    out_dir = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="bench_excel_"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    print(f"{'case':<14}{'rows':>8}{'time':>10}{'peak RSS':>11}{'(+import)':>11}{'file':>9}")
+    try:
+        for rows in args.rows or DEFAULT_ROWS:
+            pandas_path = out_dir / f"pandas_{rows}.xlsx"
+            stream_path = out_dir / f"stream_{rows}.xlsx"
+            for case in CASES:
+                # 읽기는 같은 방식으로 쓴 파일을 읽는다 (내용은 같음)
+                path = pandas_path if case.startswith("pandas") else stream_path
+                r = _run_child(case, rows, path)
+                if r is None:
+                    continue
+                size = path.stat().st_size / 1e6 if path.exists() else 0.0
+                print(f"{case:<14}{r['rows']:>8}{r['sec']:>9.2f}s{r['peak_mb']:>8.0f} MB"
+                      f"{r['peak_mb'] - r['base_mb']:>8.0f} MB{size:>7.1f}MB")
+    finally:
+        if not args.keep:
+            shutil.rmtree(out_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+bench_exr_header.py
+
+native EXR header 파서(model/exr_header.py) 와 OIIO 경로의 header 추출 시간 비교.
+
+    python benchmarks/bench_exr_header.py /home/rapa/show/scandata_project/product/scan/20241226_2
+
+- OIIO 가 현재 파이썬에서 import 되면 in-process ImageInput 으로,
+  아니면 앱과 같은 rez OIIO worker 로 측정한다. (--no-oiio 로 생략 가능)
+"""
+import os
+import sys
+import time
+import argparse
+import importlib.util
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+REZ_ENV_CMD = "/home/rapa/rez/rez_install/bin/rez/rez-env"
+REZ_OIIO_PKG = "oiio-2.5.13"
+
+
+def _load(name, rel_path):
+    # app 패키지는 sgtk 를 import 하므로 모듈 파일만 직접 로드
+    spec = importlib.util.spec_from_file_location(name, ROOT / rel_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _collect(roots, limit):
+    files = []
+    for root in roots:
+        for dirpath, _, names in os.walk(root):
+            files += [os.path.join(dirpath, n) for n in sorted(names) if n.endswith(".exr")]
+    return files[:limit] if limit else files
+
+
+def _run(label, fn, files):
+    t0 = time.perf_counter()
+    failed = 0
+    for f in files:
+        try:
+            fn(f)
+        except Exception:
+            failed += 1
+    dt = time.perf_counter() - t0
+    per = dt / max(len(files), 1) * 1000
+    print(f"{label:<18} {len(files):>6} files  {dt:8.3f}s  {per:8.2f} ms/file  failed={failed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("roots", nargs="+")
+    parser.add_argument("--limit", type=int, default=0, help="최대 파일 수 (0 = 전체)")
+    parser.add_argument("--no-oiio", action="store_true")
+    args = parser.parse_args()
+
+    exr_header = _load("exr_header", "python/app/model/exr_header.py")
+    files = _collect(args.roots, args.limit)
+    if not files:
+        print("[ERROR] EXR 파일 없음"); return 1
+
+    _run("native header", exr_header.read_exr_header, files)
+
+    if args.no_oiio:
+        return 0
+    try:
+        import OpenImageIO as oiio
+
+        def oiio_header(path):
+            img = oiio.ImageInput.open(path)
+            spec = img.spec()
+            meta = {k: spec.extra_attrib(k) for k in spec.extra_attrib_names()}
+            img.close()
+            return meta
+
+        _run("OIIO in-process", oiio_header, files)
+    except ImportError:
+        oiio_worker = _load("oiio_worker", "python/app/controller/oiio_worker.py")
+        worker = oiio_worker.OIIOWorker(
+            [REZ_ENV_CMD, REZ_OIIO_PKG, "--", "python", "-u", oiio_worker.__file__]
+        )
+        try:
+            _run("OIIO rez worker", worker.header, files)
+        finally:
+            worker.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
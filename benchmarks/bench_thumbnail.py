@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+bench_thumbnail.py
+
+Browse 썸네일 생성 시간 비교.
+
+- current : 전체 해상도 float 디코딩 → clip*255 → PIL LANCZOS (기존 generate_thumbnail)
+- fast    : MIP level / 행 건너뛰기 / RGB 채널만 읽기 → NumPy box filter → display transform LUT → uint8
+            (oiio_worker.read_thumbnail, Browse 의 ThumbnailStore 가 read_thumbnail_rgb 로 쓰는 경로)
+
+    python benchmarks/bench_thumbnail.py /home/rapa/show/scandata_project/product/scan/20241226_2 --limit 20
+    python benchmarks/bench_thumbnail.py --synthetic 4096x2160     # OIIO 없이 후처리 비용만 측정 (+ 가로세로 비율 확인)
+
+- 실제 파일은 OIIO 가 현재 파이썬에서 import 되면 in-process 로, 아니면 앱과 같은 rez OIIO worker 로 읽는다.
+- --synthetic 은 메모리 배열을 ImageInput 처럼 흉내 내므로 디코딩 시간은 포함되지 않는다.
+"""
+import os
+import sys
+import time
+import argparse
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+REZ_ENV_CMD = "/home/rapa/rez/rez_install/bin/rez/rez-env"
+REZ_OIIO_PKG = "oiio-2.5.13"
+THUMB_SIZE = 512
+
+
+def _load(name, rel_path):
+    # app 패키지는 sgtk 를 import 하므로 모듈 파일만 직접 로드
+    spec = importlib.util.spec_from_file_location(name, ROOT / rel_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+display_transform = _load("display_transform", "python/app/model/display_transform.py")
+
+
+def _collect(roots, limit):
+    files = []
+    for root in roots:
+        for dirpath, _, names in os.walk(root):
+            files += [os.path.join(dirpath, n) for n in sorted(names) if n.endswith(".exr")]
+    return files[:limit] if limit else files
+
+
+def _current_thumbnail(w, h, nch, pix):
+    # format_converter.generate_thumbnail 과 같은 처리
+    rgb = np.asarray(pix).reshape(h, w, nch)
+    rgb = rgb[:, :, :3] if nch >= 3 else np.repeat(rgb[:, :, 0:1], 3, axis=2)
+    rgb = (np.clip(rgb, 0, 1) * 255).astype(np.uint8)
+    img = Image.fromarray(rgb, mode="RGB")
+    if w >= 3840 and h >= 2160:
+        return [img.resize((1920, 1080), Image.LANCZOS), img.resize((2048, 1080), Image.LANCZOS)]
+    ratio = 1080 / max(w, h)
+    return [img.resize((round(w * ratio), round(h * ratio)), Image.LANCZOS)]
+
+
+def _fast_thumbnail(px):
+    return Image.fromarray(display_transform.get_display_transform().apply(px), mode="RGB")
+
+
+def _run(label, fn, items):
+    times = []
+    failed = 0
+    for item in items:
+        t0 = time.perf_counter()
+        try:
+            fn(item)
+        except Exception as e:
+            failed += 1
+            print(f"[WARN] {label}: {e}")
+            continue
+        times.append(time.perf_counter() - t0)
+    if not times:
+        print(f"{label:<22} 실패 {failed}")
+        return
+    ms = np.array(times) * 1000
+    print(f"{label:<22} n={len(ms):<4} mean {ms.mean():8.1f} ms  median {np.median(ms):8.1f} ms"
+          f"  max {ms.max():8.1f} ms  failed={failed}")
+
+
+# ─── --synthetic 용 ImageInput 흉내 ─────────────────────────────
+class _FakeSpec:
+    def __init__(self, arr):
+        self.height, self.width, self.nchannels = arr.shape
+        self.x = self.y = 0
+        self.channelnames = ["R", "G", "B", "A", "Z"][:self.nchannels]
+
+    def get_string_attribute(self, name, default=""):
+        # resolve_selection 이 part 이름을 찾을 때 사용 (single-part 라 이름 없음)
+        return default
+
+
+class _FakeImageInput:
+    def __init__(self, arr):
+        self.arr = arr
+
+    def spec(self):
+        return _FakeSpec(self.arr)
+
+    def seek_subimage(self, subimage, miplevel):
+        return subimage == 0 and miplevel == 0
+
+    def read_scanlines(self, subimage, miplevel, ybegin, yend, z, chbegin, chend, fmt):
+        return self.arr[ybegin:yend, :, chbegin:chend]
+
+    def read_image(self, format=None):
+        return self.arr
+
+    def close(self):
+        pass
+
+
+class _FakeOIIO:
+    FLOAT = "float"
+
+    def __init__(self, arr):
+        self.arr = arr
+
+        class ImageInput:
+            @staticmethod
+            def open(path):
+                return _FakeImageInput(arr)
+
+        self.ImageInput = ImageInput
+
+
+# 축소 배율이 홀수(5, 7 …)인 크기 포함 – 세로 배율이 가로와 달라지면 썸네일이 늘어남
+_ASPECT_SIZES = ((2560, 1440), (3424, 2202), (4096, 2160), (1920, 1080), (2048, 858))
+
+
+def _check_aspect(oiio_worker, size):
+    """read_thumbnail 결과의 가로세로 비율이 원본과 1 px 안에서 같은지"""
+    ok = True
+    for w, h in _ASPECT_SIZES:
+        arr = np.zeros((h, w, 3), dtype=np.float32)
+        out_h, out_w = oiio_worker.read_thumbnail(_FakeOIIO(arr), np, "", size).shape[:2]
+        expected_h = out_w * h / w
+        good = abs(out_h - expected_h) <= 1
+        ok &= good
+        print(f"aspect {w}x{h} → {out_w}x{out_h} (기대 높이 {expected_h:.1f}) {'OK' if good else 'FAIL'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("roots", nargs="*")
+    parser.add_argument("--limit", type=int, default=20, help="최대 파일 수 (0 = 전체)")
+    parser.add_argument("--size", type=int, default=THUMB_SIZE, help="fast 썸네일 긴 변 크기")
+    parser.add_argument("--synthetic", metavar="WxH", help="EXR 대신 임의 float 배열로 측정 (예: 4096x2160)")
+    parser.add_argument("--repeat", type=int, default=10, help="--synthetic 반복 횟수")
+    args = parser.parse_args()
+
+    oiio_worker = _load("oiio_worker", "python/app/controller/oiio_worker.py")
+
+    if args.synthetic:
+        w, h = (int(v) for v in args.synthetic.lower().split("x"))
+        arr = np.random.default_rng(0).random((h, w, 4), dtype=np.float32)
+        fake = _FakeOIIO(arr)
+        items = range(args.repeat)
+        print(f"synthetic {w}x{h} RGBA float32 (디코딩 제외)")
+        _run("current (full+LANCZOS)", lambda _: _current_thumbnail(w, h, 4, arr), items)
+        _run(f"fast ({args.size})",
+             lambda _: _fast_thumbnail(oiio_worker.read_thumbnail(fake, np, "", args.size)), items)
+        return 0 if _check_aspect(oiio_worker, args.size) else 1
+
+    files = _collect(args.roots, args.limit)
+    if not files:
+        print("[ERROR] EXR 파일 없음 (경로를 주거나 --synthetic 사용)"); return 1
+
+    try:
+        import OpenImageIO as oiio
+
+        def read_full(path):
+            img = oiio.ImageInput.open(path)
+            spec = img.spec()
+            pix = img.read_image(format=oiio.FLOAT)
+            img.close()
+            return spec.width, spec.height, spec.nchannels, pix
+
+        def read_fast(path):
+            return oiio_worker.read_thumbnail(oiio, np, path, args.size)
+
+        worker = None
+        print("OIIO in-process")
+    except ImportError:
+        worker = oiio_worker.OIIOWorker(
+            [REZ_ENV_CMD, REZ_OIIO_PKG, "--", "python", "-u", oiio_worker.__file__]
+        )
+        read_full = worker.read
+
+        def read_fast(path):
+            return worker.thumb(path, args.size)
+
+        print("OIIO rez worker")
+
+    try:
+        _run("current (full+LANCZOS)", lambda f: _current_thumbnail(*read_full(f)), files)
+        _run(f"fast ({args.size})", lambda f: _fast_thumbnail(read_fast(f)), files)
+    finally:
+        if worker is not None:
+            worker.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,10 +7,28 @@ from tank.platform.qt import QtCore, QtGui
 from ..view.scandata_ui import Ui_Dialog
 from ..controller.excel_controller import ExcelController
 from ..controller.format_converter import Format_Converter
+from ..model.exr_header import read_exr_header
+from ..model.metadata_cache import get_default_cache
+from ..model.dir_scanner import next_version
+from ..model.frame_set import FrameSet
+from ..model.scan_watcher import ScanWatcher
+from ..model.thumbnail_store import get_default_thumbnail_store
+from ..model.sequence_store import SequenceRecord, SequenceStore, parse_version
+from .scan_worker import ScanTask
+from .table_model import SequenceTableModel, SequenceProxyModel, ThumbnailDelegate, THUMB_ROW_HEIGHT
 
-SELECT, THUMB, SEQ, SHOT, VER, SCAN, FRANGE, TCODE, COLORSPACE, DATETIME, CAM, UNUSED, MOVIE = range(13)
+SELECT, THUMB, SEQ, SHOT, VER, SCAN, FRANGE, TCODE, COLORSPACE, DATETIME, CAM, UNUSED, MOVIE, FCHECK = range(14)
+
+# watch 모드에서 변경 사항을 확인하는 간격 (ms)
+WATCH_INTERVAL_MS = 3000
+# 검색창 입력이 멈춘 뒤 필터를 적용하기까지 기다리는 시간 (ms)
+SEARCH_DELAY_MS = 150
+
+_TC_STRING = re.compile(r"^\d{2}:\d{2}:\d{2}[:;]\d{2}$")
 
 def _decode_timecode(tc_tuple, fps=24):
+    if isinstance(tc_tuple, str) and _TC_STRING.match(tc_tuple):
+        return tc_tuple   # 이미 HH:MM:SS:FF 로 디코딩된 값 (native header 경로)
     if isinstance(tc_tuple, str):
         try:
             tc_tuple = ast.literal_eval(tc_tuple)
@@ -33,24 +51,57 @@ def _decode_timecode(tc_tuple, fps=24):
         print(f"[WARN] Timecode decode failed: {e}, input: {tc_tuple}")
         return ""
 
-class BrowserLoad():
-    def __init__(self, ui, dialog=None , excel_ctrl=None, context=None, last_open_dir=None):
+class BrowserLoad(QtCore.QObject):
+    def __init__(self, ui, dialog=None , excel_ctrl=None, context=None, last_open_dir=None, store=None):
+        super().__init__()
         self.ui = ui
         self.dialog = dialog
         self.context = context  # <- 받아두면 추후 Shotgun Context에도 활용 가능
         self.last_open_dir = last_open_dir or "/home/rapa/show/scandata_project/product/scan"
 
         self.format_converter = Format_Converter()
-        self.excel_controller = ExcelController(self.ui.table, self.ui.status_line, self.ui)
-
-        self.ui.excel_save.clicked.connect(self.save_selected_metadata)
-        self.ui.table.setColumnCount(13)
-        self.ui.table.setHorizontalHeaderLabels([
-            "Select", "Thumbnail", "Seq Name", "Shot Name", "Version",
-            "Scan Path", "Frame Range", "Timecode", "Colorspace",
-            "Date", "Camera", "Unused", "Movie Path"
-        ])
+        self.metadata_cache = get_default_cache()
+        self.thumbnail_store = get_default_thumbnail_store()
+        self._scan_task = None
+
+        # watch 모드 상태
+        self._watcher = None
+        self._watch_roots = []
+        self._watch_pending = set()      # 아직 반영하지 못한 변경 폴더
+        self._rescan_targets = None      # 진행 중인 부분 재스캔 대상 폴더
+        self._rescan_found = set()
+        self._watch_timer = QtCore.QTimer(self)
+        self._watch_timer.setInterval(WATCH_INTERVAL_MS)
+        self._watch_timer.timeout.connect(self._on_watch_tick)
+        # dialog 에서 만든 ExcelController 를 같이 쓴다 (둘이면 Edit / Save 신호가 두 번 연결됨)
+        self.excel_controller = excel_ctrl or ExcelController(self.ui.table, self.ui.status_line, self.ui)
+
+        # 행 데이터는 SequenceStore 하나에만 있고 테이블은 그것을 보여주기만 한다
+        self.store = store if store is not None else SequenceStore()
+        self.table_model = SequenceTableModel(self.store, parent=self.ui.table)
+        # 검색 / 정렬은 index 기반 proxy 가 행 번호 배열만 바꿔서 처리
+        self.proxy_model = SequenceProxyModel(self.table_model, parent=self.ui.table)
+        self.ui.table.setModel(self.proxy_model)
+        self.ui.table.setItemDelegateForColumn(THUMB, ThumbnailDelegate(self.ui.table))
+        self.ui.table.verticalHeader().setDefaultSectionSize(THUMB_ROW_HEIGHT)
+        self.ui.table.horizontalHeader().setSortIndicator(-1, QtCore.Qt.AscendingOrder)
+        self.ui.table.setSortingEnabled(True)
+
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._apply_search)
+        self.ui.search_edit.textChanged.connect(self._search_timer.start)
+        self.proxy_model.modelReset.connect(self._update_search_count)
+        self.proxy_model.layoutChanged.connect(self._update_search_count)
+        self.proxy_model.rowsInserted.connect(self._update_search_count)
+        self.proxy_model.rowsRemoved.connect(self._update_search_count)
+
+        # Save 버튼은 ExcelController._on_save_clicked 하나만 연결 (전체 / 변경 셀 저장을 거기서 고름)
         self.ui.browse_button.clicked.connect(self.load_multiple_folders)
+        self.ui.cache_clear_button.clicked.connect(self._on_clear_cache)
+        self.ui.scan_cancel_button.clicked.connect(self.cancel_scan)
+        self.ui.watch_check.toggled.connect(self._on_watch_toggled)
 
     def load_multiple_folders(self):
         base_dir = self.last_open_dir
@@ -72,15 +123,178 @@ class BrowserLoad():
                 self.last_open_dir = selected_folders[0]               # 최신 선택 경로 저장
                 self.ui.path_edit.setText(self.last_open_dir)          # UI 경로 필드에 반영
                 print(f"[DEBUG] 사용자가 선택한 경로: {self.last_open_dir}")
-                for folder in selected_folders:
-                    self._search_and_add_exr_folders(Path(folder))     # 폴더들 탐색 및 테이블에 추가
+                self._search_and_add_exr_folders([Path(f) for f in selected_folders])  # 폴더들 탐색 및 테이블에 추가
+
+    def _on_clear_cache(self):
+        # 현재 경로 아래 캐시만 비움 (경로가 비어 있으면 전체)
+        prefix = self.ui.path_edit.text().strip() or None
+        removed = self.metadata_cache.invalidate(prefix)
+        self.ui.status_line.setText(f"캐시 {removed}개 항목 삭제")
+
+    def _search_and_add_exr_folders(self, root_folders):
+        # 백그라운드 스캔 시작 – 폴더 하나가 끝나는 대로 _on_scan_row 로 행이 들어온다
+        if isinstance(root_folders, (str, Path)):
+            root_folders = [root_folders]
+        self._watch_roots = [str(r) for r in root_folders]
+        if self.ui.watch_check.isChecked():
+            # 스캔 도중 들어오는 파일도 놓치지 않도록 스캔보다 먼저 감시 시작
+            self._start_watcher()
+        self._start_scan(root_folders)
+        self.ui.status_line.setText("스캔 중...")
+
+    def _start_scan(self, roots, recursive=True, rescan_targets=None):
+        if self._scan_task is not None:
+            self._scan_task.cancel()
+        if self.ui.table.model() is not self.proxy_model:
+            # Excel 을 표시하던 중이면 Browse 결과 model 로 되돌림
+            self.ui.table.setModel(self.proxy_model)
+            self.ui.table.setColumnHidden(UNUSED, True)
+            self.table_model.set_editable(
+                self.ui.table.editTriggers() != QtGui.QAbstractItemView.NoEditTriggers)
+
+        self.metadata_cache.reset_stats()
+        self._rescan_targets = rescan_targets
+        self._rescan_found = set()
+        task = ScanTask(roots, self._build_row_from_scan, recursive=recursive)
+        task.signals.row_ready.connect(self._on_scan_row)
+        task.signals.progress.connect(self._on_scan_progress)
+        task.signals.error.connect(self._on_scan_error)
+        task.signals.finished.connect(self._on_scan_finished)
+        self._scan_task = task
+
+        self.ui.browse_button.setEnabled(False)
+        self.ui.scan_progress.setRange(0, 0)       # 전체 폴더 수를 알기 전까지는 busy 표시
+        self.ui.scan_progress.setVisible(True)
+        self.ui.scan_cancel_button.setVisible(True)
+        QtCore.QThreadPool.globalInstance().start(task)
+
+    def cancel_scan(self):
+        if self._scan_task is not None:
+            self._scan_task.cancel()
+            self.ui.status_line.setText("스캔 취소 중...")
+
+    def _is_current_scan(self) -> bool:
+        # 취소 후 새로 시작한 경우 이전 스캔이 늦게 보낸 신호는 무시
+        return self._scan_task is not None and self.sender() is self._scan_task.signals
+
+    def _on_scan_row(self, data):
+        if self._is_current_scan() and not self._scan_task.cancelled:
+            self._rescan_found.add(data.scan)
+            self._insert_row(data)
+
+    def _on_scan_progress(self, done: int, found: int):
+        if not self._is_current_scan():
+            return
+        self.ui.scan_progress.setRange(0, max(found, 1))
+        self.ui.scan_progress.setValue(done)
+        self.ui.status_line.setText(f"스캔 중 {done}/{found}")
+
+    def _on_scan_error(self, message: str):
+        print(f"[ERROR] 스캔 중 오류: {message}")
+
+    def _on_scan_finished(self, cancelled: bool):
+        if not self._is_current_scan():
+            return
+        self._scan_task = None
+        self.ui.browse_button.setEnabled(True)
+        self.ui.scan_progress.setVisible(False)
+        self.ui.scan_cancel_button.setVisible(False)
+        self.ui.table.resizeColumnsToContents()
+
+        if self._rescan_targets is not None:
+            targets, self._rescan_targets = self._rescan_targets, None
+            if cancelled:
+                self._watch_pending |= targets     # 취소된 부분 재스캔은 다음 tick 에 다시
+                self.ui.status_line.setText("변경 반영 취소")
+                return
+            # 다시 읽었는데 행이 안 나온 폴더 = 삭제되었거나 EXR 이 없어진 폴더
+            removed = 0
+            for path in targets - self._rescan_found:
+                removed += self._remove_row(path)
+            self.ui.status_line.setText(
+                f"변경 반영: 갱신 {len(self._rescan_found)} / 삭제 {removed} "
+                f"({self.metadata_cache.stats_text()})"
+            )
+            return
+
+        state = "Browse 취소" if cancelled else "Browse 완료"
+        self.ui.status_line.setText(f"{state} ({self.metadata_cache.stats_text()})")
+
+    # ─── 검색 / 필터 ─────────────────────────────────────────────
+    def _apply_search(self):
+        try:
+            self.proxy_model.set_filter_text(self.ui.search_edit.text())
+        except ValueError as e:
+            self.ui.search_count.setText(f"검색 오류: {e}")
+
+    def _update_search_count(self, *args):
+        shown, total = self.proxy_model.rowCount(), len(self.store)
+        text = f"{shown} / {total}" if shown != total else f"{total}"
+        self.ui.search_count.setText(f"{text}  ({self.proxy_model.last_elapsed * 1000:.1f} ms)")
 
-    def _search_and_add_exr_folders(self, root_folder: Path):
-        for dirpath, _, filenames in os.walk(root_folder):
-            exr_files = [f for f in filenames if f.endswith(".exr")]
-            if exr_files:
-                exr_paths = sorted(Path(dirpath) / f for f in exr_files)
-                self._add_folder_to_table(Path(dirpath), exr_paths)
+    # ─── Watch 모드 ─────────────────────────────────────────────
+    def _on_watch_toggled(self, checked: bool):
+        if checked:
+            if not self._watch_roots:
+                text = self.ui.path_edit.text().strip()
+                self._watch_roots = [text] if text and os.path.isdir(text) else []
+            if not self._watch_roots:
+                self.ui.status_line.setText("감시할 폴더를 먼저 Browse 하세요")
+                return
+            self._start_watcher()
+        else:
+            self._stop_watcher()
+            self.ui.status_line.setText("Watch 꺼짐")
+
+    def _start_watcher(self):
+        self._stop_watcher()
+        try:
+            self._watcher = ScanWatcher(self._watch_roots)
+        except Exception as e:
+            print(f"[ERROR] watcher 시작 실패: {e}")
+            self.ui.status_line.setText(f"Watch 시작 실패: {e}")
+            return
+        self._watch_timer.start()
+        self.ui.status_line.setText(f"Watch 중 ({self._watcher.mode})")
+
+    def _stop_watcher(self):
+        self._watch_timer.stop()
+        self._watch_pending.clear()
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+
+    def _on_watch_tick(self):
+        if self._watcher is None:
+            return
+        try:
+            changed = self._watcher.poll()
+        except Exception as e:
+            print(f"[WARN] watcher poll 실패: {e}")
+            return
+        # 썸네일 폴더(.thumb) 처럼 숨김 폴더 변화는 무시 (썸네일 저장이 다시 이벤트를 만들지 않게)
+        self._watch_pending |= {d for d in changed if not os.path.basename(d).startswith(".")}
+        if not self._watch_pending or self._scan_task is not None:
+            return   # 스캔이 끝난 뒤 다음 tick 에 반영
+        changed, self._watch_pending = self._watch_pending, set()
+        self._rescan_changed(changed)
+
+    def _rescan_changed(self, changed: set):
+        """바뀐 폴더만 비재귀로 다시 읽어 해당 행만 추가 / 갱신 / 삭제"""
+        targets = set(changed)
+        # seq 폴더에 vNNN 폴더가 생기거나 지워지면 그 아래 샷들의 다음 버전도 달라진다
+        for scan_path in self.store.scans():
+            if os.path.dirname(scan_path) in changed:
+                targets.add(scan_path)
+        print(f"[INFO] 변경 감지: 폴더 {len(changed)}개 → {len(targets)}개 다시 읽음")
+        self.ui.status_line.setText(f"변경 반영 중 ({len(targets)}개 폴더)")
+        self._start_scan(sorted(targets), recursive=False, rescan_targets=targets)
+
+    def _remove_row(self, scan_path: str) -> int:
+        if not self.store.remove(scan_path):
+            return 0
+        print(f"[INFO] 행 삭제: {scan_path}")
+        return 1
 
     def get_next_version(self, seq_path: Path) -> str:
         version_dirs = [p.name for p in seq_path.iterdir() if p.is_dir() and re.match(r"v\d{3}", p.name)]
@@ -92,102 +306,109 @@ class BrowserLoad():
         next_version = max_version + 1
         return f"v{next_version:03d}"
 
-    def _add_folder_to_table(self, folder_path: Path, exr_files):
-        start_frame, end_frame = self._get_frame_range(exr_files)
-        timecode, colorspace = self._extract_exr_metadata(exr_files[0])
+    def _add_folder_to_table(self, folder_path: Path, frames, scan_info=None):
+        # 동기 버전: 행 데이터 계산 후 바로 테이블에 추가
+        data = self._build_row_data(folder_path, frames, scan_info)
+        if data is not None:
+            self._insert_row(data)
+
+    def _build_row_from_scan(self, folder):
+        # ScanTask 의 worker 스레드에서 호출됨
+        frames = FrameSet.from_paths(folder.exr_names, directory=folder.path)
+        return self._build_row_data(folder.path, frames, scan_info=folder)
+
+    def _build_row_data(self, folder_path: Path, frames, scan_info=None):
+        """
+        테이블 한 행에 들어갈 SequenceRecord 계산 (header, 썸네일, 버전 ...).
+        위젯 / store 를 건드리지 않으므로 백그라운드 스레드에서 호출해도 된다.
+        """
+        # frames: FrameSet (경로 리스트를 넘기면 FrameSet 으로 변환)
+        # scan_info(ExrFolder) 가 있으면 스캔 때 모은 mtime / 버전 폴더를 재사용 (stat, iterdir 생략)
+        if not isinstance(frames, FrameSet):
+            frames = self._get_frame_range(frames)
+        if not frames:
+            print(f"[WARN] 프레임 번호가 있는 EXR 이 없습니다: {folder_path}")
+            return None
+        first_exr = frames.path(frames.first)
+        timecode, colorspace = self._extract_exr_metadata(first_exr)
         timecode = _decode_timecode(timecode)
 
-        shot = folder_path.name
-        seq = folder_path.parent.name
         seq_path = folder_path.parent
-        print (seq)
-        print (shot)
-
-        version = self.get_next_version(seq_path)  # v001 대신 동적으로 최신 버전 계산
-        date = self._get_modified_date(folder_path)
-        row = self.ui.table.rowCount()
-        self.ui.table.insertRow(row)
-
-        check_item = QtGui.QTableWidgetItem()
-        check_item.setFlags(QtCore.Qt.ItemIsUserCheckable | QtCore.Qt.ItemIsEnabled)
-        check_item.setCheckState(QtCore.Qt.Checked)
-        self.ui.table.setItem(row, SELECT, check_item)
-
-        def set_item(col, text):
-            print(f"[DEBUG] set_item col={col}, text={text}")
-            item = QtGui.QTableWidgetItem(text if text else "-")
-            item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable)
-            self.ui.table.setItem(row, col, item)
-
-        # 여기서 format_converter 의 generate_thumbnail 호출
-        thumb_path_str = self.format_converter.generate_thumbnail(str(exr_files[0]), str(folder_path / ".thumb"))
-        if thumb_path_str:
-            pixmap = QtGui.QPixmap(thumb_path_str)
-            label = QtGui.QLabel()
-            label.setPixmap(pixmap.scaled(300, 100, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
-            self.ui.table.setRowHeight(row, 110)  # 이미지 높이보다 조금 더 크게
-            self.ui.table.setCellWidget(row, THUMB, label)
+        if scan_info is not None:
+            version = next_version(scan_info.parent_versions)
+            mtime = scan_info.mtime
         else:
-            set_item(THUMB, "")  # 없으면 빈칸 처리
-
-        set_item(SEQ, seq)
-        set_item(SHOT, shot)
-        set_item(VER, version)
-        set_item(SCAN, str(folder_path))
-        set_item(FRANGE, f"{start_frame}-{end_frame}")
-        set_item(TCODE, timecode or "")
-        set_item(COLORSPACE, colorspace or "")
-        set_item(DATETIME, date)
-        set_item(MOVIE, "")
+            version = self.get_next_version(seq_path)  # v001 대신 동적으로 최신 버전 계산
+            mtime = folder_path.stat().st_mtime
+
+        # 썸네일: 원본 내용 key 기반 저장소에서 table / tooltip 크기를 가져옴 (없으면 한 번 읽어 생성)
+        # 디코딩은 ThumbnailDelegate 가 화면에 보이는 행을 그릴 때만 한다
+        tooltip_path = self._ensure_thumbnail(first_exr, "tooltip")
+        thumb_path_str = self.thumbnail_store.get(first_exr, "table") if tooltip_path else None
+
+        return SequenceRecord(
+            scan=str(folder_path),
+            seq=seq_path.name,
+            shot=folder_path.name,
+            frames=frames,
+            version=parse_version(version) or 1,
+            timecode=timecode,
+            colorspace=colorspace,
+            mtime=mtime,
+            date=self._format_date(mtime),
+            thumb_path=thumb_path_str,
+            tooltip_path=tooltip_path,
+        )
+
+    def _insert_row(self, record: SequenceRecord):
+        # GUI 스레드 전용: store 에 추가 (같은 scan 경로가 있으면 갱신, 체크 상태 유지) – 테이블은 알림으로 갱신
+        first = len(self.store) == 0
+        self.store.upsert(record)
+        if first:
+            self.ui.table.resizeColumnsToContents()
 
     def save_selected_metadata(self):
+        # 체크한 행 전체를 새 버전으로 저장
         print("[DEBUG] BrowserLoad.save_selected_metadata 호출됨")
-        row_count = self.ui.table.rowCount()
-        records = []
-
-        for row in range(row_count):
-            item = self.ui.table.item(row, SELECT)
-            if item and item.checkState() == QtCore.Qt.Checked:
-                record = {
-                    "SEQ": self.ui.table.item(row, SEQ).text() if self.ui.table.item(row, SEQ) else "",
-                    "SHOT": self.ui.table.item(row, SHOT).text() if self.ui.table.item(row, SHOT) else "",
-                    "VER": self.ui.table.item(row, VER).text() if self.ui.table.item(row, VER) else "",
-                    "SCAN": self.ui.table.item(row, SCAN).text() if self.ui.table.item(row, SCAN) else "",
-                    "FRANGE": self.ui.table.item(row, FRANGE).text() if self.ui.table.item(row, FRANGE) else "",
-                    "TCODE": self.ui.table.item(row, TCODE).text() if self.ui.table.item(row, TCODE) else "",
-                    "COLORSPACE": self.ui.table.item(row, COLORSPACE).text() if self.ui.table.item(row, COLORSPACE) else "",
-                    "DATETIME": self.ui.table.item(row, DATETIME).text() if self.ui.table.item(row, DATETIME) else "",
-                    "CAM": "",
-                    "MOVIE": self.ui.table.item(row, MOVIE).text() if self.ui.table.item(row, MOVIE) else "",
-                    "THUMB": "",  # 썸네일은 엑셀 저장 제외하거나 따로 처리하세요
-                }
-                records.append(record)
-                # 체크된 항목이 실제로 있는지 확인용도 
-                if item and item.checkState() == QtCore.Qt.Checked:
-                    print(f"[DEBUG] 선택된 row: {row}")
-
-        # 디버그 문구 출력 
-        if records:
-            scan_path = Path(records[0]["SCAN"])
-            print(f"선택된 레코드 개수: {len(records)}")
-        else:
-            self.ui.status_line.setText("선택된 항목이 없습니다.")
+        self.excel_controller.save_checked_records()
 
-        if records: 
-            seq_name = records[0]["SEQ"].split("/")[-1]  # 예: "/home/.../20241226_2" → "20241226_2"
-            self.excel_controller.save_metadata(records, scan_path, seq_name=seq_name)
 
+    def _ensure_thumbnail(self, exr_file: str, size_name: str):
+        def read_rgb(max_size):
+            try:
+                return self.format_converter.read_thumbnail_rgb(exr_file, max_size)
+            except Exception as e:
+                print(f"[ERROR] 썸네일 생성 실패: {exr_file} ({e})")
+                return None
+        return self.thumbnail_store.ensure(exr_file, size_name, read_rgb)
 
-    def _get_frame_range(self, files):
-        frame_nums = []
-        for f in files:
-            m = re.search(r"(\d+)(?=\.exr$)", f.name)
-            if m:
-                frame_nums.append(int(m.group(1)))
-        return min(frame_nums), max(frame_nums)
+    def _get_frame_range(self, files) -> FrameSet:
+        # first / last 외에 빠진 프레임(missing) 도 FrameSet 에서 바로 확인 가능
+        return FrameSet.from_paths(files)
 
 
     def _extract_exr_metadata(self, exr_file):
+        # 0) 파일 identity(inode, size, mtime) 가 같으면 캐시 값 사용
+        cached = self.metadata_cache.get(exr_file, kind="browse_meta")
+        if cached is not None:
+            return cached["timecode"], cached["colorspace"]
+
+        timecode, colorspace = self._read_exr_metadata(exr_file)
+        if timecode is not None or colorspace is not None:
+            self.metadata_cache.put(
+                exr_file, {"timecode": timecode, "colorspace": colorspace}, kind="browse_meta"
+            )
+        return timecode, colorspace
+
+    def _read_exr_metadata(self, exr_file):
+        # 1) OIIO 없이 header 만 직접 해석 (파일 앞 수 KB 만 읽음)
+        try:
+            header = read_exr_header(exr_file, wanted={"timeCode", "oiio:ColorSpace", "colorSpace"})
+            return header.timecode_string(), header.colorspace
+        except Exception as e:
+            print(f"[WARN] native EXR header 해석 실패, OIIO 로 재시도: {e}")
+
+        # 2) fallback: OIIO (직접 import 또는 rez worker)
         try:
             meta = self.format_converter._get_exr_header(str(exr_file))
             timecode = meta.get("smpte:TimeCode")
@@ -197,8 +418,8 @@ class BrowserLoad():
             print(f"[ERROR] 메타데이터 추출 실패: {e}")
             return None, None
 
-    def _get_modified_date(self, path: Path) -> str:
-        return QtCore.QDateTime.fromSecsSinceEpoch(int(path.stat().st_mtime)).toString("yyyy-MM-dd HH:mm:ss")
+    def _format_date(self, mtime: float) -> str:
+        return QtCore.QDateTime.fromSecsSinceEpoch(int(mtime)).toString("yyyy-MM-dd HH:mm:ss")
 
     def _on_load_excel(self):
         excel_file, _ = QtGui.QFileDialog.getOpenFileName(
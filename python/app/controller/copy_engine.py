@@ -0,0 +1,244 @@
+# controller/copy_engine.py
+"""
+EXR 시퀀스 복사 엔진.
+
+shutil.copy2 를 한 파일씩 도는 대신 여러 파일을 thread pool 에서 동시에 복사하고,
+파일마다 가장 싼 방법부터 시도한다.
+
+  mode="auto"     : reflink(FICLONE) → copy_file_range → sendfile → read/write
+  mode="hardlink" : 같은 파일시스템이면 hardlink, 아니면 auto 와 같음
+  mode="copy"     : reflink 없이 copy_file_range → sendfile → read/write
+
+- reflink 는 btrfs / XFS(reflink=1) 등에서 데이터 복사 없이 블록을 공유한다. (이후 수정 시 분리 – CoW)
+- copy_file_range / sendfile 은 커널 안에서 복사하므로 사용자 공간 버퍼를 거치지 않는다.
+  (NFS 4.2 는 server-side copy 로 처리될 수 있음)
+- hardlink 는 원본과 inode 를 공유하므로 원본이 수정되면 복사본도 바뀐다 – 명시적으로 고를 때만 사용.
+- 모든 방법은 <dst>.part 에 쓰고 os.replace 로 바꾸므로 중간에 실패해도 깨진 파일이 남지 않는다.
+- checksum=True 면 read/write 루프가 읽은 chunk 를 그대로 BLAKE2b 에 넣어 복사와 같은 한 번의 읽기로 계산한다.
+  커널 복사(copy_file_range / sendfile)는 데이터가 사용자 공간을 거치지 않아 hash 를 같이 구할 수 없으므로
+  이 모드에서는 건너뛰고, 데이터를 옮기지 않는 reflink / hardlink 만 원본을 한 번 읽어 계산한다.
+"""
+import os
+import time
+import errno
+import fcntl
+import shutil
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..model.checksum_manifest import new_hasher, hash_file
+
+COPY_MODES = ("auto", "hardlink", "copy")
+COPY_WORKERS = int(os.environ.get("SCANDATA_COPY_WORKERS", "4"))
+
+_FICLONE = 0x40049409                         # linux/fs.h  _IOW(0x94, 9, int)
+_CHUNK = 64 * 1024 * 1024                     # copy_file_range / sendfile 한 번에 넘길 크기
+_BUF_SIZE = 8 * 1024 * 1024                   # read/write fallback 버퍼
+# 이 errno 들은 '이 방법을 이 파일시스템에서 못 씀' → 다음 방법으로
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTTY,
+                errno.EPERM}
+
+
+@dataclass
+class CopyResult:
+    src: str
+    dst: str
+    size: int = 0
+    method: str = ""                          # reflink / hardlink / copy_file_range / sendfile / readwrite
+    error: Optional[str] = None
+    digest: Optional[str] = None              # checksum=True 일 때 BLAKE2b-128 hex
+
+
+@dataclass
+class CopyReport:
+    results: List[CopyResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def failed(self) -> List[CopyResult]:
+        return [r for r in self.results if r.error]
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(r.size for r in self.results if not r.error)
+
+    @property
+    def throughput(self) -> float:
+        """MB/s (reflink / hardlink 는 데이터를 옮기지 않으므로 실제 디스크 속도와 다를 수 있음)"""
+        return self.total_bytes / (1024 * 1024) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def methods(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for r in self.results:
+            if not r.error:
+                counts[r.method] = counts.get(r.method, 0) + 1
+        return counts
+
+    def summary(self) -> str:
+        methods = ", ".join(f"{k} {v}" for k, v in sorted(self.methods().items()))
+        return (f"{len(self.results) - len(self.failed)}/{len(self.results)} files, "
+                f"{self.total_bytes / (1024 ** 3):.2f} GB, {self.elapsed:.1f}s "
+                f"({self.throughput:.0f} MB/s) [{methods}]")
+
+
+# ─── 방법별 복사 ─────────────────────────────────────────────
+# 각 방법은 (src_fd, dst_fd, size, hasher) 를 받는다. hasher 를 채우는 건 readwrite 뿐
+def _reflink(src_fd: int, dst_fd: int, size: int, hasher=None):
+    fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int, hasher=None):
+    copied = 0
+    while copied < size:
+        n = os.copy_file_range(src_fd, dst_fd, min(_CHUNK, size - copied))
+        if n == 0:
+            break
+        copied += n
+    if copied != size:
+        raise OSError(errno.EIO, f"copy_file_range 가 {copied}/{size} byte 에서 멈춤")
+
+
+def _sendfile(src_fd: int, dst_fd: int, size: int, hasher=None):
+    offset = 0
+    while offset < size:
+        n = os.sendfile(dst_fd, src_fd, offset, min(_CHUNK, size - offset))
+        if n == 0:
+            break
+        offset += n
+    if offset != size:
+        raise OSError(errno.EIO, f"sendfile 이 {offset}/{size} byte 에서 멈춤")
+
+
+def _readwrite(src_fd: int, dst_fd: int, size: int, hasher=None):
+    buf = bytearray(_BUF_SIZE)
+    view = memoryview(buf)
+    while True:
+        n = os.readv(src_fd, [buf])
+        if not n:
+            break
+        if hasher is not None:
+            hasher.update(view[:n])
+        written = 0
+        while written < n:
+            written += os.write(dst_fd, view[written:n])
+
+
+_KERNEL_METHODS = [("copy_file_range", _copy_file_range), ("sendfile", _sendfile)]
+if not hasattr(os, "copy_file_range"):           # Python < 3.8
+    _KERNEL_METHODS = _KERNEL_METHODS[1:]
+
+_METHODS = {
+    "auto": [("reflink", _reflink)] + _KERNEL_METHODS + [("readwrite", _readwrite)],
+    "copy": _KERNEL_METHODS + [("readwrite", _readwrite)],
+}
+
+# checksum 을 같이 구할 때: 커널 복사 + 다시 읽기 대신 한 번 읽으면서 쓰기 (reflink 는 데이터를 옮기지 않음)
+_CHECKSUM_METHODS = {
+    "auto": [("reflink", _reflink), ("readwrite", _readwrite)],
+    "copy": [("readwrite", _readwrite)],
+}
+
+# (원본 st_dev, 대상 st_dev, 방법) 별로 실패한 방법은 다시 시도하지 않음
+_unsupported: Dict[Tuple[int, int, str], bool] = {}
+_unsupported_lock = threading.Lock()
+
+
+def _tmp_path(dst: str) -> str:
+    return f"{dst}.{os.getpid()}.{threading.get_ident()}.part"
+
+
+def copy_file(src: str, dst: str, mode: str = "auto", checksum: bool = False) -> CopyResult:
+    """
+    src → dst 복사 (dst 가 있으면 덮어씀). 메타데이터(mtime / 권한)는 shutil.copy2 와 같이 유지.
+    checksum=True 면 CopyResult.digest 에 내용 hash. 예외를 던지지 않고 CopyResult.error 에 담는다.
+    """
+    if mode not in COPY_MODES:
+        raise ValueError(f"알 수 없는 복사 방식: {mode} (지원: {', '.join(COPY_MODES)})")
+    src, dst = str(src), str(dst)
+    result = CopyResult(src, dst)
+    tmp = _tmp_path(dst)
+    try:
+        st = os.stat(src)
+        result.size = st.st_size
+
+        if mode == "hardlink":
+            try:
+                os.link(src, tmp)
+                os.replace(tmp, dst)
+                result.method = "hardlink"
+                if checksum:
+                    result.digest = hash_file(dst)
+                return result
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED | {errno.EMLINK}:
+                    raise
+            mode = "auto"                       # 다른 파일시스템 → 일반 복사
+
+        devs = (st.st_dev, os.stat(os.path.dirname(dst) or ".").st_dev)
+        hasher = new_hasher() if checksum else None
+        with open(src, "rb") as fsrc, open(tmp, "wb") as fdst:
+            for name, method in (_CHECKSUM_METHODS if checksum else _METHODS)[mode]:
+                key = devs + (name,)
+                if _unsupported.get(key):
+                    continue
+                try:
+                    method(fsrc.fileno(), fdst.fileno(), st.st_size, hasher)
+                except OSError as e:
+                    if e.errno not in _UNSUPPORTED or name == "readwrite":
+                        raise
+                    with _unsupported_lock:
+                        _unsupported[key] = True
+                    # 일부만 쓰였을 수 있으므로 처음부터 다시
+                    os.ftruncate(fdst.fileno(), 0)
+                    os.lseek(fsrc.fileno(), 0, os.SEEK_SET)
+                    os.lseek(fdst.fileno(), 0, os.SEEK_SET)
+                    continue
+                result.method = name
+                break
+        if checksum:
+            # readwrite 는 복사하면서 구한 값, reflink 는 데이터가 지나가지 않았으므로 한 번 읽어 계산
+            result.digest = hasher.hexdigest() if result.method == "readwrite" else hash_file(src)
+        shutil.copystat(src, tmp)
+        os.replace(tmp, dst)
+    except OSError as e:
+        result.error = f"{type(e).__name__}: {e}"
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+    return result
+
+
+def copy_files(
+    pairs,
+    mode: str = "auto",
+    max_workers: int = COPY_WORKERS,
+    progress: Optional[Callable[[int, int, CopyResult], None]] = None,
+    checksum: bool = False,
+) -> CopyReport:
+    """
+    [(src, dst), ...] 를 max_workers 개 스레드에서 동시에 복사.
+    progress(done, total, result) 를 파일마다 호출. 결과 순서는 pairs 순서와 같다.
+    checksum=True 면 각 결과의 digest 를 채운다. (ChecksumManifest.add 용)
+    """
+    pairs = [(str(s), str(d)) for s, d in pairs]
+    report = CopyReport()
+    if not pairs:
+        return report
+
+    t0 = time.perf_counter()
+    results: List[Optional[CopyResult]] = [None] * len(pairs)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pairs)))) as pool:
+        futures = {pool.submit(copy_file, s, d, mode, checksum): i for i, (s, d) in enumerate(pairs)}
+        for done, fut in enumerate(as_completed(futures), start=1):
+            result = results[futures[fut]] = fut.result()
+            if result.error:
+                print(f"[ERROR] 복사 실패: {result.src} → {result.dst}: {result.error}")
+            if progress is not None:
+                progress(done, len(pairs), result)
+    report.results = results
+    report.elapsed = time.perf_counter() - t0
+    print(f"[INFO] 복사 완료: {report.summary()}")
+    return report
@@ -1,11 +1,18 @@
 import pandas as pd
 from pathlib import Path
 import re
+import zipfile
 from tank.platform.qt import QtCore, QtGui
-from ..model.excel import ExcelDataModel
+from ..model.excel import ExcelDataModel, read_frame, write_frame, write_rows
+from ..model.excel_diff import (
+    CellChange, DirtyCells, ExcelPatchError, append_change_log, cell_text, patch_xlsx,
+    versioned_seq_name,
+)
+from ..model.sequence_store import ROW_FIELDS, SequenceRecord, SequenceStore
+from .table_model import FrameTableModel
 
 class ExcelController(QtGui.QWidget):
-    def __init__(self, table_widget, status_line, ui):
+    def __init__(self, table_widget, status_line, ui, store: SequenceStore = None):
         super().__init__()
         self.ui = ui
         self.table = table_widget
@@ -13,24 +20,40 @@ class ExcelController(QtGui.QWidget):
 
         self.df = None
         self.excel_path: Path | None = None
+        self._record_scans: list[str] = []     # save_metadata 로 저장한 store 행 (scan 경로)
+        self._record_rows: dict[str, int] = {}   # scan 경로 → 엑셀 데이터 행 번호
+
+        # 마지막으로 저장 / 로드한 뒤 편집된 셀 (Save 때 이 셀만 새 버전에 반영)
+        self.dirty = DirtyCells()
+        self._full_save = False                 # 행 구조가 바뀌어 셀 단위로 반영할 수 없음
+        self.store = store
+        if store is not None:
+            store.add_listener(self._on_store_changed)
 
         self.ui.excel_save.clicked.connect(self._on_save_clicked)
         self.ui.excel_edit.clicked.connect(self._on_edit_clicked)
 
 
 
-    def save_metadata(self, records: list[dict], out_dir: Path, seq_name: str = None):
-    
+    def save_metadata(self, records: list, out_dir: Path, seq_name: str = None):
+        # records: SequenceStore 의 SequenceRecord (또는 이미 만든 행 dict)
         print("[DEBUG] save_metadata 호출됨")
         versioned_path = self._get_next_excel_version(out_dir, seq_name)
         self.excel_path = versioned_path
 
-        self.df = pd.DataFrame(records)
+        self._record_scans = [r.scan for r in records if isinstance(r, SequenceRecord)]
+        self._record_rows = {scan: i for i, scan in enumerate(self._record_scans)}
+        rows = [r.as_row() if isinstance(r, SequenceRecord) else r for r in records]
+        columns = list(rows[0]) if rows else []
+        # 값은 tuple 로 한 번만 만들고 DataFrame(다음 Save 비교 기준)과 엑셀이 같이 쓴다
+        values = [tuple(row.get(c) for c in columns) for row in rows]
+        self.df = pd.DataFrame.from_records(values, columns=columns)
+        self._reset_dirty()
         print(f"[DEBUG] save_metadata: DataFrame 생성 완료, rows={len(self.df)}")
 
-        # 직접 저장
-        self.df.to_excel(self.excel_path, index=False)
-        print(f"[DEBUG] save_metadata: 직접 to_excel 호출 완료, 경로: {self.excel_path}")
+        # write_only 로 한 행씩 저장 (openpyxl 셀 객체를 모아 두지 않음)
+        write_rows(self.excel_path, columns, values)
+        print(f"[DEBUG] save_metadata: 엑셀 저장 완료, 경로: {self.excel_path}")
         self.status_line.setText(f"엑셀 저장: {self.excel_path}")
 
 
@@ -53,7 +76,10 @@ class ExcelController(QtGui.QWidget):
             self.status_line.setText("엑셀 파일이 없습니다.")
             return
         try:
-            self.df = pd.read_excel(path)
+            self.df = read_frame(path)
+            self.excel_path = path
+            self._record_scans = []
+            self._record_rows = {}
             print(f"[DEBUG] _load_and_show: 엑셀 로드 완료, row count={len(self.df)}")
             self._df_to_table(self.df)
             self.status_line.setText(f"로드 완료: {path}")
@@ -65,22 +91,118 @@ class ExcelController(QtGui.QWidget):
 
 
     def _df_to_table(self, df):
-        t = self.table
-        t.clear()
-        t.setRowCount(len(df))
-        t.setColumnCount(len(df.columns))
-        t.setHorizontalHeaderLabels(df.columns.tolist())
-
-        for r in range(len(df)):
-            for c, col_name in enumerate(df.columns):
-                item = QtGui.QTableWidgetItem(str(df.iat[r, c]))
-                item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable)
-                t.setItem(r, c, item)
-        t.resizeColumnsToContents()
-        t.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+        # 셀 item 없이 열 list 만 가진 model 로 교체 (잠금 상태로 표시)
+        old = self.table.model()
+        model = FrameTableModel(df, parent=self.table)
+        model.dataChanged.connect(self._on_frame_data_changed)
+        self.table.setModel(model)
+        if isinstance(old, FrameTableModel):
+            old.deleteLater()      # Browse 결과 model 은 BrowserLoad 가 다시 쓰므로 남겨 둠
+        self._reset_dirty()
+        self.table.resizeColumnsToContents()
+        self.table.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+        self.ui.excel_edit.setText("Edit")
+
+    # ---------- 편집 기록 --------------------------------------------
+
+    def _reset_dirty(self):
+        self.dirty.clear()
+        self._full_save = False
+
+    def _on_frame_data_changed(self, top_left, bottom_right, roles=None):
+        # FrameTableModel 은 setData 에서만 dataChanged 를 낸다 (= 사용자가 고친 셀)
+        self.dirty.mark_range(top_left.row(), bottom_right.row(),
+                              top_left.column(), bottom_right.column())
+
+    def _on_store_changed(self, event: str, first: int, last: int, fields: tuple):
+        # Browse 결과를 저장한 뒤 테이블 편집 / Validate / Publish 로 바뀐 값
+        if not self._record_rows:
+            return
+        if event == "updated":
+            columns = [c for f in fields for c in ROW_FIELDS.get(f, ())]
+            if not columns:
+                return
+            col_of = {name: i for i, name in enumerate(self.df.columns)}
+            for row in range(first, last + 1):
+                excel_row = self._record_rows.get(self.store[row].scan)
+                if excel_row is None:
+                    continue
+                for name in columns:
+                    if name in col_of:
+                        self.dirty.mark(excel_row, col_of[name])
+        elif event in ("removed", "reset"):
+            # 저장한 행이 없어졌거나 다시 스캔됨 → 다음 저장은 전체를 다시 만든다
+            self._full_save = True
+
+    def _collect_changes(self, model) -> list[CellChange]:
+        """dirty 셀만 이전 값(self.df) 과 현재 값을 비교"""
+        changes = []
+        rows = {}
+        for row, col in self.dirty:
+            if row >= len(self.df) or col >= len(self.df.columns):
+                continue
+            old = cell_text(self.df.iat[row, col])
+            column = str(self.df.columns[col])
+            if isinstance(model, FrameTableModel):
+                new = model.value(row, col)
+            else:
+                if row not in rows:
+                    record = self.store.get(self._record_scans[row]) if self.store else None
+                    rows[row] = record.as_row() if record is not None else None
+                if rows[row] is None:
+                    continue
+                new = cell_text(rows[row].get(column))
+            if new != old:
+                changes.append(CellChange(row, col, column, old, new))
+        return changes
+
+    def _apply_to_df(self, changes: list[CellChange]):
+        # 다음 저장의 비교 기준을 바뀐 셀만 갱신 (숫자 열에 문자열이 들어가면 그 열만 object 로)
+        for col in {ch.col for ch in changes}:
+            name = self.df.columns[col]
+            if self.df[name].dtype != object:
+                self.df[name] = self.df[name].astype(object)
+        for ch in changes:
+            self.df.iat[ch.row, ch.col] = ch.new
+
+    def _full_frame(self, model):
+        """테이블 / store 의 현재 값 전체로 DataFrame 을 다시 만든다 (예전 저장 방식)"""
+        if isinstance(model, FrameTableModel):
+            df = self.df.astype(object)
+            n = min(len(df), model.rowCount())
+            for c, col in enumerate(df.columns[:model.columnCount()]):
+                df.iloc[:n, c] = model.column_values(c)[:n]
+            return df
+        if self._record_scans and self.store is not None:
+            records = [self.store.get(scan) for scan in self._record_scans]
+            return pd.DataFrame([r.as_row() for r in records if r is not None])
+        return self.df
+
+    def save_checked_records(self) -> bool:
+        """Browse 에서 체크한 행 전체를 새 버전으로 저장 (처음 저장 / 체크한 행 구성이 바뀐 경우)"""
+        records = self.store.checked() if self.store is not None else []
+        if not records:
+            self.status_line.setText("선택된 항목이 없습니다.")
+            return False
+        print(f"선택된 레코드 개수: {len(records)}")
+        self.save_metadata(records, Path(records[0].scan), seq_name=records[0].seq)
+        return True
+
+    def _needs_full_browse_save(self, model) -> bool:
+        # Browse 결과 표시 중: 아직 저장한 적이 없거나, 저장한 행이 사라졌거나, 체크한 행이 달라졌으면 전체 저장
+        if isinstance(model, FrameTableModel) or self.store is None:
+            return False
+        if not self._record_rows or self._full_save:
+            return True
+        return [r.scan for r in self.store.checked()] != self._record_scans
 
     def _on_save_clicked(self):
-        print(f"[DEBUG] _on_save_clicked called, current df: {self.df}")
+        # Save 버튼의 유일한 slot: 처음 저장은 전체, 그 뒤로는 편집한 셀만 다음 버전에 반영
+        print(f"[DEBUG] _on_save_clicked called, dirty cells: {len(self.dirty)}")
+        model = self.table.model()
+        if self._needs_full_browse_save(model):
+            self.save_checked_records()
+            return
         if self.df is None:
             self.status_line.setText("저장할 데이터가 없습니다 (self.df is None)")
             print("[DEBUG] self.df is None")
@@ -90,43 +212,49 @@ class ExcelController(QtGui.QWidget):
             print("[DEBUG] self.df is empty")
             return
 
-        out_dir = self.excel_path.parent if self.excel_path else Path.home()
-        next_version_path = self._get_next_excel_version(out_dir)
+        base_path = self.excel_path if self.excel_path and self.excel_path.exists() else None
+        changes = [] if self._full_save else self._collect_changes(model)
+        if base_path is not None and not self._full_save and not changes:
+            self.status_line.setText("변경된 셀이 없습니다.")
+            return
 
+        out_dir = self.excel_path.parent if self.excel_path else Path.home()
+        # 이전 버전과 같은 seq 이름으로 이어서 번호를 매김
+        next_version_path = self._get_next_excel_version(out_dir, versioned_seq_name(self.excel_path))
         print(f"[DEBUG] Saving new version to: {next_version_path}")
 
-        self.df = self.df.astype(object)
-        for r in range(self.table.rowCount()):
-            for c, col in enumerate(self.df.columns):
-                item = self.table.item(r, c)
-                if item is not None:
-                    self.df.iat[r, c] = item.text()
+        full = base_path is None or self._full_save
+        if not full:
+            try:
+                patch_xlsx(base_path, next_version_path, changes)
+                self._apply_to_df(changes)
+                print(f"[DEBUG] 변경 셀 {len(changes)}개만 반영: {base_path.name} → {next_version_path.name}")
+            except (ExcelPatchError, OSError, zipfile.BadZipFile) as e:
+                print(f"[WARN] 변경 셀만 반영하지 못해 전체를 다시 저장합니다: {e}")
+                full = True
+        if full:
+            self.df = self._full_frame(model)
+            write_frame(next_version_path, self.df)
+            print(f"[DEBUG] 전체 저장, shape: {self.df.shape}")
 
-        print(f"[DEBUG] Updated df from table, shape: {self.df.shape}")
-        print(f"[DEBUG] df head after update:\n{self.df.head()}")
-
-        self.df.to_excel(next_version_path, index=False)
+        append_change_log(next_version_path, base_path, changes, full=full)
         self.excel_path = next_version_path
-        self.status_line.setText(f"엑셀 새 버전 저장 완료: {self.excel_path}")
+        self._reset_dirty()
+        if full:
+            self.status_line.setText(f"엑셀 새 버전 저장 완료: {self.excel_path}")
+        else:
+            self.status_line.setText(f"엑셀 새 버전 저장 완료 (변경 셀 {len(changes)}개): {self.excel_path}")
 
 
     # ---------- slot: Edit 버튼 --------------------------------------
 
     def _on_edit_clicked(self):
-        """테이블 셀 편집 On/Off 토글"""
+        """테이블 셀 편집 On/Off 토글 (셀마다 flag 를 바꾸지 않고 model.flags() 가 판단)"""
         editing = self.table.editTriggers() == QtGui.QAbstractItemView.NoEditTriggers
         new_flag = (QtGui.QAbstractItemView.DoubleClicked
                     if editing else QtGui.QAbstractItemView.NoEditTriggers)
         self.table.setEditTriggers(new_flag)
-
-        for r in range(self.table.rowCount()):
-            for c in range(self.table.columnCount()):
-                item = self.table.item(r, c)
-                if item:
-                    if editing:
-                        item.setFlags(item.flags() | QtCore.Qt.ItemIsEditable)
-                    else:
-                        item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable)
+        self.table.model().set_editable(editing)
 
         self.ui.excel_edit.setText("Lock" if editing else "Edit")
         self.status_line.setText("편집 모드 ON" if editing else "편집 잠금")
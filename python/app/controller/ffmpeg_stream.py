@@ -0,0 +1,190 @@
+# controller/ffmpeg_stream.py
+"""
+디코딩한 프레임을 JPG 로 저장하지 않고 ffmpeg stdin 으로 바로 흘려보내는 인코더.
+
+    with RawVideoEncoder(w, h, [(args, "out.webm"), (args2, "out.mp4")]) as enc:
+        for frame in frames:          # (h, w, 3) uint8 (rgb24) / uint16 (rgb48le)
+            enc.write(frame)
+
+- stdin 은 버퍼 없는 pipe 라서 ffmpeg 가 느리면 write 가 그 자리에서 기다린다 (back-pressure).
+  그래서 앞단 디코더가 미리 읽어 두는 프레임 수만 제한하면 메모리가 일정하게 유지된다.
+- stderr 는 별도 스레드가 계속 비워서 ffmpeg 가 로그 pipe 때문에 멈추지 않게 하고
+  실패 시 마지막 로그 몇 줄을 예외 메시지에 담는다.
+"""
+import os
+import fcntl
+import threading
+import subprocess
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Dict, List
+
+import numpy as np
+
+FFMPEG_BIN = "/home/rapa/local_packages/ffmpeg/7.1.1/platform-linux/arch-x86_64/bin/ffmpeg"
+LIBVPX_LIB = "/home/rapa/local_packages/libvpx/1.14.0/lib"
+
+_F_SETPIPE_SZ = 1031          # linux/fcntl.h
+_PIPE_SIZE = 1 << 20          # 1MB – 기본 64KB 보다 크게 잡아 write syscall 횟수를 줄임
+_STDERR_TAIL = 40
+
+_PIX_DTYPE = {"rgb24": np.uint8, "rgb48le": np.uint16}
+
+
+class FFmpegError(RuntimeError):
+    pass
+
+
+@dataclass
+class OutputProfile:
+    """결과물 하나의 인코딩 설정 (destination_root 기준 subdir/filename 에 저장)"""
+    name: str
+    subdir: str
+    filename: str
+    args: List[str] = field(default_factory=list)
+    bit_depth: int = 8          # 16 이면 입력을 rgb48 로 보냄 (10bit ProRes 등)
+
+    def output_path(self, destination_root) -> str:
+        return os.path.join(str(destination_root), self.subdir, self.filename)
+
+
+# 기본 결과물 설정 – 기존 generate_webm_video / convert_exr_sequence_to_mov 의 옵션과 동일
+DEFAULT_PROFILES: Dict[str, OutputProfile] = {
+    "webm": OutputProfile(
+        "webm", "webm", "output_video.webm",
+        ["-pix_fmt", "yuv420p", "-c:v", "libvpx", "-b:v", "1M"],
+    ),
+    "mp4": OutputProfile(
+        "mp4", "mp4", "output_video.mp4",
+        ["-pix_fmt", "yuv420p", "-c:v", "mpeg4", "-qscale:v", "2"],
+    ),
+    "mov": OutputProfile(
+        "mov", "mov", "output_video.mov",
+        ["-c:v", "prores_ks", "-profile:v", "3", "-pix_fmt", "yuv422p10le"],   # HQ
+        bit_depth=16,
+    ),
+}
+
+
+def resolve_profiles(names, overrides=None) -> List[OutputProfile]:
+    """
+    names 순서대로 OutputProfile 목록을 만든다.
+    overrides: {name: OutputProfile 또는 {필드: 값}} – 기본 설정 일부만 바꿀 때 dict 사용
+    """
+    overrides = overrides or {}
+    profiles = []
+    for name in names:
+        override = overrides.get(name)
+        if isinstance(override, OutputProfile):
+            profiles.append(override)
+            continue
+        base = DEFAULT_PROFILES.get(name)
+        if base is None:
+            raise ValueError(f"알 수 없는 출력 프로파일: {name}")
+        profiles.append(replace(base, **override) if override else base)
+    return profiles
+
+
+def ffmpeg_env(extra_lib: str = LIBVPX_LIB) -> dict:
+    env = os.environ.copy()
+    env["LD_LIBRARY_PATH"] = f"{extra_lib}:{env.get('LD_LIBRARY_PATH', '')}"
+    return env
+
+
+class RawVideoEncoder:
+    def __init__(self, width: int, height: int, outputs, fps: int = 24,
+                 pix_fmt: str = "rgb24", ffmpeg: str = FFMPEG_BIN, env=None):
+        """
+        outputs: [(출력 옵션 리스트, 출력 경로), ...] – 한 프로세스에서 모두 인코딩
+        """
+        if pix_fmt not in _PIX_DTYPE:
+            raise ValueError(f"지원하지 않는 pix_fmt: {pix_fmt}")
+        self.width, self.height = int(width), int(height)
+        self.pix_fmt = pix_fmt
+        self.dtype = _PIX_DTYPE[pix_fmt]
+        self.outputs = [(list(args), str(path)) for args, path in outputs]
+        self.frames_written = 0
+
+        self.cmd = [
+            ffmpeg, "-hide_banner", "-nostats", "-loglevel", "warning",
+            "-f", "rawvideo", "-pix_fmt", pix_fmt,
+            "-s", f"{self.width}x{self.height}", "-framerate", str(fps),
+            "-i", "pipe:0",
+        ]
+        for args, path in self.outputs:
+            self.cmd += args + ["-y", path]
+
+        self._env = env if env is not None else ffmpeg_env()
+        self._proc = None
+        self._stderr_tail = deque(maxlen=_STDERR_TAIL)
+        self._stderr_thread = None
+
+    # ------------------------------------------------------------
+    def start(self):
+        print(f"[INFO] ffmpeg 스트리밍 인코딩 시작: {' '.join(self.cmd)}")
+        self._proc = subprocess.Popen(
+            self.cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE, bufsize=0, env=self._env,
+        )
+        try:
+            fcntl.fcntl(self._proc.stdin.fileno(), _F_SETPIPE_SZ, _PIPE_SIZE)
+        except OSError:
+            pass   # 권한 / 커널 제한이면 기본 크기로 진행
+        self._stderr_thread = threading.Thread(target=self._drain_stderr, daemon=True)
+        self._stderr_thread.start()
+        return self
+
+    def _drain_stderr(self):
+        for line in iter(self._proc.stderr.readline, b""):
+            self._stderr_tail.append(line.decode(errors="replace").rstrip())
+        self._proc.stderr.close()
+
+    def _error(self, message: str) -> FFmpegError:
+        tail = "\n".join(self._stderr_tail)
+        return FFmpegError(f"{message}\n{tail}" if tail else message)
+
+    def write(self, frame: np.ndarray):
+        if self._proc is None:
+            self.start()
+        if frame.shape[:2] != (self.height, self.width) or frame.shape[2] != 3:
+            raise ValueError(
+                f"프레임 크기 불일치: {frame.shape} (기대값 {self.height}x{self.width}x3)"
+            )
+        frame = np.ascontiguousarray(frame, dtype=self.dtype)
+        try:
+            self._proc.stdin.write(memoryview(frame).cast("B"))
+        except (BrokenPipeError, ValueError):
+            self._proc.wait()
+            self._stderr_thread.join(timeout=5)
+            raise self._error(f"ffmpeg 가 입력 도중 종료됨 (exit {self._proc.returncode})")
+        self.frames_written += 1
+
+    def close(self):
+        """stdin 을 닫고 인코딩 완료를 기다림. 실패하면 FFmpegError"""
+        if self._proc is None:
+            return
+        try:
+            self._proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        code = self._proc.wait()
+        self._stderr_thread.join(timeout=5)
+        if code != 0:
+            raise self._error(f"ffmpeg 인코딩 실패 (exit {code})")
+        for _, path in self.outputs:
+            print(f"[INFO] 인코딩 완료 ({self.frames_written} frames): {path}")
+
+    def abort(self):
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.wait()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+            return False
+        self.close()
+        return False
@@ -4,9 +4,16 @@
 import re
 import os
 import sys
+import atexit
 import subprocess
 import shutil
+import threading
+import importlib.util
+import multiprocessing
+from collections import deque
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
 
 import numpy as np
 from PIL import Image
@@ -18,6 +25,15 @@ except ImportError:
         class QWidget:
             def __init__(self): pass
 
+from . import oiio_worker
+from .oiio_worker import OIIOWorker, BandReader, BAND_ROWS
+from .ffmpeg_stream import RawVideoEncoder, resolve_profiles
+from .copy_engine import copy_files, COPY_WORKERS
+from ..model.exr_header import read_exr_header, read_exr_layers, timecode_to_frames
+from ..model.thumbnail_store import get_default_thumbnail_store
+from ..model.display_transform import get_display_transform
+from ..model.checksum_manifest import ChecksumManifest, VERIFY_WORKERS
+
 # ---------------------------------------------------------------------
 # 0. Rez 경로 세팅 & OIIO 로더
 # ---------------------------------------------------------------------
@@ -26,6 +42,16 @@ REZ_SITEPKG = os.path.join(REZ_ROOT, "lib/python3.9/site-packages")
 REZ_ENV_CMD = "/home/rapa/rez/rez_install/bin/rez/rez-env"
 REZ_OIIO_PKG = "oiio-2.5.13"
 
+# header 일괄 추출 시 동시에 여는 파일 수 (NFS 부하 고려해 상한을 둠)
+HEADER_WORKERS = 8
+
+# EXR → JPG 변환 프로세스 수. 프로세스마다 프레임 하나 분량의 float 버퍼를 들고 있으므로
+# 8K RGBA float(약 570MB) 기준 8개면 피크 5GB 정도. SCANDATA_JPG_WORKERS 로 조절 가능
+JPG_WORKERS = int(os.environ.get("SCANDATA_JPG_WORKERS", min(8, os.cpu_count() or 1)))
+
+# ffmpeg 로 스트리밍할 때 미리 디코딩해 두는 스레드 수 (= 순서 대기 중인 프레임 상한의 기준)
+STREAM_DECODE_WORKERS = 4
+
 
 def _ensure_oiio():
     try:
@@ -55,6 +81,104 @@ def _ensure_oiio():
 
 _OIIO = _ensure_oiio()
 
+# ---------------------------------------------------------------------
+# 1. 세션 동안 재사용하는 rez OIIO worker
+# ---------------------------------------------------------------------
+_OIIO_WORKER = None
+
+
+def _oiio_worker_cmd() -> list:
+    return [REZ_ENV_CMD, REZ_OIIO_PKG, "--", "python", "-u", oiio_worker.__file__]
+
+
+def _get_oiio_worker() -> OIIOWorker:
+    """rez-env 를 파일마다 띄우지 않도록 워커 하나를 만들어 재사용"""
+    global _OIIO_WORKER
+    if _OIIO_WORKER is None:
+        _OIIO_WORKER = OIIOWorker(_oiio_worker_cmd())
+        atexit.register(_OIIO_WORKER.close)
+    return _OIIO_WORKER
+
+
+# EXR → JPG ProcessPool 자식이 app 패키지 없이 로드하는 모듈.
+# pool 에 넘기는 함수가 자식에서도 같은 이름으로 import 되도록 부모 / 자식 모두 아래 코드로
+# namespace 이름(다른 toolkit app / DCC 모듈과 겹치지 않게) 의 top-level 모듈로 로드한다
+JPG_WORKER_MODULE = "tk_multi_scandata_jpg_worker"
+_JPG_WORKER_LOADER = (
+    "import sys, importlib.util\n"
+    "if {name!r} not in sys.modules:\n"
+    "    spec = importlib.util.spec_from_file_location({name!r}, {path!r})\n"
+    "    module = importlib.util.module_from_spec(spec)\n"
+    "    sys.modules[{name!r}] = module\n"
+    "    spec.loader.exec_module(module)\n"
+).format(name=JPG_WORKER_MODULE,
+         path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "jpg_worker.py"))
+exec(_JPG_WORKER_LOADER, {})
+jpg_worker = sys.modules[JPG_WORKER_MODULE]
+
+
+def _pool_python() -> str | None:
+    """
+    ProcessPool 자식을 띄울 파이썬. spawn / forkserver 는 sys.executable 을 실행하는데
+    sgtk 가 DCC(Nuke / Maya 등) 안에서 돌면 그건 DCC 실행 파일이므로 그대로 쓰지 않는다.
+    SCANDATA_PYTHON → 파이썬인 sys.executable → 같은 prefix 의 같은 버전 python 순. 없으면 None
+    """
+    exe = os.environ.get("SCANDATA_PYTHON")
+    if exe:
+        return exe
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return sys.executable
+    version = f"python{sys.version_info[0]}.{sys.version_info[1]}"
+    for prefix in (sys.exec_prefix, sys.base_exec_prefix):
+        for name in (version, "python3"):
+            exe = os.path.join(prefix, "bin", name)
+            if os.access(exe, os.X_OK):
+                return exe
+    return None
+
+
+def _to_display_rgb(pix, w: int, h: int, nch: int, bit_depth: int = 8, transfer: str | None = None) -> np.ndarray:
+    """
+    linear float 픽셀 → (h, w, 3) uint8 (rgb24) 또는 uint16 (rgb48).
+    transfer(srgb / rec709 / gamma2.2 …, 기본 SCANDATA_DISPLAY_TRANSFER) LUT 로 변환 (model/display_transform.py)
+    """
+    rgb = np.asarray(pix).reshape(h, w, nch)   # memmap view 그대로 사용 (복사 없음)
+    return get_display_transform(transfer, bit_depth).apply(rgb)
+
+
+def _open_bands(exr_path: str, channels=None, band_rows: int = BAND_ROWS, worker: OIIOWorker | None = None):
+    # in-process OIIO 가 있으면 직접, 없으면 worker 에 파일을 열어 두고 band 를 요청
+    if _OIIO is not None:
+        return BandReader(_OIIO, np, str(exr_path), channels, band_rows)
+    return (worker or _get_oiio_worker()).bands(str(exr_path), channels, band_rows)
+
+
+def _read_float_frame(exr_path: str, channels=None, worker: OIIOWorker | None = None):
+    """선택한 채널만 (w, h, nch, (h, w, nch) float32) 로 읽기. band 로 채워서 프레임 한 벌만 할당"""
+    if _OIIO is None:
+        return (worker or _get_oiio_worker()).read(str(exr_path), channels)
+    with BandReader(_OIIO, np, str(exr_path), channels) as reader:
+        pixels = np.empty((reader.height, reader.width, len(reader.channels)), dtype=np.float32)
+        for y, band in reader:
+            pixels[y:y + len(band)] = band
+    return reader.width, reader.height, len(reader.channels), pixels
+
+
+def _decode_display_frame(exr_path: str, bit_depth: int = 8, transfer: str | None = None,
+                          channels=None, band_rows: int = BAND_ROWS, worker: OIIOWorker | None = None,
+                          out: np.ndarray | None = None) -> np.ndarray:
+    """
+    EXR 한 장을 band 단위로 읽어 바로 display transform → (h, w, 3) uint8 / uint16.
+    float 픽셀은 band 하나 (band_rows x w x 선택 채널) 만 메모리에 있고 결과는 out 에 바로 쓴다.
+    """
+    transform = get_display_transform(transfer, bit_depth)
+    with _open_bands(exr_path, channels, band_rows, worker) as reader:
+        if out is None:
+            out = np.empty((reader.height, reader.width, 3), dtype=transform.dtype)
+        for y, band in reader:
+            transform.apply(band, out=out[y:y + len(band)])
+    return out
+
 
 class Format_Converter(QtGui.QWidget):
 
@@ -63,84 +187,30 @@ class Format_Converter(QtGui.QWidget):
 
     #### 이 부분 코드 공부해보기. subprocess 로 rez-env 환경을 실행시켜서 oiio 툴을 실행시켜 이미지를 
     ## 코드 내에서 읽을 수 있도록 하는 코드인데, 조금 더 공부가 필요할 것 같음. 
-    def _read_exr_direct(self, exr_path):
-        img = _OIIO.ImageInput.open(str(exr_path))
-        if not img:
-            raise RuntimeError(f"OpenImageIO failed to open: {exr_path}")
-        spec = img.spec()
-        pixels = img.read_image(format=_OIIO.FLOAT)
-        img.close()
-        return spec.width, spec.height, spec.nchannels, pixels
-
-    def _read_exr_via_rez(self, exr_path):
-        tmp_npy = Path(exr_path).with_suffix(".npy")
-        py_code = (
-            "import numpy as np, OpenImageIO as oiiotool, sys, pathlib;"
-            "p=sys.argv[1];"
-            "img=oiiotool.ImageInput.open(p);"
-            "spec=img.spec();"
-            "px=np.array(img.read_image(format=oiiotool.FLOAT));"
-            "img.close();"
-            "np.save(pathlib.Path(p).with_suffix('.npy'), px);"
-            "print(f'{spec.width},{spec.height},{spec.nchannels}')"
-        )
-        cmd = [REZ_ENV_CMD, REZ_OIIO_PKG, "--", "python", "-c", py_code, str(exr_path)]
-        proc = subprocess.run(cmd, capture_output=True, text=True)
-        if proc.returncode != 0:
-            raise RuntimeError(proc.stderr)
-        w, h, c = map(int, proc.stdout.strip().split(","))
-        pixels = np.load(tmp_npy)
-        tmp_npy.unlink(missing_ok=True)
-        return w, h, c, pixels
-
-    def _read_exr(self, exr_path):
-        import OpenImageIO as oiio
-        img = oiio.ImageInput.open(exr_path)
-        if not img:
-            raise Exception(f"파일을 열 수 없음: {exr_path}")
-        spec = img.spec()
-        w, h, nch = spec.width, spec.height, spec.nchannels
-        pixels = img.read_image()
-        img.close()
-        if pixels is None:
-            raise Exception(f"픽셀 데이터가 없음: {exr_path}")
-        return w, h, nch, pixels
+    # 세 함수 모두 channels (기본 R,G,B, layer / 'part:layer' / 채널 이름 목록) 만 band 단위로 읽어
+    # (w, h, nch, pixels) 반환
+    def _read_exr_direct(self, exr_path, channels=None):
+        if _OIIO is None:
+            raise RuntimeError("OpenImageIO 를 import 할 수 없음")
+        return _read_float_frame(exr_path, channels)
 
-    # return json.loads(proc.stdout)
-    def _get_exr_header_via_rez(self, exr_path: str) -> dict:
-        py_code = (
-            "import json, OpenImageIO as oiio, sys\n"
-            "img = oiio.ImageInput.open(sys.argv[1])\n"
-            "if not img:\n"
-            "    raise RuntimeError('Cannot open ' + sys.argv[1])\n"
-            "spec = img.spec()\n"
-            "metadata = {}\n"
-            "try:\n"
-            "    names = spec.extra_attrib_names()\n"
-            "    for k in names:\n"
-            "        v = spec.extra_attrib(k)\n"
-            "        metadata[k] = str(v)\n"
-            "except AttributeError:\n"
-            "    try:\n"
-            "        for attr in spec.extra_attribs:\n"
-            "            metadata[str(attr.name)] = str(attr.value)\n"
-            "    except Exception:\n"
-            "        pass\n"
-            "img.close()\n"
-            "print(json.dumps(metadata))\n"
-        )
-        cmd = [
-            REZ_ENV_CMD, REZ_OIIO_PKG, "--",
-            "python", "-c", py_code, exr_path
-        ]
-        proc = subprocess.run(cmd, capture_output=True, text=True)
+    def _read_exr_via_rez(self, exr_path, channels=None):
+        # 파일마다 rez-env 를 새로 띄우지 않고 상주 worker 에 요청
+        return _get_oiio_worker().read(str(exr_path), channels)
 
-        if proc.returncode != 0:
-            raise RuntimeError(proc.stderr)
+    def _read_exr(self, exr_path, channels=None):
+        return _read_float_frame(exr_path, channels)
 
-        # JSON 문자열 → dict 변환
-        import json
-        meta = json.loads(proc.stdout)
+    def get_layers(self, exr_path: str) -> list:
+        """
+        모든 part 의 layer 목록 (model.exr_header.ExrLayer). header 만 읽으므로 OIIO 불필요.
+        layer.selector 를 변환 함수들의 channels= 에 넘기면 그 layer 의 R,G,B 만 디코딩한다.
+        """
+        return read_exr_layers(exr_path)
+
+    def _get_exr_header_via_rez(self, exr_path: str) -> dict:
+        # 상주 worker 에 header 요청 (값은 문자열로 돌아옴)
+        meta = _get_oiio_worker().header(exr_path)
 
         # 디버깅 출력
         print("\n[✅ EXR Metadata Keys]")
@@ -166,6 +236,90 @@ class Format_Converter(QtGui.QWidget):
         meta = {k: spec.extra_attrib(k) for k in spec.extra_attrib_names()}
         img.close()
         return meta
+    def get_headers(self, paths, keys=None, max_workers: int = HEADER_WORKERS) -> dict:
+        """
+        여러 EXR 의 header 를 한 번에 읽어 {path: metadata} 로 반환.
+        keys 를 주면 해당 key 만 남긴다. (예: ["smpte:TimeCode"])
+
+        1) native header 파서를 bounded thread pool 로 병렬 실행
+        2) 실패한 파일만 OIIO 로 재시도 – in-process OIIO 가 있으면 thread pool,
+           없으면 rez worker 에 한 번의 요청으로 묶어서 보낸다
+        읽지 못한 파일은 결과에서 빠진다.
+        """
+        paths = [str(p) for p in paths]
+        if not paths:
+            return {}
+        keys = set(keys) if keys else None
+        workers = max(1, min(max_workers, len(paths)))
+
+        def native(path):
+            try:
+                return path, read_exr_header(path).to_oiio_metadata()
+            except Exception:
+                return path, None
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = dict(pool.map(native, paths))
+
+        failed = [p for p, meta in results.items() if meta is None]
+        if failed:
+            if _OIIO is not None:
+                def direct(path):
+                    try:
+                        return path, self._get_exr_header(path)
+                    except Exception as e:
+                        print(f"[ERROR] header 읽기 실패: {path} ({e})")
+                        return path, None
+
+                with ThreadPoolExecutor(max_workers=max(1, min(workers, len(failed)))) as pool:
+                    results.update(pool.map(direct, failed))
+            else:
+                try:
+                    headers, errors = _get_oiio_worker().headers(failed)
+                    results.update(headers)
+                    for path, err in errors.items():
+                        print(f"[ERROR] header 읽기 실패: {path} ({err})")
+                except Exception as e:
+                    print(f"[ERROR] OIIO worker header 일괄 요청 실패: {e}")
+
+        out = {}
+        for path in paths:
+            meta = results.get(path)
+            if meta is None:
+                continue
+            out[path] = {k: v for k, v in meta.items() if k in keys} if keys else meta
+        return out
+
+    def check_timecode_continuity(self, exr_files, fps: int = 24) -> list[str]:
+        """
+        시퀀스 전체 프레임의 timecode 가 1 프레임씩 이어지는지 확인.
+        문제 종류마다 메시지 한 줄 (개수 + 처음 / 마지막 위치), 문제 없으면 빈 리스트.
+        drop-frame timecode 는 timecode_to_frames 가 29.97 / 59.94 규칙으로 바꿔 비교한다.
+        """
+        paths = [str(p) for p in exr_files]
+        headers = self.get_headers(paths, keys=["smpte:TimeCode"])
+        missing, breaks, prev = [], [], None
+        for path in paths:
+            tc = headers.get(path, {}).get("smpte:TimeCode")
+            frames = timecode_to_frames(tc, fps) if tc is not None else None
+            if frames is None:
+                missing.append(Path(path).name)
+                prev = None
+                continue
+            if prev is not None and frames != prev[1] + 1:
+                breaks.append(f"{Path(prev[0]).name} → {Path(path).name}")
+            prev = (path, frames)
+
+        errors = []
+        if missing:
+            where = missing[0] if len(missing) == 1 else f"{missing[0]} … {missing[-1]}"
+            total = " (전체)" if len(missing) == len(paths) else ""
+            errors.append(f"timecode 없음: {len(missing)} 프레임{total} ({where})")
+        if breaks:
+            where = breaks[0] if len(breaks) == 1 else f"{breaks[0]} … {breaks[-1]}"
+            errors.append(f"timecode 불연속: {len(breaks)} 곳 ({where})")
+        return errors
+
     # ───────────────────────────────────────────────────────────────
     # frame number 설정 
     @staticmethod
@@ -188,42 +342,153 @@ class Format_Converter(QtGui.QWidget):
         self,
         exr_files: list[str],
         output_dir: str,
-        clone_to: str | None = None
-    ) -> None:
+        clone_to: str | None = None,
+        max_workers: int = JPG_WORKERS,
+        max_in_flight: int | None = None,
+        progress=None,
+        transfer: str | None = None,
+        channels=None,
+        manifest: ChecksumManifest | None = None,
+    ) -> dict[int, str]:
+        """
+        EXR 시퀀스를 프로세스 풀에서 병렬로 JPG 변환.
+
+        - 출력 번호는 입력 순서 기준 1001 부터 (_replace_numeric_suffix) – 끝나는 순서와 무관
+        - 동시에 처리 중인 프레임은 max_in_flight(기본 max_workers) 개로 제한해 메모리 상한 유지
+        - progress(done, total, frame_num, error) 를 프레임마다 호출 (error 는 성공 시 None)
+        - transfer: display transform (None 이면 기본값, model/display_transform.py)
+        - channels: 변환할 layer (None 이면 R,G,B, 'diffuse' / 'part:layer' / 채널 이름 목록)
+        - manifest: 주면 저장한 JPG 의 checksum 을 기록 (인코딩한 bytes 로 계산, 다시 읽지 않음)
+        반환값: 실패한 프레임 {frame_num: 오류 메시지}
+        """
         print(f"[INFO] EXR 파일 개수: {len(exr_files)}")
 
         # EXR 복제 (옵션)
         if clone_to:
             clone_dir = Path(clone_to)
             clone_dir.mkdir(parents=True, exist_ok=True)
-            for src in exr_files:
-                shutil.copy2(src, clone_dir / Path(src).name)
+            report = copy_files([(src, clone_dir / Path(src).name) for src in exr_files])
+            if report.failed:
+                raise RuntimeError(f"EXR 복제 실패 {len(report.failed)}개: {report.failed[0].error}")
             print(f"[INFO] EXR 복제 완료 → {clone_dir}")
         out_dir = Path(output_dir)
         out_dir.mkdir(parents=True, exist_ok=True)
 
         start_num = 1001
+        jobs = []                                     # (frame_num, exr_path, jpg_path)
         for idx, exr_path in enumerate(exr_files):
             stem     = Path(exr_path).stem
             new_stem = self._replace_numeric_suffix(stem, start_num + idx)  # ← self.
             jpg_path = out_dir / f"{new_stem}.jpg"
             if jpg_path.exists():
                 print(f"[SKIP] {jpg_path.name} 이미 존재"); continue
+            jobs.append((start_num + idx, str(exr_path), str(jpg_path)))
+
+        total = len(jobs)
+        errors: dict[int, str] = {}
+        if not jobs:
+            return errors
+
+        workers = max(1, min(max_workers, total))
+        limit = max(1, max_in_flight or workers)
+        done = 0
+
+        def report(frame_num, error):
+            nonlocal done
+            done += 1
+            if error:
+                errors[frame_num] = error
+                print(f"[ERROR] [{frame_num}] 변환 실패: {error}")
+            else:
+                print(f"[INFO] [{frame_num}] 저장 완료 ({done}/{total})")
+            if progress is not None:
+                progress(done, total, frame_num, error)
+
+        def convert_serial(serial_jobs):
+            # pool 을 띄울 수 없을 때: 이 프로세스에서 한 장씩 (기존 OIIO / rez worker 재사용)
+            for frame_num, exr_path, jpg_path in serial_jobs:
+                try:
+                    rgb = _decode_display_frame(exr_path, transfer=transfer, channels=channels)
+                    digest = jpg_worker.save_jpg(rgb, jpg_path)
+                except Exception as e:
+                    report(frame_num, f"{type(e).__name__}: {e}")
+                    continue
+                if manifest is not None:
+                    manifest.add(jpg_path, digest)
+                report(frame_num, None)
+
+        python = _pool_python()
+        if python is None or workers == 1:
+            if python is None:
+                print("[WARN] 변환 프로세스용 파이썬을 찾지 못해 (SCANDATA_PYTHON) 현재 프로세스에서 변환합니다.")
+            convert_serial(jobs)
+            print(f"[INFO] JPG 변환 완료: {total - len(errors)}/{total} (실패 {len(errors)})")
+            return errors
+
+        # Qt GUI 프로세스를 fork 하지 않도록 forkserver (없으면 spawn) 로 띄운 자식이
+        # _JPG_WORKER_LOADER 로 jpg_worker 만 로드한다.
+        # in-process OIIO 가 없으면 자식마다 rez OIIO worker 를 하나씩 띄운다
+        ctx = multiprocessing.get_context(
+            "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+        ctx.set_executable(python)
+        worker_cmd = _oiio_worker_cmd() if _OIIO is None else None
+        pending = {}
+        reported = set()
+
+        def collect():
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                frame_num = pending.pop(fut)
+                jpg_path, error, digest = fut.result()   # BrokenProcessPool 은 아래에서 처리
+                if manifest is not None and digest:
+                    manifest.add(jpg_path, digest)
+                reported.add(frame_num)
+                report(frame_num, error)
 
-            print(f"[{start_num + idx}] 변환 중: {exr_path}")
-            try:
-                w, h, nch, pix = self._read_exr_via_rez(exr_path)
-            except Exception as e:
-                print(f"[ERROR] {exr_path} 읽기 실패: {e}"); continue
-
-            rgb = np.array(pix).reshape(h, w, nch)
-            rgb = rgb[:, :, :3] if nch >= 3 else np.repeat(rgb[:, :, 0:1], 3, axis=2)
-            rgb = (np.clip(rgb, 0, 1) * 255).astype(np.uint8)
-            Image.fromarray(rgb, mode="RGB").save(jpg_path, "JPEG")
-            print(f"[INFO] 저장 완료: {jpg_path}")
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                     initializer=exec, initargs=(_JPG_WORKER_LOADER, {})) as pool:
+                for frame_num, exr_path, jpg_path in jobs:
+                    while len(pending) >= limit:
+                        collect()
+                    pending[pool.submit(jpg_worker.exr_to_jpg_frame, exr_path, jpg_path,
+                                         transfer, channels, worker_cmd)] = frame_num
+                while pending:
+                    collect()
+        except (BrokenProcessPool, OSError, EOFError) as e:
+            remaining = [job for job in jobs if job[0] not in reported]
+            if not reported:
+                # 프레임 하나도 받기 전에 깨짐 = pool 을 띄우지 못함 (실행 파일 / import 문제) → 직렬 변환
+                print(f"[WARN] 변환 프로세스를 시작하지 못해 현재 프로세스에서 변환합니다: {e}")
+                convert_serial(remaining)
+            else:
+                # 도중에 자식 프로세스가 죽으면(OOM 등) 아직 결과가 없는 프레임은 모두 실패로 기록
+                print(f"[ERROR] 변환 프로세스 비정상 종료: {e}")
+                for frame_num, _, _ in remaining:
+                    report(frame_num, "worker process died")
+
+        print(f"[INFO] JPG 변환 완료: {total - len(errors)}/{total} (실패 {len(errors)})")
+        return errors
+
+    def _read_thumbnail(self, exr_path: str, max_size: int, channels=None) -> np.ndarray:
+        # 축소 읽기 (MIP / 행 건너뛰기 / 선택 채널만) → float32 (h, w, 3)
+        if _OIIO is not None:
+            return oiio_worker.read_thumbnail(_OIIO, np, str(exr_path), max_size, channels)
+        return _get_oiio_worker().thumb(str(exr_path), max_size, channels)
+
+    def read_thumbnail_rgb(self, exr_path: str, max_size: int, channels=None) -> np.ndarray:
+        """긴 변 max_size 근처로 축소한 (h, w, 3) uint8 – ThumbnailStore 생성용"""
+        px = self._read_thumbnail(exr_path, max_size, channels)
+        h, w = px.shape[:2]
+        return _to_display_rgb(px, w, h, 3)
 
     ### 썸네일 추출 코드 
-    def generate_thumbnail(self, exr_path: str, output_dir: str) -> str:
+    def generate_thumbnail(self, exr_path: str, output_dir: str, channels=None) -> str:
+        """
+        thumb_1080 / thumb_2k 또는 thumb_1k / thumb_full 생성 (썸네일 저장소를 못 쓸 때 publish 용)
+        channels 로 썸네일에 쓸 layer 지정 (None 이면 R,G,B)
+        Browse 썸네일은 여기가 아니라 ThumbnailStore + read_thumbnail_rgb (축소 읽기) 로 만든다
+        """
         thumb_dir = Path(output_dir)
         thumb_dir.mkdir(parents=True, exist_ok=True)
 
@@ -235,14 +500,12 @@ class Format_Converter(QtGui.QWidget):
             print("[INFO] 썸네일 이미 존재 – 생성 생략")
             return str(thumb_dir / "thumb_1k.jpg")
         try:
-            w, h, nch, pix = self._read_exr_via_rez(exr_path)
+            rgb = _decode_display_frame(exr_path, channels=channels)
         except Exception as e:
             print(f"[ERROR] 썸네일 생성 실패: {e}")
             return ""
 
-        rgb = np.array(pix).reshape(h, w, nch)
-        rgb = rgb[:, :, :3] if nch >= 3 else np.repeat(rgb[:, :, 0:1], 3, axis=2)
-        rgb = (np.clip(rgb, 0, 1) * 255).astype(np.uint8)
+        h, w = rgb.shape[:2]
         pil_img = Image.fromarray(rgb, mode="RGB")
 
         # 이미지 사이즈 1080 , 2040 으로 두 버전으로 추출
@@ -257,6 +520,170 @@ class Format_Converter(QtGui.QWidget):
             pil_img.save(thumb_dir / "thumb_full.jpg")
             return str(thumb_dir / "thumb_1k.jpg")
 
+    # ------------------------------------------------------------
+    #  EXR → ffmpeg 스트리밍 (JPG 중간 단계 없음)
+    # ------------------------------------------------------------
+    def iter_display_frames(self, exr_files, bit_depth: int = 8,
+                            max_workers: int = STREAM_DECODE_WORKERS, max_in_flight: int | None = None,
+                            transfer: str | None = None, channels=None, after_decode=None):
+        """
+        EXR 을 여러 스레드에서 미리 디코딩하되 입력 순서대로 (h, w, 3) 배열을 yield.
+        앞서 읽어 둔 프레임은 max_in_flight(기본 max_workers * 2) 개를 넘지 않는다.
+        각 프레임은 band 단위로 선택한 layer(기본 R,G,B) 만 읽어 바로 변환하므로 float 프레임 전체를 들고 있지 않는다.
+        rez worker 를 쓰는 경우 스레드마다 worker 를 하나씩 띄운다. (worker 하나는 요청을 직렬 처리)
+        after_decode(index, frame) 를 주면 디코딩한 스레드에서 바로 호출 (JPG 저장 등을 순서대로 받는 쪽에서 하지 않음)
+        """
+        local = threading.local()
+        spawned = []
+        lock = threading.Lock()
+
+        def thread_worker():
+            if _OIIO is not None:
+                return None
+            worker = getattr(local, "worker", None)
+            if worker is None:
+                worker = local.worker = OIIOWorker(_oiio_worker_cmd())
+                with lock:
+                    spawned.append(worker)
+            return worker
+
+        def decode(index, path):
+            frame = _decode_display_frame(path, bit_depth, transfer, channels, worker=thread_worker())
+            if after_decode is not None:
+                after_decode(index, frame)
+            return frame
+
+        limit = max(1, max_in_flight or max_workers * 2)
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        window = deque()
+        try:
+            for index, path in enumerate(exr_files):
+                window.append(pool.submit(decode, index, path))
+                if len(window) >= limit:
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
+        finally:
+            for fut in window:
+                fut.cancel()
+            pool.shutdown(wait=True)
+            for worker in spawned:
+                worker.close()
+
+    def encode_exr_sequence(
+        self,
+        exr_files: list[str],
+        outputs: list,
+        fps: int = 24,
+        bit_depth: int = 8,
+        jpg_dir: str | None = None,
+        progress=None,
+        transfer: str | None = None,
+        channels=None,
+        manifest: ChecksumManifest | None = None,
+    ) -> list[str]:
+        """
+        EXR 을 한 번만 디코딩해 raw 프레임(rgb24 / rgb48le)을 ffmpeg stdin 으로 보낸다.
+        outputs: [(ffmpeg 출력 옵션, 출력 경로), ...] – 한 ffmpeg 프로세스가 모두 인코딩
+        jpg_dir 을 주면 같은 프레임으로 JPG 도 함께 저장 (선택 출력, 번호는 1001 부터).
+        JPG 인코딩은 디코딩 스레드에서 하므로 ffmpeg 로 프레임을 넘기는 루프가 JPG 때문에 밀리지 않는다
+        manifest 를 주면 JPG 는 인코딩한 bytes 로, 영상은 인코딩이 끝난 뒤 checksum 을 기록
+        """
+        if not exr_files:
+            raise ValueError("exr_files 가 비어있습니다.")
+        for _, path in outputs:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        if jpg_dir:
+            Path(jpg_dir).mkdir(parents=True, exist_ok=True)
+
+        pix_fmt = "rgb48le" if bit_depth == 16 else "rgb24"
+        total = len(exr_files)
+        encoder = None
+        def write_jpg(index, frame):
+            stem = self._replace_numeric_suffix(Path(exr_files[index]).stem, 1001 + index)
+            rgb8 = frame if frame.dtype == np.uint8 else (frame >> 8).astype(np.uint8)
+            jpg_path = Path(jpg_dir) / f"{stem}.jpg"
+            digest = jpg_worker.save_jpg(rgb8, jpg_path)
+            if manifest is not None:
+                manifest.add(jpg_path, digest)
+
+        frames = self.iter_display_frames(exr_files, bit_depth=bit_depth, transfer=transfer, channels=channels,
+                                          after_decode=write_jpg if jpg_dir else None)
+        try:
+            for idx, frame in enumerate(frames):
+                if encoder is None:
+                    h, w = frame.shape[:2]
+                    encoder = RawVideoEncoder(w, h, outputs, fps=fps, pix_fmt=pix_fmt).start()
+                encoder.write(frame)
+
+                frame_num = 1001 + idx
+                if progress is not None:
+                    progress(idx + 1, total, frame_num, None)
+            encoder.close()
+            if manifest is not None:
+                # ffmpeg 가 직접 쓴 파일은 hash 를 같이 구할 수 없어 방금 쓴(page cache) 파일을 읽음
+                for _, path in outputs:
+                    manifest.add_file(path)
+        except Exception:
+            # 프레임 하나라도 빠지면 영상이 어긋나므로 인코딩 자체를 중단
+            if encoder is not None:
+                encoder.abort()
+            raise
+        finally:
+            frames.close()
+        return [str(path) for _, path in outputs]
+
+    def generate_videos_from_exr(self, exr_files, webm_path, mp4_path, jpg_dir=None,
+                                 fps: int = 24, progress=None, channels=None) -> dict[str, str]:
+        """generate_webm_video 와 같은 WebM / MP4 를 JPG 없이 EXR 에서 바로 생성"""
+        webm, mp4 = resolve_profiles(("webm", "mp4"))
+        self.encode_exr_sequence(
+            exr_files,
+            [(webm.args, str(webm_path)), (mp4.args, str(mp4_path))],
+            fps=fps,
+            jpg_dir=jpg_dir,
+            progress=progress,
+            channels=channels,
+        )
+        return {"webm": str(webm_path), "mp4": str(mp4_path)}
+
+    def encode_deliverables(
+        self,
+        exr_files: list[str],
+        destination_root: str,
+        outputs=("webm", "mp4", "mov"),
+        profiles: dict | None = None,
+        fps: int = 24,
+        jpg_dir: str | None = None,
+        progress=None,
+        transfer: str | None = None,
+        channels=None,
+        manifest: ChecksumManifest | None = None,
+    ) -> dict[str, str]:
+        """
+        요청한 결과물(webm / mp4 / mov ...)을 한 번의 디코딩 + 한 ffmpeg 프로세스로 모두 생성.
+        profiles 로 결과물별 코덱 옵션 / 경로를 바꿀 수 있다. (ffmpeg_stream.DEFAULT_PROFILES 참고)
+        10bit 결과물(MOV)이 하나라도 있으면 rgb48 로 보내고 8bit 결과물은 ffmpeg 가 각자 변환한다.
+        반환값: {결과물 이름: 경로}
+        """
+        selected = resolve_profiles(outputs, profiles)
+        if not selected:
+            return {}
+        bit_depth = max(p.bit_depth for p in selected)
+        paths = {p.name: p.output_path(destination_root) for p in selected}
+        self.encode_exr_sequence(
+            exr_files,
+            [(p.args, paths[p.name]) for p in selected],
+            fps=fps,
+            bit_depth=bit_depth,
+            jpg_dir=jpg_dir,
+            progress=progress,
+            transfer=transfer,
+            channels=channels,
+            manifest=manifest,
+        )
+        return paths
+
     def generate_webm_video(self, jpg_output_dir, mp4_output_dir):
         jpg_dir      = Path(jpg_output_dir).resolve()
         jpg_files    = sorted(jpg_dir.glob("*.jpg"))
@@ -363,6 +790,19 @@ class Format_Converter(QtGui.QWidget):
         print(f"[INFO] MOV 변환 완료: {mov_path}")
         return str(mov_path)
    
+    def verify_deliverables(self, destination_root: str, incremental: bool = True,
+                            max_age: float | None = None, max_workers: int = VERIFY_WORKERS, progress=None):
+        """
+        copy_exr_sequence 가 남긴 manifest.json 기준으로 버전 폴더 파일들을 병렬 확인.
+        incremental=True 면 이미 확인했고 size / mtime 이 그대로인 파일은 건너뜀 (max_age 초 지나면 다시 확인)
+        반환값: checksum_manifest.VerifyReport
+        """
+        manifest = ChecksumManifest.load(destination_root)
+        if not manifest.files:
+            raise RuntimeError(f"checksum manifest 없음: {manifest.path}")
+        return manifest.verify(incremental=incremental, max_age=max_age,
+                               max_workers=max_workers, progress=progress)
+
     # ────────────────────────────────────────────────
     #  핵심: 경로 dict 를 리턴하도록 수정
     # ────────────────────────────────────────────────
@@ -372,10 +812,30 @@ class Format_Converter(QtGui.QWidget):
         exr_files: list[str],
         destination_root: str,
         last_open_dir: str | None = None,
+        progress=None,
+        stream: bool = True,
+        write_jpg: bool = True,
+        outputs=("webm", "mp4", "mov"),
+        profiles: dict | None = None,
+        transfer: str | None = None,
+        channels=None,
+        copy_mode: str = "auto",
+        copy_workers: int = COPY_WORKERS,
+        checksum: bool = True,
     ) -> dict[str, str]:               # ← 반환형 변경
         """
-        EXR 시퀀스를 JPG·WebM·MP4 로 변환한 뒤
-        {'thumb': str, 'webm': str, 'mp4': str} 를 반환한다.
+        EXR 시퀀스를 JPG·WebM·MP4·MOV 로 변환한 뒤
+        {'thumb': str, 'webm': str, 'mp4': str, 'mov': str} 를 반환한다.
+        stream=True 면 EXR 을 한 번만 디코딩해 outputs 에 있는 결과물을 한 ffmpeg 로 모두 만들고
+        JPG 는 write_jpg 일 때만 디코딩 스레드에서 같이 저장. (profiles 로 결과물별 코덱 옵션 변경)
+        transfer 로 JPG / 영상의 display transform 지정 (None 이면 SCANDATA_DISPLAY_TRANSFER, 기본 srgb)
+        channels 로 JPG / 영상 / 썸네일에 쓸 layer 지정 (None 이면 R,G,B – get_layers 참고).
+        org/ 복사본은 모든 part / 채널을 그대로 유지하며, stream=False 의 MOV 는 ffmpeg 가 EXR 을 직접 읽어 layer 선택 불가
+        org/ 복사는 copy_engine 으로 copy_workers 개 동시 진행 (copy_mode: auto=reflink 우선 / hardlink / copy)
+        checksum=True 면 org / JPG / 영상 / 썸네일의 checksum 을 <destination_root>/manifest.json 에 기록
+        (verify_deliverables 로 확인). org 복사는 read/write 루프에서 복사하면서 hash 를 구하므로
+        커널 복사 / NFS server-side copy 는 쓰지 않는다 (reflink 는 그대로, 원본을 한 번 읽어 계산)
+        stream=False 면 기존 방식 (JPG 변환 → JPG 시퀀스로 영상 인코딩, org 폴더에서 MOV)
         """
         # ── 0) base dir 보정 ─────────────────────────
         if last_open_dir is None:
@@ -397,20 +857,51 @@ class Format_Converter(QtGui.QWidget):
         mp4_dir.mkdir(parents=True, exist_ok=True)
         mov_dir.mkdir(parents=True, exist_ok=True)
         org_dir.mkdir(parents=True, exist_ok=True)
-
-        # ── 2) EXR → JPG ────────────────────────────
-        self.convert_all_exr_to_jpg(exr_files, str(jpg_dir))
-        if not list(jpg_dir.glob("*.jpg")):
-            raise RuntimeError("JPG 변환 실패 – oiio/권한 확인")
+        # 같은 버전에 다시 실행하면 기존 기록(건너뛴 JPG 등)을 유지한 채 갱신
+        manifest = ChecksumManifest.load(destination_root) if checksum else None
+
+        # ── 2) EXR → JPG (스트리밍 모드에서는 영상 인코딩과 같이 처리) ──
+        if not stream:
+            failed = self.convert_all_exr_to_jpg(exr_files, str(jpg_dir), progress=progress,
+                                                 transfer=transfer, channels=channels, manifest=manifest)
+            if failed:
+                print(f"[WARN] JPG 변환 실패 프레임: {sorted(failed)}")
+            if not list(jpg_dir.glob("*.jpg")):
+                raise RuntimeError("JPG 변환 실패 – oiio/권한 확인")
 
         # ── 3) 썸네일 생성 ──────────────────────────
-        self.generate_thumbnail(exr_files[0], str(jpg_dir))
+        # 썸네일 저장소의 shotgrid 크기(1920x1080 안)를 버전 폴더로 복사, 실패하면 기존 방식
+        # (저장소는 기본 R,G,B 기준이므로 layer 를 지정하면 기존 방식으로 그 layer 썸네일 생성)
         thumb_path = jpg_dir / "thumb_1080.jpg"
-        if not thumb_path.exists():                      # 4K 미만이면 1K 썸네일
-            thumb_path = jpg_dir / "thumb_1k.jpg"
-
-        # ── 4) 영상 생성 ─────────────────────────────
-        vid_paths = self.generate_webm_video(str(jpg_dir), str(mp4_dir))
+        store_thumb = None
+        if channels is None:
+            store_thumb = get_default_thumbnail_store().ensure(
+                exr_files[0], "shotgrid", lambda size: self.read_thumbnail_rgb(exr_files[0], size)
+            )
+        if store_thumb:
+            shutil.copyfile(store_thumb, thumb_path)
+        else:
+            self.generate_thumbnail(exr_files[0], str(jpg_dir), channels=channels)
+            if not thumb_path.exists():                      # 4K 미만이면 1K 썸네일
+                thumb_path = jpg_dir / "thumb_1k.jpg"
+        if manifest is not None and thumb_path.exists():
+            manifest.add_file(thumb_path)
+
+        # ── 4) 영상 생성 (스트리밍: 디코딩 1회로 WebM/MP4/MOV 동시 인코딩) ──
+        if stream:
+            vid_paths = self.encode_deliverables(
+                exr_files,
+                destination_root,
+                outputs=outputs,
+                profiles=profiles,
+                jpg_dir=str(jpg_dir) if write_jpg else None,
+                progress=progress,
+                transfer=transfer,
+                channels=channels,
+                manifest=manifest,
+            )
+        else:
+            vid_paths = self.generate_webm_video(str(jpg_dir), str(mp4_dir))
 
         # ──  exr 복제  ─────────────────────────────
         # 샷 이름 추출: 파일 이름에서 prefix 추출 (ex: "S008SH0040")
@@ -420,27 +911,42 @@ class Format_Converter(QtGui.QWidget):
             raise RuntimeError(f" 파일 이름에서 샷 코드 추출 실패: {original_name}")
         shot_name = m.group(1)
 
-        renamed_exr_files = []
+        copy_pairs = []
         for i, path in enumerate(sorted(exr_files), start=1001):
             new_name = f"{shot_name}_{i:04d}.exr"
-            dst = org_dir / new_name
-            shutil.copy2(path, dst)
-            renamed_exr_files.append(str(dst))
-
-        # ── 5) MOV 생성 ─────────────────────────────
-        mov_output_path = mov_dir / "output_video.mov"
-        mov_path_str = self.convert_exr_sequence_to_mov(
-            exr_sequence_dir=str(org_dir),  # ★ 복제된 org 폴더에서
-            mov_output_path=str(mov_output_path),
-            start_number=1001,
-            framerate=24,
-        )
-        
+            copy_pairs.append((path, org_dir / new_name))
+        report = copy_files(copy_pairs, mode=copy_mode, max_workers=copy_workers, checksum=checksum)
+        if report.failed:
+            raise RuntimeError(f"EXR 복제 실패 {len(report.failed)}개: {report.failed[0].error}")
+        renamed_exr_files = [r.dst for r in report.results]
+        if manifest is not None:
+            for r in report.results:
+                manifest.add(r.dst, r.digest)
+
+        # ── 5) MOV 생성 (기존 방식일 때만 – 스트리밍에서는 4) 에서 같이 생성) ──
+        if not stream:
+            mov_output_path = mov_dir / "output_video.mov"
+            vid_paths["mov"] = self.convert_exr_sequence_to_mov(
+                exr_sequence_dir=str(org_dir),  # ★ 복제된 org 폴더에서
+                mov_output_path=str(mov_output_path),
+                start_number=1001,
+                framerate=24,
+            )
+
+        if manifest is not None:
+            if not stream:
+                # 기존 방식: JPG 는 변환 중 기록, 영상은 ffmpeg 가 끝난 뒤 읽어서 기록
+                for path in vid_paths.values():
+                    if path and os.path.exists(path):
+                        manifest.add_file(path)
+            manifest.save()
+            print(f"[INFO] checksum manifest 저장: {manifest.path} ({len(manifest.files)} files)")
+
         # ── 6) 호출자에게 경로 반환 ──────────────────
         return {
             "thumb": str(thumb_path),
-            "webm" : vid_paths["webm"],
-            "mp4"  : vid_paths["mp4"],
-            "mov": mov_path_str,
+            "webm" : vid_paths.get("webm", ""),
+            "mp4"  : vid_paths.get("mp4", ""),
+            "mov": vid_paths.get("mov", ""),
         }
 
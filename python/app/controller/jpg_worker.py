@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+jpg_worker.py
+
+EXR → JPG 프레임 변환 (convert_all_exr_to_jpg 의 ProcessPool 자식이 실행하는 코드).
+
+Qt GUI 프로세스를 fork 하면 Qt / sgtk 스레드가 잡고 있던 lock 까지 그대로 복제되므로
+자식은 forkserver (없으면 spawn) 로 새로 띄운 파이썬에서 이 파일만 import 한다.
+그래서 sgtk / Qt / app 패키지를 import 하지 않고, 필요한 모듈
+(oiio_worker, model/display_transform, model/checksum_manifest) 은 파일 경로로 직접 로드한다.
+부모 / 자식 모두 format_converter._JPG_WORKER_LOADER 로 같은 이름(tk_multi_scandata_jpg_worker) 의
+top-level 모듈로 로드하므로 pool 에 넘기는 함수 이름이 자식에서 그대로 import 된다.
+다른 toolkit app / DCC 모듈과 겹치지 않도록 sys.modules 이름에는 모두 tk_multi_scandata_ 를 붙인다.
+"""
+import io
+import os
+import sys
+import importlib.util
+
+import numpy as np
+from PIL import Image
+
+_NAMESPACE = "tk_multi_scandata_"
+_CONTROLLER_DIR = os.path.dirname(os.path.abspath(__file__))
+_MODEL_DIR = os.path.join(os.path.dirname(_CONTROLLER_DIR), "model")
+
+
+def _load(name, path):
+    name = _NAMESPACE + name
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+oiio_worker = _load("oiio_worker", os.path.join(_CONTROLLER_DIR, "oiio_worker.py"))
+display_transform = _load("display_transform", os.path.join(_MODEL_DIR, "display_transform.py"))
+checksum_manifest = _load("checksum_manifest", os.path.join(_MODEL_DIR, "checksum_manifest.py"))
+
+# 자식 프로세스마다 하나씩: in-process OIIO 모듈 / rez OIIO worker
+_OIIO = None
+_WORKER = None
+
+
+def _open_bands(exr_path: str, channels=None, worker_cmd=None):
+    # 부모가 in-process OIIO 를 쓰면 worker_cmd 는 None (sys.path / LD_LIBRARY_PATH 는 부모에서 물려받음)
+    global _OIIO, _WORKER
+    if worker_cmd is None:
+        if _OIIO is None:
+            import OpenImageIO
+            _OIIO = OpenImageIO
+        return oiio_worker.BandReader(_OIIO, np, str(exr_path), channels)
+    if _WORKER is None:
+        _WORKER = oiio_worker.OIIOWorker(worker_cmd)
+    return _WORKER.bands(str(exr_path), channels)
+
+
+def save_jpg(rgb: np.ndarray, jpg_path) -> str:
+    """
+    메모리에서 JPEG 로 인코딩해 hash 를 구한 뒤 그 bytes 를 그대로 저장. → checksum (hex)
+    중간에 죽어도 깨진 JPG 가 '이미 존재' 로 skip 되지 않도록 임시 이름으로 쓰고 rename
+    """
+    buf = io.BytesIO()
+    Image.fromarray(rgb, mode="RGB").save(buf, "JPEG")
+    data = buf.getbuffer()
+    hasher = checksum_manifest.new_hasher()
+    hasher.update(data)
+    tmp_path = f"{jpg_path}.part"
+    with open(tmp_path, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp_path, jpg_path)
+    return hasher.hexdigest()
+
+
+def exr_to_jpg_frame(exr_path: str, jpg_path: str, transfer: str | None = None, channels=None,
+                     worker_cmd=None):
+    """
+    프레임 하나를 band 단위로 읽어 display transform → JPG.
+    예외를 밖으로 던지지 않고 (jpg_path, 오류 메시지 or None, checksum or None) 을 돌려준다.
+    """
+    try:
+        transform = display_transform.get_display_transform(transfer, 8)
+        with _open_bands(exr_path, channels, worker_cmd) as reader:
+            rgb = np.empty((reader.height, reader.width, 3), dtype=transform.dtype)
+            for y, band in reader:
+                transform.apply(band, out=rgb[y:y + len(band)])
+        return jpg_path, None, save_jpg(rgb, jpg_path)
+    except Exception as e:
+        return jpg_path, f"{type(e).__name__}: {e}", None
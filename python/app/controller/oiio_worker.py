@@ -0,0 +1,587 @@
+# -*- coding: utf-8 -*-
+"""
+oiio_worker.py
+
+rez-env 로 띄운 OIIO 파이썬을 세션 동안 한 번만 실행해 두고
+stdin/stdout 프레임 프로토콜로 header / pixel 요청을 주고받는 워커.
+
+- 프레임 형식 : 8byte big-endian 길이 + payload
+- 요청/응답   : payload 는 UTF-8 JSON
+- 픽셀 전달   : 파이프로 보내지 않고, 클라이언트가 정한 tmpfs(/dev/shm) 파일에
+                worker 가 float32 (h, w, c) 로 써넣으면 클라이언트가 그대로 memmap 한다
+- band 읽기   : open → band(y, n) 반복 → close. band 크기 shm 버퍼 하나를 계속 재사용하므로
+                큰 plate 도 메모리는 band 하나 (행 수 x 폭 x 선택 채널) 만큼만 쓴다
+
+이 파일은 rez 환경의 python 으로 직접 실행되므로 (python -u oiio_worker.py)
+패키지 상대 import 나 3.10+ 문법을 쓰지 않는다.
+"""
+import os
+import sys
+import json
+import struct
+import tempfile
+import threading
+import subprocess
+
+_LEN = struct.Struct("!Q")
+
+# 픽셀 전달용 파일은 스캔 NFS 가 아니라 로컬 메모리(tmpfs)에 둔다
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+# 썸네일용 축소 읽기에서 행을 건너뛰는 비율. 축소 배율 f 에 대해 f // 이 값 간격으로 행을 읽고
+# 남은 배율은 box filter 로 평균 (행을 전부 건너뛰면 aliasing 이 심해서 절반 정도만 생략)
+_THUMB_ROW_BOX = 2
+
+# band 단위 디코딩 기본 행 수 (압축 chunk / tile 높이의 배수로 올림)
+BAND_ROWS = int(os.environ.get("SCANDATA_DECODE_BAND_ROWS", "64"))
+
+# EXR 압축별 chunk 당 scanline 수 – band 경계를 chunk 에 맞춰 같은 chunk 를 두 번 풀지 않게 함
+_EXR_CHUNK_LINES = {
+    "none": 1, "rle": 1, "zips": 1, "zip": 16, "pxr24": 16,
+    "piz": 32, "b44": 32, "b44a": 32, "dwaa": 32, "dwab": 256,
+}
+
+
+def _write_frame(stream, payload: bytes):
+    stream.write(_LEN.pack(len(payload)))
+    stream.write(payload)
+    stream.flush()
+
+
+def _read_exact(stream, size: int) -> bytes:
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = stream.read(remaining)
+        if not chunk:
+            raise EOFError("OIIO worker 파이프가 닫혔습니다.")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _read_frame(stream) -> bytes:
+    (size,) = _LEN.unpack(_read_exact(stream, _LEN.size))
+    return _read_exact(stream, size)
+
+
+# ---------------------------------------------------------------------
+# 1. 클라이언트 (앱 프로세스 쪽)
+# ---------------------------------------------------------------------
+class OIIOWorkerError(RuntimeError):
+    pass
+
+
+class OIIOWorker:
+    """
+    rez-env 서브프로세스 하나를 계속 살려두고 재사용한다.
+    파이프가 끊기면(크래시) 다음 요청에서 다시 띄우고 한 번 재시도한다.
+    """
+
+    def __init__(self, cmd):
+        self._cmd = list(cmd)
+        self._proc = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._proc is not None and self._proc.poll() is None:
+            return
+        print(f"[INFO] OIIO worker 시작: {' '.join(self._cmd)}")
+        self._proc = subprocess.Popen(
+            self._cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0,
+        )
+
+    def _kill(self):
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=5)
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            if self._proc is not None and self._proc.poll() is None:
+                try:
+                    _write_frame(self._proc.stdin, json.dumps({"op": "quit"}).encode("utf-8"))
+                    self._proc.wait(timeout=5)
+                except Exception:
+                    pass
+            self._kill()
+
+    def request(self, payload: dict) -> dict:
+        """
+        요청 하나를 보내고 응답 dict 를 돌려준다.
+        """
+        message = json.dumps(payload).encode("utf-8")
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    self._ensure_started()
+                    _write_frame(self._proc.stdin, message)
+                    reply = json.loads(_read_frame(self._proc.stdout).decode("utf-8"))
+                    break
+                except (OSError, EOFError, ValueError) as e:
+                    print(f"[WARN] OIIO worker 통신 실패 ({e}) – 재시작")
+                    self._kill()
+                    if attempt:
+                        raise OIIOWorkerError(f"OIIO worker 응답 없음: {e}") from e
+
+        if not reply.get("ok"):
+            raise OIIOWorkerError(reply.get("error", "unknown OIIO worker error"))
+        return reply
+
+    def header(self, path: str) -> dict:
+        reply = self.request({"op": "header", "path": str(path)})
+        return reply["metadata"]
+
+    def headers(self, paths, keys=None):
+        """
+        여러 파일의 header 를 요청 한 번으로 읽는다.
+        ({path: metadata}, {path: error 메시지}) 반환
+        """
+        reply = self.request({
+            "op": "headers",
+            "paths": [str(p) for p in paths],
+            "keys": list(keys) if keys else None,
+        })
+        return reply["headers"], reply["errors"]
+
+    def thumb(self, path: str, max_size: int, channels=None):
+        """
+        긴 변이 max_size 근처가 되도록 축소한 RGB float32 (h, w, 3) 배열.
+        MIP level / 행 건너뛰기 / RGB 채널만 읽기로 전체 해상도 디코딩을 피한다.
+        """
+        import numpy as np
+
+        fd, shm_path = tempfile.mkstemp(prefix="scandata_", suffix=".f32", dir=SHM_DIR)
+        os.close(fd)
+        try:
+            reply = self.request({"op": "thumb", "path": str(path), "max_size": int(max_size),
+                                  "channels": channels, "shm": shm_path})
+            w, h = reply["width"], reply["height"]
+            pixels = np.memmap(shm_path, dtype=np.float32, mode="r+", shape=(h, w, 3))
+        finally:
+            os.unlink(shm_path)
+        return pixels
+
+    def read(self, path: str, channels=None):
+        """
+        (w, h, nch, pixels) 반환. pixels 는 tmpfs 파일을 memmap 한 (h, w, nch) float32 view 로,
+        복사 없이 넘어오며 파일은 매핑 직후 unlink 되어 배열이 해제될 때 메모리도 같이 반환된다.
+        channels: 읽을 layer / 채널 (None 이면 R,G,B – select_channels 참고). nch 는 선택한 채널 수
+        """
+        import numpy as np
+
+        fd, shm_path = tempfile.mkstemp(prefix="scandata_", suffix=".f32", dir=SHM_DIR)
+        os.close(fd)
+        try:
+            reply = self.request({"op": "read", "path": str(path), "channels": channels, "shm": shm_path})
+            w, h, c = reply["width"], reply["height"], reply["nchannels"]
+            pixels = np.memmap(shm_path, dtype=np.float32, mode="r+", shape=(h, w, c))
+        finally:
+            os.unlink(shm_path)
+        return w, h, c, pixels
+
+    def bands(self, path: str, channels=None, band_rows: int = BAND_ROWS):
+        """band 단위 읽기 (BandReader 와 같은 인터페이스)"""
+        return RemoteBandReader(self, path, channels, band_rows)
+
+
+class RemoteBandReader:
+    """
+    worker 쪽에 파일을 열어 두고 band 를 하나씩 요청한다.
+    band 는 (rows, w, c) 크기 tmpfs 버퍼 하나에 덮어쓰이므로 yield 된 배열은 다음 band 전까지만 유효.
+    """
+
+    def __init__(self, worker, path, channels=None, band_rows=BAND_ROWS):
+        import numpy as np
+
+        self._worker = worker
+        reply = worker.request({"op": "open", "path": str(path), "channels": channels,
+                                "band_rows": int(band_rows)})
+        self._handle = reply["handle"]
+        self.width, self.height = reply["width"], reply["height"]
+        self.channels = reply["channels"]
+        self.band_rows = reply["band_rows"]
+        shape = (self.band_rows, self.width, len(self.channels))
+
+        fd, self._shm = tempfile.mkstemp(prefix="scandata_band_", suffix=".f32", dir=SHM_DIR)
+        try:
+            os.ftruncate(fd, shape[0] * shape[1] * shape[2] * 4)
+        finally:
+            os.close(fd)
+        self._buf = np.memmap(self._shm, dtype=np.float32, mode="r+", shape=shape)
+
+    def __iter__(self):
+        for y in range(0, self.height, self.band_rows):
+            n = min(self.band_rows, self.height - y)
+            self._worker.request({"op": "band", "handle": self._handle, "y": y, "n": n, "shm": self._shm})
+            yield y, self._buf[:n]
+
+    def close(self):
+        if self._handle is None:
+            return
+        handle, self._handle = self._handle, None
+        self._buf = None
+        try:
+            os.unlink(self._shm)
+        except OSError:
+            pass
+        try:
+            self._worker.request({"op": "close", "handle": handle})
+        except OIIOWorkerError:
+            pass    # worker 가 재시작됐으면 열린 파일도 이미 없음
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+# ---------------------------------------------------------------------
+# 2. 서버 (rez-env 안의 python 에서 실행)
+# ---------------------------------------------------------------------
+def _spec_metadata(spec) -> dict:
+    metadata = {}
+    try:
+        for k in spec.extra_attrib_names():
+            metadata[k] = str(spec.extra_attrib(k))
+    except AttributeError:
+        try:
+            for attr in spec.extra_attribs:
+                metadata[str(attr.name)] = str(attr.value)
+        except Exception:
+            pass
+    return metadata
+
+
+def _open(oiio, path):
+    img = oiio.ImageInput.open(path)
+    if not img:
+        raise RuntimeError("Cannot open " + path)
+    return img
+
+
+def split_layer(name):
+    """'diffuse.R' → ('diffuse', 'R'), 'R' → ('', 'R')"""
+    layer, _, channel = name.rpartition(".")
+    return layer, channel
+
+
+def select_channels(names, channels=None):
+    """
+    읽을 채널 index 목록 (이 part 에 없으면 빈 목록).
+
+    channels
+      None / ''      : 기본 layer 의 R,G,B (이름이 없으면 앞에서 최대 3개)
+      'diffuse'      : diffuse layer 의 R,G,B (없으면 그 layer 앞에서 최대 3개)
+      ['Z', 'A', ..] : 채널 이름을 그대로 지정
+    """
+    names = list(names)
+    if channels and not isinstance(channels, str):
+        # 하나라도 없으면 이 part 는 아님 (다른 part 를 찾는 건 resolve_selection)
+        if any(c not in names for c in channels):
+            return []
+        return [names.index(c) for c in channels]
+
+    layer = channels or ""
+    index = [i for i, n in enumerate(names) if split_layer(n)[0] == layer]
+    by_name = dict((split_layer(names[i])[1].upper(), i) for i in index)
+    if all(c in by_name for c in ("R", "G", "B")):
+        return [by_name[c] for c in ("R", "G", "B")]
+    if not index and not layer:
+        index = list(range(len(names)))     # 기본 layer 가 없는 파일 (모든 채널에 prefix)
+    return index[:3]
+
+
+def _subimage_name(spec):
+    for key in ("oiio:subimagename", "name"):
+        value = spec.get_string_attribute(key, "")
+        if value:
+            return value
+    return ""
+
+
+def resolve_selection(img, channels=None):
+    """
+    multi-part EXR 에서 읽을 part(subimage) 와 채널 index 를 정한다. → (subimage, spec, index)
+    channels 가 'part:layer' 문자열이면 그 part 에서, 그냥 layer 면 그 layer 가 있는 첫 part 에서 찾는다.
+    """
+    part = None
+    if isinstance(channels, str) and ":" in channels:
+        part, channels = channels.split(":", 1)
+
+    subimage = 0
+    tried = []
+    available = []
+    while img.seek_subimage(subimage, 0):
+        spec = img.spec()
+        name = _subimage_name(spec)
+        if part is None or part in (name, str(subimage)):
+            index = select_channels(spec.channelnames, channels)
+            if index:
+                return subimage, spec, index
+            tried.append(name or str(subimage))
+            available.extend(spec.channelnames)
+        subimage += 1
+    img.seek_subimage(0, 0)
+    where = ("part " + part) if part is not None else ("parts " + ", ".join(tried))
+    if channels and not isinstance(channels, str):
+        # 모든 part 를 본 뒤에만 실패 처리
+        missing = [c for c in channels if c not in available]
+        raise RuntimeError("channel not found: %s in %s (available: %s)"
+                           % (", ".join(missing or channels), where, ", ".join(available)))
+    raise RuntimeError("layer %r not found in %s" % (channels or "", where))
+
+
+class BandReader:
+    """
+    EXR 을 band(행 묶음) 단위로, 선택한 채널만 float32 로 읽는다. (in-process 와 worker 양쪽에서 사용)
+    multi-part 파일은 channels 에 맞는 part(subimage) 하나만 읽는다. (resolve_selection)
+
+        with BandReader(oiio, np, path) as reader:
+            for y, band in reader:          # band: (n, w, c) float32
+                ...
+
+    band 경계는 tile 높이 / EXR 압축 chunk 의 배수로 맞춘다.
+    채널이 연속 구간이 아니면 그 구간을 읽은 뒤 필요한 채널만 골라낸다.
+    """
+
+    def __init__(self, oiio, np, path, channels=None, band_rows=BAND_ROWS):
+        self._oiio, self._np = oiio, np
+        self._img = _open(oiio, path)
+        try:
+            self._subimage, spec, index = resolve_selection(self._img, channels)
+        except Exception:
+            self.close()
+            raise
+        self._spec = spec
+        self.width, self.height = spec.width, spec.height
+        self.channels = [spec.channelnames[i] for i in index]
+        self._chbegin, self._chend = min(index), max(index) + 1
+        pick = [i - self._chbegin for i in index]
+        self._pick = None if pick == list(range(self._chend - self._chbegin)) else pick
+
+        if spec.tile_width and spec.tile_height:
+            chunk = spec.tile_height
+        else:
+            compression = spec.get_string_attribute("compression", "zip").split(":")[0].lower()
+            chunk = _EXR_CHUNK_LINES.get(compression, 16)
+        self.band_rows = max(chunk, -(-int(band_rows) // chunk) * chunk)
+
+    def read(self, y, n):
+        """y 행부터 n 행 (이미지 기준 0 부터) → (n, w, c) float32"""
+        spec, oiio = self._spec, self._oiio
+        y0 = spec.y + y
+        if spec.tile_width and spec.tile_height:
+            px = self._img.read_tiles(self._subimage, 0, spec.x, spec.x + spec.width, y0, y0 + n, 0, 1,
+                                      self._chbegin, self._chend, oiio.FLOAT)
+        else:
+            px = self._img.read_scanlines(self._subimage, 0, y0, y0 + n, 0, self._chbegin, self._chend, oiio.FLOAT)
+        if px is None:
+            raise RuntimeError("read failed: %s" % (self._img.geterror(),))
+        px = self._np.asarray(px, dtype=self._np.float32).reshape(n, spec.width, self._chend - self._chbegin)
+        return px if self._pick is None else px[:, :, self._pick]
+
+    def __iter__(self):
+        for y in range(0, self.height, self.band_rows):
+            n = min(self.band_rows, self.height - y)
+            yield y, self.read(y, n)
+
+    def close(self):
+        if self._img is not None:
+            self._img.close()
+            self._img = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _box_reduce(np, arr, by, bx):
+    """
+    (h, w, c) 를 by x bx 블록 평균으로 축소 (나머지 행/열은 버림).
+    5차원 reshape + mean 보다 행 → 열 순서로 strided view 를 누적하는 쪽이 훨씬 빠르다.
+    """
+    if by == 1 and bx == 1:
+        return arr
+    h, w = arr.shape[0] // by * by, arr.shape[1] // bx * bx
+    rows = np.array(arr[0:h:by, :w], dtype=np.float32)
+    for dy in range(1, by):
+        rows += arr[dy:h:by, :w]
+    out = np.array(rows[:, 0::bx])
+    for dx in range(1, bx):
+        out += rows[:, dx::bx]
+    out *= 1.0 / (by * bx)
+    return out
+
+
+def _row_box(factor):
+    """
+    세로 box 크기. 행 건너뛰기 간격(factor // box)과 곱해 정확히 factor 가 되도록
+    factor 의 약수 중 _THUMB_ROW_BOX 이상인 가장 작은 값 (factor < 2 * _THUMB_ROW_BOX 면 factor 그대로)
+    """
+    if factor < 2 * _THUMB_ROW_BOX:
+        return factor
+    for box in range(_THUMB_ROW_BOX, factor + 1):
+        if factor % box == 0:
+            return box
+    return factor
+
+
+def read_thumbnail(oiio, np, path, max_size, channels=None):
+    """
+    썸네일용 축소 읽기 (in-process OIIO 와 worker 양쪽에서 사용).
+
+    1) MIP map 이 있으면 긴 변이 max_size 이상인 가장 작은 level 을 사용
+    2) 남은 축소 배율 f 에 대해 f // box 간격의 행만 읽음 (box 는 f 의 약수, _row_box)
+    3) NumPy box filter 로 최종 크기까지 평균 → float32 (h, w, 3)
+    channels 는 BandReader 와 같음 (layer / part:layer / 채널 이름 목록)
+    """
+    img = _open(oiio, path)
+    try:
+        subimage, spec, index = resolve_selection(img, channels)
+        chbegin, chend = min(index), max(index) + 1
+        pick = [i - chbegin for i in index]
+        miplevel = 0
+        level = 1
+        while img.seek_subimage(subimage, level):
+            mip_spec = img.spec()
+            if max(mip_spec.width, mip_spec.height) < max_size:
+                break
+            miplevel, spec = level, mip_spec
+            level += 1
+        img.seek_subimage(subimage, miplevel)
+        spec = img.spec()
+
+        w, h = spec.width, spec.height
+        nc = chend - chbegin
+        factor = max(1, -(-max(w, h) // max_size))        # ceil
+        by, bx = _row_box(factor), factor
+        row_step = factor // by                             # row_step * by == factor (가로세로 같은 배율)
+
+        if row_step == 1:
+            px = img.read_scanlines(subimage, miplevel, spec.y, spec.y + h, 0, chbegin, chend, oiio.FLOAT)
+            px = np.asarray(px, dtype=np.float32).reshape(h, w, nc)
+        else:
+            rows = range(spec.y, spec.y + h, row_step)
+            px = np.empty((len(rows), w, nc), dtype=np.float32)
+            for i, y in enumerate(rows):
+                line = img.read_scanlines(subimage, miplevel, y, y + 1, 0, chbegin, chend, oiio.FLOAT)
+                px[i] = np.asarray(line, dtype=np.float32).reshape(w, nc)
+    finally:
+        img.close()
+
+    if pick != list(range(nc)):
+        px = px[:, :, pick]
+    if px.shape[2] < 3:
+        px = np.repeat(px[:, :, :1], 3, axis=2)
+    return _box_reduce(np, px, by, bx)
+
+
+def _handle(oiio, np, req, out, readers):
+    op = req.get("op")
+    if op == "header":
+        img = _open(oiio, req["path"])
+        metadata = _spec_metadata(img.spec())
+        img.close()
+        _write_frame(out, json.dumps({"ok": True, "metadata": metadata}).encode("utf-8"))
+    elif op == "headers":
+        keys = set(req.get("keys") or ())
+        headers, errors = {}, {}
+        for path in req["paths"]:
+            try:
+                img = _open(oiio, path)
+                metadata = _spec_metadata(img.spec())
+                img.close()
+            except Exception as e:
+                errors[path] = str(e)
+                continue
+            if keys:
+                metadata = {k: v for k, v in metadata.items() if k in keys}
+            headers[path] = metadata
+        reply = {"ok": True, "headers": headers, "errors": errors}
+        _write_frame(out, json.dumps(reply).encode("utf-8"))
+    elif op == "read":
+        # 전체 프레임도 band 로 읽어 shm 에 바로 채움 (read_image 결과 + 복사본 두 벌을 만들지 않음)
+        with BandReader(oiio, np, req["path"], req.get("channels")) as reader:
+            shape = (reader.height, reader.width, len(reader.channels))
+            mm = np.memmap(req["shm"], dtype=np.float32, mode="w+", shape=shape)
+            for y, band in reader:
+                mm[y:y + len(band)] = band
+            mm.flush()
+            del mm
+        reply = {"ok": True, "width": shape[1], "height": shape[0], "nchannels": shape[2]}
+        _write_frame(out, json.dumps(reply).encode("utf-8"))
+    elif op == "open":
+        reader = BandReader(oiio, np, req["path"], req.get("channels"), req.get("band_rows") or BAND_ROWS)
+        handle = max(readers, default=0) + 1
+        readers[handle] = [reader, None, None]          # reader, shm 경로, shm memmap
+        reply = {"ok": True, "handle": handle, "width": reader.width, "height": reader.height,
+                 "channels": reader.channels, "band_rows": reader.band_rows}
+        _write_frame(out, json.dumps(reply).encode("utf-8"))
+    elif op == "band":
+        state = readers.get(req["handle"])
+        if state is None:
+            raise RuntimeError("unknown band handle: %r" % (req["handle"],))
+        reader = state[0]
+        if state[1] != req["shm"]:
+            state[1] = req["shm"]
+            state[2] = np.memmap(req["shm"], dtype=np.float32, mode="r+",
+                                 shape=(reader.band_rows, reader.width, len(reader.channels)))
+        y, n = int(req["y"]), int(req["n"])
+        state[2][:n] = reader.read(y, n)
+        _write_frame(out, json.dumps({"ok": True}).encode("utf-8"))
+    elif op == "close":
+        state = readers.pop(req.get("handle"), None)
+        if state is not None:
+            state[0].close()
+        _write_frame(out, json.dumps({"ok": True}).encode("utf-8"))
+    elif op == "thumb":
+        px = read_thumbnail(oiio, np, req["path"], int(req["max_size"]), req.get("channels"))
+        mm = np.memmap(req["shm"], dtype=np.float32, mode="w+", shape=px.shape)
+        mm[...] = px
+        mm.flush()
+        del mm
+        reply = {"ok": True, "width": px.shape[1], "height": px.shape[0]}
+        _write_frame(out, json.dumps(reply).encode("utf-8"))
+    else:
+        raise RuntimeError("unknown op: %r" % (op,))
+
+
+def serve():
+    import numpy as np
+    import OpenImageIO as oiio
+
+    # 프로토콜 전용 stdout 확보 후, 나머지 출력(OIIO 경고 등)은 stderr 로 돌린다
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "wb", buffering=0)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    inp = sys.stdin.buffer
+    readers = {}            # band 읽기 handle → [BandReader, shm 경로, shm memmap]
+
+    while True:
+        try:
+            req = json.loads(_read_frame(inp).decode("utf-8"))
+        except EOFError:
+            break
+        if req.get("op") == "quit":
+            break
+        try:
+            _handle(oiio, np, req, out, readers)
+        except Exception as e:
+            _write_frame(out, json.dumps({"ok": False, "error": str(e)}).encode("utf-8"))
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,76 @@
+from collections import OrderedDict
+from tank.platform.qt import QtCore, QtGui
+
+# 메모리에 들고 있을 QPixmap 총량 (대략 w*h*4 byte 기준)
+PIXMAP_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class PixmapLRU:
+    """
+    썸네일 QPixmap 메모리 LRU. (GUI 스레드 전용)
+    테이블 새로고침 / 정렬 / 행 갱신 때 같은 썸네일을 디스크에서 다시 읽고 축소하지 않도록
+    (경로, 표시 크기) 별로 완성된 QPixmap 을 재사용한다.
+    썸네일 경로는 ThumbnailStore 의 내용 key 를 포함하므로 원본이 바뀌면 경로도 바뀐다.
+    그래서 key 는 (경로, 크기) 뿐이고 그리는 동안 디스크(stat)를 보지 않는다.
+    같은 경로에 다시 쓰는 파일(퍼블리시 thumb_1080.jpg 등)은 쓴 쪽에서 invalidate(path) 를 부른다.
+    """
+
+    def __init__(self, max_bytes: int = PIXMAP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._missing = set()                 # 읽지 못한 (경로, 크기) – 다시 그릴 때마다 열어 보지 않음
+
+    def get(self, path: str, size=None, image=None):
+        """
+        path 썸네일을 size=(w, h) 안에 맞춘 QPixmap. 없으면 None
+        image(QImage) 를 주면 디스크 대신 그 이미지로 채운다. (스캔 스레드에서 미리 읽어 둔 경우)
+        """
+        if not path:
+            return None
+        key = (path, tuple(size) if size else None)
+        pixmap = self._items.get(key)
+        if pixmap is not None:
+            self._items.move_to_end(key)
+            return pixmap
+
+        if image is None or image.isNull():
+            if key in self._missing:
+                return None
+            image = QtGui.QImage(path)
+        if image.isNull():
+            self._missing.add(key)
+            return None
+        self._missing.discard(key)
+        if size and (image.width() > size[0] or image.height() > size[1]):
+            image = image.scaled(size[0], size[1], QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        pixmap = QtGui.QPixmap.fromImage(image)
+
+        self._items[key] = pixmap
+        self._bytes += pixmap.width() * pixmap.height() * 4
+        while self._bytes > self.max_bytes and len(self._items) > 1:
+            _, old = self._items.popitem(last=False)
+            self._bytes -= old.width() * old.height() * 4
+        return pixmap
+
+    def invalidate(self, path: str):
+        """path 를 다시 썼을 때 호출 – 모든 크기의 QPixmap 을 버려 다음 get 에서 새로 읽음"""
+        for key in [k for k in self._items if k[0] == path]:
+            old = self._items.pop(key)
+            self._bytes -= old.width() * old.height() * 4
+        self._missing = {k for k in self._missing if k[0] != path}
+
+    def clear(self):
+        self._items.clear()
+        self._missing.clear()
+        self._bytes = 0
+
+
+_DEFAULT_PIXMAPS = None
+
+
+def get_pixmap_cache() -> PixmapLRU:
+    global _DEFAULT_PIXMAPS
+    if _DEFAULT_PIXMAPS is None:
+        _DEFAULT_PIXMAPS = PixmapLRU()
+    return _DEFAULT_PIXMAPS
@@ -0,0 +1,86 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from tank.platform.qt import QtCore
+from ..model.dir_scanner import scan_exr_folders
+
+# 폴더별 header / 썸네일 처리 동시 실행 수
+ROW_WORKERS = 4
+
+
+class ScanSignals(QtCore.QObject):
+    row_ready = QtCore.Signal(object)       # build_row 결과 (SequenceRecord)
+    progress = QtCore.Signal(int, int)      # 처리한 폴더 수, 지금까지 찾은 폴더 수
+    error = QtCore.Signal(str)
+    finished = QtCore.Signal(bool)          # True 면 취소로 끝남
+
+
+class ScanTask(QtCore.QRunnable):
+    """
+    Browse 스캔을 GUI 스레드 밖에서 실행하는 작업.
+
+    디렉터리 스캔(scan_exr_folders)이 폴더를 찾는 대로 build_row(folder) 를
+    작은 thread pool 에 넘기고, 끝나는 행부터 row_ready 로 흘려보낸다.
+    build_row 는 위젯을 만들지 않는 순수 데이터 작업이어야 한다. (행 추가는 GUI 스레드 slot 에서)
+    """
+
+    def __init__(self, roots, build_row, max_workers: int = ROW_WORKERS, recursive: bool = True):
+        super().__init__()
+        self.roots = list(roots)
+        self.build_row = build_row
+        self.max_workers = max_workers
+        self.recursive = recursive
+        self.signals = ScanSignals()
+        self._cancel = threading.Event()
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def run(self):
+        found = done = 0
+        folders = scan_exr_folders(self.roots, recursive=self.recursive)
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = set()
+
+        def drain(block: bool):
+            nonlocal done
+            if not pending:
+                return
+            finished, _ = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                pending.discard(fut)
+                done += 1
+                try:
+                    row = fut.result()
+                except Exception as e:
+                    self.signals.error.emit(str(e))
+                    row = None
+                if row is not None and not self.cancelled:
+                    self.signals.row_ready.emit(row)
+                self.signals.progress.emit(done, found)
+
+        try:
+            for folder in folders:
+                if self.cancelled:
+                    break
+                pending.add(pool.submit(self.build_row, folder))
+                found += 1
+                self.signals.progress.emit(done, found)
+                # 처리 대기열이 너무 길어지지 않게 (메모리 / 취소 반응성)
+                while len(pending) >= self.max_workers * 2 and not self.cancelled:
+                    drain(block=True)
+                drain(block=False)
+
+            while pending and not self.cancelled:
+                drain(block=True)
+        except Exception as e:
+            print(f"[ERROR] 스캔 실패: {e}")
+            self.signals.error.emit(str(e))
+        finally:
+            folders.close()
+            pool.shutdown(wait=False, cancel_futures=True)
+            self.signals.finished.emit(self.cancelled)
@@ -1,26 +1,22 @@
+import os
 from pathlib import Path
 from tank.platform.qt import QtCore, QtGui
 from ..model.shotgrid_model import ShotGridModel
 from ..controller.format_converter import Format_Converter
+from .pixmap_cache import get_pixmap_cache
+from ..model.frame_set import FrameSet
+from ..model.sequence_store import SequenceStore
 from shotgun_api3 import Shotgun
-from .validate_controller import UNUSED  # 열 번호 상수 가져오기
-
-# 열 인덱스 정의
-SELECT_COL = 0
-SHOT_NAME_COL = 3
-VERSION_COL = 4
-SCAN_PATH_COL = 5
-MOVIE_PATH_COL = 12
-MP4_PATH_COL = 11
-THUMB_PATH_COL = 1  # 썸네일 이미지(QLabel)
-SEQ = 2           # 시퀀스 열 번호 (예)
-SHOT = 3          # 샷 열 번호 (예)
+
+# Publish 때 버전 폴더 manifest.json 에 checksum 기록 (0 이면 끄고 org 를 커널 복사로)
+PUBLISH_CHECKSUM = os.environ.get("SCANDATA_PUBLISH_CHECKSUM", "1") != "0"
 
 class ShotGridContext:
     def __init__(self, project_id):
         self.project_id = project_id
         self.shot_versions = {}
         self.shots = {}
+        self.columns = []
         # ShotGrid API 연결 (발급받은 스크립트명과 키로 변경 필요)
         self.sg = Shotgun(
             base_url="https://westworld5.shotgrid.autodesk.com",
@@ -30,9 +26,13 @@ class ShotGridContext:
 
     def load_data(self, model: ShotGridModel):
         self.shots.clear()
+        self.columns = list(model.columns)          # self.shots 값(tuple) 의 열 이름
+        shot_col = model.column_index("Shot Name")
         for row in model.iter_rows():
-            shot_name = row['Shot Name'].strip()
-            self.shots[shot_name] = row.to_dict()
+            shot_name = row[shot_col]
+            if shot_name is None:
+                continue
+            self.shots[str(shot_name).strip()] = row
 
     def get_next_version_code(self, shot_name):
         if shot_name not in self.shot_versions:
@@ -125,9 +125,10 @@ class ShotGridContext:
 
 
 class ShotGridController(QtCore.QObject):
-    def __init__(self, ui, project_id: int, parent=None):
+    def __init__(self, ui, project_id: int, store: SequenceStore, parent=None):
         super().__init__(parent)
         self.ui = ui
+        self.store = store
         self.model = ShotGridModel(project_id)
         self.context = ShotGridContext(project_id)
         self.format_converter = Format_Converter()
@@ -166,8 +167,7 @@ class ShotGridController(QtCore.QObject):
 
 
     def _on_publish(self):
-        tbl = self.ui.table
-        if tbl.rowCount() == 0:
+        if len(self.store) == 0:
             self._msg("오류", "테이블에 데이터가 없습니다.")
             return
 
@@ -187,14 +187,11 @@ class ShotGridController(QtCore.QObject):
         base_root = Path(*scan_root.parts[:base_idx + 1]) / "seq"
 
         try:
-            for row in range(tbl.rowCount()):
-                check_item = tbl.item(row, SELECT_COL)
-                if not check_item or check_item.checkState() != QtCore.Qt.Checked:
-                    continue
-
-                shot_name = self._cell(tbl, row, SHOT_NAME_COL)
-                seq_folder = self._cell(tbl, row, SEQ).strip()
-                shot_folder = self._cell(tbl, row, SHOT).strip()
+            for record in self.store.checked():
+                row = self.store.row_of(record.scan)
+                shot_name = record.shot
+                seq_folder = record.seq.strip()
+                shot_folder = record.shot.strip()
 
                 # 1. EXR 폴더 재귀 탐색
                 exr_search_path = self._find_exr_folder(scan_root, seq_folder, shot_folder)
@@ -208,19 +205,27 @@ class ShotGridController(QtCore.QObject):
                     print(f" Row {row+1}: EXR 파일 없음 → {exr_search_path}")
                     continue
 
-                version_path_str = self._cell(tbl, row, UNUSED)
-                if not version_path_str:
-                    print(f" Row {row+1}: UNUSED에 버전 경로가 없습니다.")
+                # 2. 빠진 / 중복 프레임이 있으면 변환 전에 중단
+                frames = FrameSet.from_paths(exr_files)
+                if not frames.is_clean:
+                    print(f" Row {row+1}: 프레임 검사 실패 – {frames.check_text()}")
                     continue
 
-                version_root = Path(version_path_str)
+                if not record.version_path:
+                    print(f" Row {row+1}: 버전 경로가 없습니다. (Validate 의 Version 검사 필요)")
+                    continue
+
+                version_root = Path(record.version_path)
                 version_code = version_root.name
 
                 # 3. 변환 및 복사
                 paths = self.format_converter.copy_exr_sequence(
                     exr_files=[str(p) for p in exr_files],
                     destination_root=str(version_root),
-                    last_open_dir=str(exr_search_path)
+                    last_open_dir=str(exr_search_path),
+                    checksum=PUBLISH_CHECKSUM,
+                    progress=lambda done, total, frame, error, shot=shot_folder:
+                        self._on_convert_progress(shot, done, total, frame, error),
                 )
                 # 4. ShotGrid 등록
                 self.context.publish_version(
@@ -232,10 +237,17 @@ class ShotGridController(QtCore.QObject):
                     thumbnail_path=Path(paths.get("thumb", "")) if paths.get("thumb") else None,
                 )
 
-                # 5. UI 업데이트
-                self._update_ui_field(tbl, row, MOVIE_PATH_COL, paths.get("webm", ""))
-                self._update_ui_field(tbl, row, MP4_PATH_COL, paths.get("mp4", ""))
-                self._update_ui_field(tbl, row, THUMB_PATH_COL, paths.get("thumb", ""), is_thumb=True)
+                # 5. store 갱신 → 테이블은 변경 알림으로 다시 그림 (썸네일은 delegate 가 보이는 행만)
+                #    thumb_1080.jpg 는 같은 이름으로 다시 쓰므로 이전 QPixmap 을 버린다
+                if paths.get("thumb"):
+                    get_pixmap_cache().invalidate(paths["thumb"])
+                self.store.update(
+                    record.scan,
+                    movie=paths.get("webm") or record.movie,
+                    mp4=paths.get("mp4") or record.mp4,
+                    thumb_path=paths.get("thumb") or record.thumb_path,
+                    published=True,
+                )
 
             self._msg("완료", "Publish 작업이 완료되었습니다.")
 
@@ -260,25 +272,8 @@ class ShotGridController(QtCore.QObject):
 
         return candidates[0] if candidates else None  # fallback
 
-    def _cell(self, table, row: int, col: int) -> str:
-        item = table.item(row, col)
-        return item.text().strip() if item else ""
-
-    def _update_ui_field(self, table, row: int, col: int, text: str, is_thumb=False):
-        if not text:
-            return
-
-        if is_thumb:
-            pixmap = QtGui.QPixmap(text)
-            if not pixmap.isNull():
-                label = QtGui.QLabel()
-                label.setPixmap(pixmap.scaled(120, 50, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
-                table.setCellWidget(row, col, label)
-                return
-
-        item = table.item(row, col)
-        if item:
-            item.setText(text)
-        else:
-            table.setItem(row, col, QtGui.QTableWidgetItem(text))
-
+    def _on_convert_progress(self, shot: str, done: int, total: int, frame: int, error):
+        # 여기서 processEvents 를 돌리면 publish 도중 Publish 버튼이 다시 눌려 재진입하므로
+        # 상태만 기록 (화면은 publish 가 끝나고 이벤트 루프로 돌아가면 갱신, 진행은 로그로 확인)
+        state = f"실패 {frame}" if error else f"{done}/{total}"
+        self.ui.status_line.setText(f"{shot} JPG 변환 {state}")
@@ -0,0 +1,410 @@
+# controller/table_model.py
+"""
+Browse / Excel 테이블용 model-view.
+
+QTableWidget 은 셀마다 QTableWidgetItem, 썸네일마다 QLabel 위젯을 만들어서
+행 수에 비례해 채우는 시간과 메모리가 늘었다. 여기서는 셀 객체를 만들지 않는다.
+
+- SequenceTableModel : Browse 결과. SequenceStore 의 record 를 그대로 보여주고 (값 복사 없음)
+                       store 변경 알림을 beginInsertRows / dataChanged 로 옮긴다
+- SequenceProxyModel : 검색 / 필터 / 정렬. SequenceIndex(trie / 정렬 배열 / bitset) 결과를
+                       proxy 행 → store 행 번호 배열로만 들고 있어 위젯이나 item 을 다시 만들지 않음
+- FrameTableModel    : Excel 에서 불러온 DataFrame. 열 단위 문자열 list 로 들고 있음
+- ThumbnailDelegate  : 썸네일 경로만 받아 화면에 보이는 행을 그릴 때 PixmapLRU 에서 QPixmap 을 가져옴
+
+편집 가능 여부는 두 model 모두 flags() 에서 editable 플래그 하나로 결정한다.
+view 는 화면에 보이는 행에 대해서만 data() 를 부르므로 채우기 / 스크롤 비용이 보이는 행 수에 비례한다.
+"""
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from tank.platform.qt import QtCore, QtGui
+from ..model.sequence_store import SequenceRecord, SequenceStore, parse_version
+from ..model.sequence_index import SequenceIndex, SequenceQuery, parse_query
+from ..model.excel_diff import cell_text
+from .pixmap_cache import get_pixmap_cache
+
+# data() 에서 썸네일 경로를 꺼낼 때 쓰는 role
+ThumbPathRole = QtCore.Qt.UserRole + 1
+
+THUMB_ROW_HEIGHT = 110      # 썸네일(table 크기 높이 100)보다 조금 크게
+_PROBLEM_COLOR = "#ff6b6b"
+
+
+def _text(value) -> str:
+    return value if value else "-"
+
+
+# Browse 테이블 열: (헤더, 표시 문자열, 편집 시 바꿀 record 필드)
+# 순서는 browse_load / validate_controller 의 SELECT ~ FCHECK 열 번호와 같다
+SEQUENCE_COLUMNS: List[Tuple[str, Optional[Callable[[SequenceRecord], str]], Optional[str]]] = [
+    ("Select", None, None),
+    ("Thumbnail", lambda r: "" if r.thumb_path else "-", None),
+    ("Seq Name", lambda r: _text(r.seq), "seq"),
+    ("Shot Name", lambda r: _text(r.shot), "shot"),
+    ("Version", lambda r: r.version_text, "version"),
+    ("Scan Path", lambda r: r.scan, None),
+    ("Frame Range", lambda r: r.frame_range_text, None),
+    ("Timecode", lambda r: _text(r.timecode), "timecode"),
+    ("Colorspace", lambda r: _text(r.colorspace), "colorspace"),
+    ("Date", lambda r: _text(r.date), None),
+    ("Camera", lambda r: r.camera, "camera"),
+    ("Unused", lambda r: r.version_path, None),          # Validate 가 정한 버전 경로 (숨김 열)
+    ("Movie Path", lambda r: _text(r.movie), None),
+    ("Frame Check", lambda r: r.frames.check_text(), None),   # 빠진 / 중복 프레임 요약 ("OK" 면 정상)
+]
+_SELECT_COL, _THUMB_COL = 0, 1
+_FCHECK_COL = len(SEQUENCE_COLUMNS) - 1
+
+# 열 → SequenceIndex.order() 키 (썸네일 열은 정렬하지 않음)
+SORT_KEYS = {
+    0: "checked", 2: "seq", 3: "shot", 4: "version", 5: "scan", 6: "frame_count",
+    7: "timecode", 8: "colorspace", 9: "mtime", 10: "camera", 11: "version_path",
+    12: "movie", 13: "check",
+}
+# 스캔 중 행이 연달아 들어올 때 필터 / 정렬을 다시 계산하는 간격
+_REFRESH_DELAY_MS = 100
+
+
+class SequenceTableModel(QtCore.QAbstractTableModel):
+    """SequenceStore 위의 table model. 행 = store 의 record 순서"""
+
+    def __init__(self, store: SequenceStore, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.editable = False
+        store.add_listener(self._on_store_changed)
+
+    def _on_store_changed(self, event: str, first: int, last: int, fields: tuple):
+        root = QtCore.QModelIndex()
+        if event == "about_to_insert":
+            self.beginInsertRows(root, first, last)
+        elif event == "inserted":
+            self.endInsertRows()
+        elif event == "about_to_remove":
+            self.beginRemoveRows(root, first, last)
+        elif event == "removed":
+            self.endRemoveRows()
+        elif event == "about_to_reset":
+            self.beginResetModel()
+        elif event == "reset":
+            self.endResetModel()
+        elif event == "updated":
+            self.dataChanged.emit(self.index(first, 0), self.index(last, self.columnCount() - 1))
+
+    # ─── Qt model API ─────────────────────────────────────────────
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(SEQUENCE_COLUMNS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            if 0 <= section < len(SEQUENCE_COLUMNS):
+                return SEQUENCE_COLUMNS[section][0]
+            return None
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self.store[index.row()]
+        col = index.column()
+        if col == _SELECT_COL:
+            if role == QtCore.Qt.CheckStateRole:
+                return QtCore.Qt.Checked if record.checked else QtCore.Qt.Unchecked
+            return None
+        if col == _THUMB_COL and record.thumb_path:
+            if role == ThumbPathRole:
+                return record.thumb_path
+            if role == QtCore.Qt.ToolTipRole and record.tooltip_path:
+                return f'<img src="{record.tooltip_path}">'
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return SEQUENCE_COLUMNS[col][1](record)
+        if role == QtCore.Qt.ForegroundRole and col == _FCHECK_COL and not record.frames.is_clean:
+            return QtGui.QBrush(QtGui.QColor(_PROBLEM_COLOR))
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid():
+            return False
+        row, col = index.row(), index.column()
+        if col == _SELECT_COL and role == QtCore.Qt.CheckStateRole:
+            self.store.set_checked([row], value in (QtCore.Qt.Checked, 2))
+            return True
+        field = SEQUENCE_COLUMNS[col][2]
+        if role != QtCore.Qt.EditRole or field is None:
+            return False
+        value = "" if value is None else str(value).strip()
+        if field == "version":
+            value = parse_version(value)
+            if value is None:
+                return False        # 'v003' / '3' 형식이 아니면 편집 취소
+        # store 가 updated 알림을 보내 dataChanged 가 나간다
+        return self.store.update(self.store[row].scan, **{field: value})
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        if index.column() == _SELECT_COL:
+            return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsUserCheckable
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        if self.editable and SEQUENCE_COLUMNS[index.column()][2] is not None:
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def set_editable(self, editable: bool):
+        # 셀마다 flag 를 바꾸는 대신 flags() 가 보는 값 하나만 바꾼다
+        self.editable = editable
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(self.rowCount() - 1, self.columnCount() - 1))
+
+
+class SequenceProxyModel(QtCore.QAbstractProxyModel):
+    """
+    SequenceTableModel 앞에 두는 검색 / 정렬 layer (QSortFilterProxyModel 과 같은 자리).
+    QSortFilterProxyModel 은 행마다 filterAcceptsRow / lessThan 을 Python 으로 부르므로 1만 행에서 느리다.
+    여기서는 SequenceIndex 가 mask 와 정렬 순서를 NumPy 배열로 주고, proxy 는 행 번호 배열만 바꾼다.
+    """
+
+    def __init__(self, source: SequenceTableModel, parent=None):
+        super().__init__(parent)
+        self.store = source.store
+        self.seq_index = SequenceIndex(self.store)
+        self._query = SequenceQuery()
+        self._sort_key: Optional[str] = None
+        self._descending = False
+        self._rows = np.zeros(0, dtype=np.intp)          # proxy 행 → source 행
+        self._proxy_of = np.zeros(0, dtype=np.intp)      # source 행 → proxy 행 (-1 = 숨김)
+        self.last_elapsed = 0.0                          # 마지막 필터 / 정렬 계산 시간 (초)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(_REFRESH_DELAY_MS)
+        self._timer.timeout.connect(self.refresh)
+
+        self.setSourceModel(source)
+        source.rowsInserted.connect(self._on_source_rows_inserted)
+        source.rowsRemoved.connect(self.refresh)
+        source.modelReset.connect(self.refresh)
+        source.dataChanged.connect(self._on_source_data_changed)
+        self.store.add_listener(self._on_store_changed)
+        self.refresh()
+
+    # ─── 필터 / 정렬 ───────────────────────────────────────────
+    @property
+    def active(self) -> bool:
+        return not self._query.empty or self._sort_key is not None
+
+    def set_filter_text(self, text: str):
+        """검색창 문자열 적용. 문법 오류면 ValueError (이전 필터 유지)"""
+        self._query = parse_query(text)
+        self.refresh()
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        # 행 집합은 그대로 두고 순서만 바꾸므로 reset 대신 layoutChanged (선택 유지)
+        self._sort_key = SORT_KEYS.get(column)
+        self._descending = order == QtCore.Qt.DescendingOrder
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sources = [self.mapToSource(i) for i in persistent]
+        self._compute()
+        self.changePersistentIndexList(persistent, [self.mapFromSource(i) for i in sources])
+        self.layoutChanged.emit()
+
+    def refresh(self, *args):
+        # rowsRemoved / modelReset 신호 인자는 쓰지 않음
+        self._timer.stop()
+        self.beginResetModel()
+        self._compute()
+        self.endResetModel()
+
+    def _compute(self):
+        t0 = time.perf_counter()
+        mask = self.seq_index.query(self._query)
+        if self._sort_key is not None:
+            order = self.seq_index.order(self._sort_key, self._descending)
+            rows = order[mask[order]]
+        else:
+            rows = np.flatnonzero(mask)
+        self._rows = rows.astype(np.intp, copy=False)
+        self._proxy_of = np.full(len(mask), -1, dtype=np.intp)
+        self._proxy_of[self._rows] = np.arange(len(self._rows), dtype=np.intp)
+        self.last_elapsed = time.perf_counter() - t0
+
+    def _depends_on(self) -> set:
+        """지금 필터 / 정렬 결과를 바꿀 수 있는 record 필드"""
+        q = self._query
+        fields = set(q.flags)
+        if q.names:
+            fields |= {"seq", "shot"}
+        fields |= {"seq"} if q.seq else set()
+        fields |= {"shot"} if q.shot else set()
+        if q.frames != (None, None):
+            fields.add("frames")
+        if q.date != (None, None):
+            fields.add("mtime")
+        if self._sort_key is not None:
+            key = self._sort_key
+            fields.add({"frame_count": "frames", "first": "frames", "check": "frames"}.get(key, key))
+        return fields
+
+    def _on_store_changed(self, event: str, first: int, last: int, fields: tuple):
+        # 체크 하나 바꿨다고 정렬 / 필터와 상관없는 경우까지 다시 계산하지 않도록 필드로 판단
+        if event == "updated" and self._depends_on().intersection(fields):
+            self._timer.start()
+
+    def _on_source_rows_inserted(self, parent, first, last):
+        if self.active:
+            self._timer.start()          # 스캔 중 연속 추가는 모아서 한 번에 다시 계산
+            return
+        # 필터 / 정렬이 없으면 그대로 뒤에 붙인다
+        start = len(self._rows)
+        self.beginInsertRows(QtCore.QModelIndex(), start, start + last - first)
+        new_rows = np.arange(first, last + 1, dtype=np.intp)
+        self._rows = np.concatenate([self._rows, new_rows])
+        self._proxy_of = np.concatenate([self._proxy_of, np.arange(start, start + len(new_rows))])
+        self.endInsertRows()
+
+    def _on_source_data_changed(self, top_left, bottom_right, roles=()):
+        first, last = top_left.row(), bottom_right.row()
+        mapped = self._proxy_of[first:last + 1]
+        mapped = mapped[mapped >= 0]
+        if len(mapped):
+            self.dataChanged.emit(self.index(int(mapped.min()), top_left.column()),
+                                  self.index(int(mapped.max()), bottom_right.column()))
+
+    # ─── QAbstractProxyModel API ──────────────────────────────────
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or proxy_index.row() >= len(self._rows):
+            return QtCore.QModelIndex()
+        return self.sourceModel().index(int(self._rows[proxy_index.row()]), proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid() or source_index.row() >= len(self._proxy_of):
+            return QtCore.QModelIndex()
+        row = int(self._proxy_of[source_index.row()])
+        return self.index(row, source_index.column()) if row >= 0 else QtCore.QModelIndex()
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self._rows)) or not (0 <= column < self.columnCount()):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        return QtCore.QModelIndex()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+
+    def set_editable(self, editable: bool):
+        self.sourceModel().set_editable(editable)
+
+
+class FrameTableModel(QtCore.QAbstractTableModel):
+    """Excel DataFrame 표시용. 값은 열(column) 단위 문자열 list"""
+
+    def __init__(self, df=None, parent=None):
+        super().__init__(parent)
+        self.editable = False
+        self._headers: List[str] = []
+        self._columns: List[List[str]] = []
+        if df is not None:
+            self.set_frame(df)
+
+    def set_frame(self, df):
+        """DataFrame 전체를 표시 (열 구성도 DataFrame 기준). 셀 객체 없이 열 list 만 만든다"""
+        self.beginResetModel()
+        self._headers = [str(c) for c in df.columns]
+        # 빈 셀(NaN / None)은 "nan" 대신 빈 문자열로
+        self._columns = [[cell_text(v) for v in df[c].tolist()] for c in df.columns]
+        self.endResetModel()
+
+    @property
+    def headers(self) -> List[str]:
+        return list(self._headers)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() or not self._columns else len(self._columns[0])
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            if 0 <= section < len(self._headers):
+                return self._headers[section]
+            return None
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if index.isValid() and role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return self._columns[index.column()][index.row()]
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+        value = "" if value is None else str(value)
+        column = self._columns[index.column()]
+        if column[index.row()] == value:
+            return True                 # 같은 값으로 편집을 끝낸 경우는 변경으로 치지 않음
+        column[index.row()] = value
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        if self.editable:
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def set_editable(self, editable: bool):
+        # 값은 그대로이므로 dataChanged 를 내지 않는다 (dataChanged 는 편집 기록에 쓰임)
+        self.editable = editable
+
+    def value(self, row: int, col: int) -> str:
+        return self._columns[col][row]
+
+    def column_values(self, col: int) -> List[str]:
+        return list(self._columns[col])
+
+
+class ThumbnailDelegate(QtGui.QStyledItemDelegate):
+    """
+    ThumbPathRole 경로의 썸네일을 그리는 delegate.
+    paint() 는 화면에 보이는 셀에만 불리므로 보이는 행의 썸네일만 디코딩되고,
+    한 번 만든 QPixmap 은 PixmapLRU 가 (경로, 크기) 별로 들고 있다.
+    """
+
+    def __init__(self, parent=None, size=(300, 100)):
+        super().__init__(parent)
+        self.size = size
+        self.pixmaps = get_pixmap_cache()
+
+    def paint(self, painter, option, index):
+        path = index.data(ThumbPathRole)
+        pixmap = self.pixmaps.get(path, size=self.size) if path else None
+        if pixmap is None:
+            super().paint(painter, option, index)
+            return
+        self.initStyleOption(option, index)
+        style = option.widget.style() if option.widget else QtGui.QApplication.style()
+        style.drawPrimitive(QtGui.QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+        # 셀 왼쪽 기준, 세로 가운데 정렬
+        rect = option.rect
+        y = rect.y() + max(0, (rect.height() - pixmap.height()) // 2)
+        painter.drawPixmap(rect.x(), y, pixmap)
+
+    def sizeHint(self, option, index):
+        if index.data(ThumbPathRole):
+            return QtCore.QSize(self.size[0], THUMB_ROW_HEIGHT)
+        return super().sizeHint(option, index)
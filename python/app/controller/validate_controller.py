@@ -5,14 +5,17 @@ from pathlib import Path
 from tank.platform.qt import QtCore, QtGui
 from ..view.scandata_ui import Ui_Dialog
 from ..controller.format_converter import Format_Converter
+from ..model.frame_set import FrameSet
+from ..model.sequence_store import SequenceStore
 from collections import defaultdict
 
-SELECT, THUMB, SEQ, SHOT, VER, SCAN, FRANGE, TCODE, COLORSPACE, DATETIME, CAM, UNUSED, MOVIE = range(13)
+SELECT, THUMB, SEQ, SHOT, VER, SCAN, FRANGE, TCODE, COLORSPACE, DATETIME, CAM, UNUSED, MOVIE, FCHECK = range(14)
 
 class ValidationData:
     def __init__(
         self, filepath: Path, start_frame: int, end_frame: int, fps: float,
-        version_int: int, src_version: str, shot_name: str, editorial_list
+        version_int: int, src_version: str, shot_name: str, editorial_list,
+        scan_path: Path | None = None, scan_key: str | None = None
     ):
         self.filepath = filepath
         self.start_frame = start_frame
@@ -22,6 +25,8 @@ class ValidationData:
         self.src_version = src_version
         self.shot_name = shot_name
         self.editorial_list = editorial_list
+        self.scan_path = scan_path
+        self.scan_key = scan_key      # SequenceStore key (검증 결과 / 버전 경로 기록용)
         
 class ValidationResult:
     def __init__(self, name: str):
@@ -36,9 +41,10 @@ class ValidationResult:
         return not self.errors
 
 class ValidationController(QtCore.QObject):
-    def __init__(self, ui: Ui_Dialog  ):
+    def __init__(self, ui: Ui_Dialog, store: SequenceStore):
         super().__init__()
         self.ui = ui
+        self.store = store
         # self.last_open_dir = last_open_dir
         self.ui.table.setColumnHidden(UNUSED, True)
         self._re_ver = re.compile(r"_v(\d{3})")
@@ -48,9 +54,10 @@ class ValidationController(QtCore.QObject):
         ui.validate_version.clicked.connect(self.validate_version)
         ui.validate_src_version.clicked.connect(self.validate_src_version)
         ui.validate_editorial.clicked.connect(self.validate_editorial)
+        ui.validate_frames.clicked.connect(self.validate_frames)
 
     def validate_all(self):
-        self._validate_items(["timecode", "version", "src_version", "editorial"])
+        self._validate_items(["frames", "timecode", "version", "src_version", "editorial"])
 
     def validate_timecode(self):
         self._validate_items(["timecode"])
@@ -64,6 +71,9 @@ class ValidationController(QtCore.QObject):
     def validate_editorial(self):
         self._validate_items(["editorial"])
 
+    def validate_frames(self):
+        self._validate_items(["frames"])
+
     def _validate_items(self, items_to_check: list[str]):
         rows, errors = self._collect_rows()
         if errors:
@@ -75,44 +85,40 @@ class ValidationController(QtCore.QObject):
 
         full_log, all_pass = [], True
         for idx, data in enumerate(rows, 1):
-            self._current_validating_row = idx - 1
             if not data.filepath or not data.filepath.exists():
                 full_log.append(f"Row {idx}: 잘못된 filepath: {data.filepath}")
+                self.store.update(data.scan_key, validated=False)
                 all_pass = False
                 continue
 
             results = self._run_checks(data, items_to_check)
             full_log.append(f"── Row {idx} ────────────")
+            row_pass = True
             for res in results:
                 head = "O" if res.passed else "X"
                 full_log.append(f"[{res.name}] {head}")
                 full_log += [f"  - {e}" for e in res.errors]
                 if not res.passed:
-                    all_pass = False
+                    row_pass = all_pass = False
+            self.store.update(data.scan_key, validated=row_pass)
 
         self._show_msg("검증 결과", "\n".join(full_log))
         self.ui.publish_button.setEnabled(all_pass)
 
-    def _update_ui_path_field(self, row: int, col: int, text: str):
-        item = self.ui.table.item(row, col)
-        if item:
-            item.setText(text)
-        else:
-            new_item = QtGui.QTableWidgetItem(text)
-            self.ui.table.setItem(row, col, new_item)
+    def _update_version_path(self, d: ValidationData, path: Path):
+        # 숨김 열(UNUSED)에 보이던 버전 경로 – Publish 가 store 에서 바로 읽는다
+        self.store.update(d.scan_key, version_path=str(path))
 
-    def _update_ui_version_field(self, row: int, version_int: int):
-        tbl = self.ui.table
-        item = tbl.item(row, VER)
-        if item:
-            item.setText(f"v{version_int:03d}")
+    def _update_version(self, d: ValidationData, version_int: int):
+        self.store.update(d.scan_key, version=version_int)
 
     def _run_checks(self, d: ValidationData, items_to_check: list[str]):
         checks = {
             "timecode": self._check_timecode,
             "version": self._check_version,
             "src_version": self._check_src_version,
-            "editorial": self._check_editorial
+            "editorial": self._check_editorial,
+            "frames": self._check_frames,
         }
         return [checks[item](d) for item in items_to_check if item in checks]
 
@@ -130,6 +136,12 @@ class ValidationController(QtCore.QObject):
             res.add("End Frame이 Start Frame보다 작거나 같습니다.")
         if abs(d.fps - 24.0) > 0.01:
             res.add(f"FPS {d.fps} ≠ 24.0")
+
+        # 첫 프레임만이 아니라 시퀀스 전체 프레임의 timecode 연속성 확인
+        if d.scan_path and d.scan_path.is_dir():
+            exr_files = sorted(d.scan_path.glob("*.exr"))
+            for msg in self.format_converter.check_timecode_continuity(exr_files, fps=int(round(d.fps))):
+                res.add(msg)
         return res
 
     def _check_version(self, d: ValidationData):
@@ -164,7 +176,7 @@ class ValidationController(QtCore.QObject):
                 except Exception as e:
                     res.add(f"v001 폴더 생성 실패: {e}")
                     return res
-            self._update_ui_version_field(self._current_validating_row, 1)
+            self._update_version(d, 1)
             return res
 
         # UI에 입력된 버전이 최신 버전 이하라면 다음 버전 폴더 생성 및 UI 업데이트
@@ -177,15 +189,15 @@ class ValidationController(QtCore.QObject):
                 except Exception as e:
                     res.add(f"v{next_version:03d} 폴더 생성 실패: {e}")
                     return res
-            self._update_ui_version_field(self._current_validating_row, next_version)
+            self._update_version(d, next_version)
             # 버전 경로 저장
-            self._update_ui_path_field(self._current_validating_row, UNUSED, str(next_version_path))
+            self._update_version_path(d, next_version_path)
 
         else:
             self._show_msg("버전 검증", f"현재 버전 v{current_version:03d}는 최신 버전 이상입니다.")
             # 최신 이상 버전도 저장
             current_version_path = version_root / f"v{current_version:03d}"
-            self._update_ui_path_field(self._current_validating_row, UNUSED, str(current_version_path))
+            self._update_version_path(d, current_version_path)
 
         return res
 
@@ -196,6 +208,20 @@ class ValidationController(QtCore.QObject):
             res.add(f"Src 버전 {d.src_version} ≠ 입력 버전 {expected}")
         return res
 
+    def _check_frames(self, d: ValidationData):
+        # 스캔 폴더를 다시 읽어 빠진 / 중복 / 패딩 불일치 프레임 검사 (변환 전에 걸러냄)
+        res = ValidationResult("Frames")
+        if not d.scan_path or not d.scan_path.is_dir():
+            res.add(f"스캔 경로가 없습니다: {d.scan_path}")
+            return res
+        frames = FrameSet.from_paths(p.name for p in d.scan_path.iterdir() if p.name.endswith(".exr"))
+        if not frames:
+            res.add("프레임 번호가 있는 EXR 이 없습니다.")
+            return res
+        for msg in frames.problems():
+            res.add(msg)
+        return res
+
     def _check_editorial(self, d: ValidationData):
         res = ValidationResult("Editorial")
         if d.shot_name not in d.editorial_list:
@@ -210,23 +236,16 @@ class ValidationController(QtCore.QObject):
         raise FileNotFoundError("상위 경로에서 'scandata_project/seq'를 찾을 수 없습니다.")
     
     def _collect_rows(self):
-        tbl = self.ui.table
+        # 체크된 행을 store 에서 바로 읽는다 (프레임 / 버전은 이미 숫자)
         rows, errs = [], []
 
-        def cell(r, c):
-            item = tbl.item(r, c)
-            return item.text().strip() if item else ""
-
-        for r in range(tbl.rowCount()):
-            chk_item = tbl.item(r, SELECT)
-            if not chk_item or chk_item.checkState() != QtCore.Qt.Checked:
-                continue
+        for record in self.store.checked():
+            r = self.store.row_of(record.scan)
             try:
-                scan_path_str = cell(r, SCAN)
-                if not scan_path_str:
+                if not record.scan:
                     errs.append(f"Row {r+1}: Scan 경로 없음")
                     continue
-                scan_path = Path(scan_path_str).resolve()
+                scan_path = Path(record.scan).resolve()
 
                 parts = scan_path.parts
                 try:
@@ -238,15 +257,13 @@ class ValidationController(QtCore.QObject):
                     errs.append(f"Row {r+1}: scan 또는 scandata_project 폴더가 경로에 없습니다.")
                     continue
 
-                frame_range = cell(r, FRANGE)
-                start_s, end_s = frame_range.split("-")
-                start_f, end_f = int(start_s), int(end_s)
+                if not record.frames:
+                    errs.append(f"Row {r+1}: 프레임 범위 없음")
+                    continue
                 fps_val = 24.0
-                ver_str = cell(r, VER).lstrip("vV")
-                ver_int = int(ver_str) if ver_str.isdigit() else 1
 
-                seq_folder = cell(r, SEQ).strip() or "default_seq"
-                shot_folder = cell(r, SHOT).strip() or "default_shot"
+                seq_folder = record.seq.strip() or "default_seq"
+                shot_folder = record.shot.strip() or "default_shot"
 
                 version_root = seq_root / seq_folder / shot_folder / "org" / "plate" / "org"
 
@@ -267,13 +284,15 @@ class ValidationController(QtCore.QObject):
 
                 data = ValidationData(
                     filepath=version_root,
-                    start_frame=start_f,
-                    end_frame=end_f,
+                    start_frame=record.frames.first,
+                    end_frame=record.frames.last,
                     fps=fps_val,
-                    version_int=ver_int,
+                    version_int=record.version,
                     src_version=src_ver,
                     shot_name=shot_folder,
-                    editorial_list=["SH010", "SH012", "SH013"]
+                    editorial_list=["SH010", "SH012", "SH013"],
+                    scan_path=scan_path,
+                    scan_key=record.scan,
                 )
                 rows.append(data)
 
@@ -6,6 +6,7 @@ from .controller.browse_load import BrowserLoad
 from .controller.excel_controller import ExcelController
 from .controller.validate_controller import ValidationController
 from .controller.shotgrid_controller import ShotGridController
+from .model.sequence_store import SequenceStore
 
 logger = sgtk.platform.get_logger(__name__)
 
@@ -30,11 +31,15 @@ class AppDialog(QtGui.QWidget):
         self._init_controllers()
 
     def _init_controllers(self):
+        # Browse 결과 행은 이 store 하나에 있고 모든 컨트롤러가 같이 읽는다
+        self.sequence_store = SequenceStore()
+
         # ExcelController 먼저 생성
         self.excel_controller = ExcelController(
             table_widget=self.ui.table,
             status_line=self.ui.status_line,
-            ui=self.ui
+            ui=self.ui,
+            store=self.sequence_store
         )
 
         # BrowserLoad 에 넘겨주기
@@ -43,10 +48,11 @@ class AppDialog(QtGui.QWidget):
             dialog = self,
             context=self.context,
             last_open_dir=self.last_open_dir,
-            excel_ctrl=self.excel_controller
+            excel_ctrl=self.excel_controller,
+            store=self.sequence_store
         )
 
-        self.validate_controller = ValidationController(self.ui)
+        self.validate_controller = ValidationController(self.ui, store=self.sequence_store)
 
         # 신규 ShotGridController 추가
         project_id = self.context.project["id"] if self.context and self.context.project else None
@@ -55,5 +61,6 @@ class AppDialog(QtGui.QWidget):
         else:
             self.shotgrid_controller = ShotGridController(
                 ui=self.ui,
-                project_id=project_id
+                project_id=project_id,
+                store=self.sequence_store
             )
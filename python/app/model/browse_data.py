@@ -1,23 +1,42 @@
-
 from pathlib import Path
 from typing import List, Dict, Any
 from .excel import ExcelDataModel
 from .scan_and_get_frame_range import scan_exr_sequences
+from .metadata_cache import get_default_cache
+from .sequence_store import SequenceRecord, SequenceStore
 
 class ScanModel:
-    def __init__(self):
-        # 데이터 저장하는 그릇
+    def __init__(self, store: SequenceStore = None):
+        # 데이터 저장하는 그릇 (스캔 결과 행) + 엑셀 저장 경로
+        self.store = store if store is not None else SequenceStore()
         self.data_model = None
 
     def set_excel_path(self, excel_path):
         self.data_model = ExcelDataModel(excel_path)
 
     def scan_folder(self, folder_path: str) -> List[Dict[str, Any]]:
-        seqs = scan_exr_sequences(folder_path)   # ← [{'basename':..., 'files':[...]} ...]
-        self.data_model.clear()
-        self.data_model.extend(seqs)
+        seqs = scan_exr_sequences(folder_path, cache=get_default_cache())   # ← [{'basename':..., 'frames': FrameSet} ...]
+        # 행은 폴더(scan 경로)당 하나 – 한 폴더에 시퀀스가 여럿이면 FrameSet.from_paths 처럼 가장 긴 것을 쓰고 알린다
+        by_folder: Dict[str, list] = {}
+        for s in seqs:
+            by_folder.setdefault(str(Path(s["frames"].directory)), []).append(s["frames"])
+        records = []
+        for folder, frame_sets in by_folder.items():
+            frames = max(frame_sets, key=len)
+            if len(frame_sets) > 1:
+                skipped = ", ".join(Path(f.template).name for f in frame_sets if f is not frames)
+                print(f"[WARN] {folder}: 시퀀스가 {len(frame_sets)}개 있습니다 – 가장 긴 {Path(frames.template).name} 사용 "
+                      f"(제외: {skipped})")
+            path = Path(folder)
+            records.append(SequenceRecord(scan=folder, seq=path.parent.name, shot=path.name, frames=frames))
+        self.store.replace(records)
         return seqs                               # **추가: 시퀀스 리스트 반환**
 
     def get_metadata(self) -> List[Dict[str, Any]]:
-        # 저장된 메타데이터 전체 반환
-        return self.data_model.all()
+        # 저장된 메타데이터 전체 반환 (엑셀 행 형식)
+        return [record.as_row() for record in self.store]
+
+    def save(self) -> None:
+        if self.data_model is None:
+            raise ValueError("엑셀 경로가 지정되지 않았습니다. (set_excel_path)")
+        self.data_model.save(self.get_metadata())
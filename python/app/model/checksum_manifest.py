@@ -0,0 +1,184 @@
+# model/checksum_manifest.py
+"""
+버전 폴더별 checksum manifest.
+
+    <version>/manifest.json
+    {
+      "algorithm": "blake2b-128",
+      "files": {
+        "org/S008SH0040_1001.exr": {"size": 52428800, "mtime_ns": 1735..., "hash": "9f1c…",
+                                    "verified": 1735...},
+        ...
+      }
+    }
+
+- hash 는 복사 / 변환 중 데이터를 이미 읽거나 쓰는 루프 안에서 계산해 add() 로 넣는다.
+  (ffmpeg 가 직접 쓰는 영상처럼 그럴 수 없는 파일만 add_file() 로 다시 읽음)
+- verify() 는 thread pool 에서 병렬로 hash 를 다시 계산한다. (hashlib 은 GIL 을 놓고 계산)
+  incremental=True 면 max_age 안에 이미 확인했고 size / mtime 이 그대로인 파일은 건너뛰며,
+  확인 결과를 중간중간 저장하므로 중단돼도 다음 실행이 이어서 확인한다.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+MANIFEST_NAME = "manifest.json"
+ALGORITHM = "blake2b-128"
+VERIFY_WORKERS = int(os.environ.get("SCANDATA_VERIFY_WORKERS", "4"))
+
+_BUF_SIZE = 8 * 1024 * 1024
+_SAVE_EVERY = 64            # verify 중 몇 개마다 manifest 를 저장할지
+
+
+def new_hasher():
+    return hashlib.blake2b(digest_size=16)
+
+
+def hash_file(path, buf_size: int = _BUF_SIZE) -> str:
+    hasher = new_hasher()
+    buf = bytearray(buf_size)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as fh:
+        while True:
+            n = fh.readinto(buf)
+            if not n:
+                break
+            hasher.update(view[:n])
+    return hasher.hexdigest()
+
+
+@dataclass
+class VerifyReport:
+    ok: List[str] = field(default_factory=list)
+    mismatched: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)        # incremental 로 건너뜀
+    elapsed: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return not self.mismatched and not self.missing
+
+    def summary(self) -> str:
+        return (f"ok {len(self.ok)}, 불일치 {len(self.mismatched)}, 없음 {len(self.missing)}, "
+                f"건너뜀 {len(self.skipped)} ({self.elapsed:.1f}s)")
+
+
+class ChecksumManifest:
+    def __init__(self, root):
+        self.root = Path(root)
+        self.algorithm = ALGORITHM
+        self.files: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self.root / MANIFEST_NAME
+
+    @classmethod
+    def load(cls, root) -> "ChecksumManifest":
+        manifest = cls(root)
+        try:
+            with open(manifest.path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except FileNotFoundError:
+            return manifest
+        if data.get("algorithm") != ALGORITHM:
+            raise ValueError(f"지원하지 않는 manifest 알고리즘: {data.get('algorithm')}")
+        manifest.files = data.get("files", {})
+        return manifest
+
+    def _relpath(self, path) -> str:
+        return Path(os.path.relpath(path, self.root)).as_posix()
+
+    def add(self, path, digest: str):
+        """이미 계산한 hash 를 기록 (size / mtime 은 지금 파일 기준)"""
+        st = os.stat(path)
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": digest}
+        with self._lock:
+            self.files[self._relpath(path)] = entry
+
+    def add_file(self, path):
+        """hash 를 따로 못 구한 파일 (ffmpeg 출력 등) – 파일을 읽어서 기록"""
+        self.add(path, hash_file(path))
+
+    def save(self):
+        with self._lock:
+            data = {"algorithm": self.algorithm, "files": dict(sorted(self.files.items()))}
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.part")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=1)
+        os.replace(tmp, self.path)
+
+    # ------------------------------------------------------------
+    def verify(
+        self,
+        incremental: bool = False,
+        max_age: Optional[float] = None,
+        max_workers: int = VERIFY_WORKERS,
+        progress: Optional[Callable[[int, int, str, str], None]] = None,
+    ) -> VerifyReport:
+        """
+        기록된 파일들의 hash 를 다시 계산해 비교.
+        incremental=True: size / mtime 이 그대로이고 max_age 초 안에 확인된 파일은 건너뜀
+                          (max_age=None 이면 한 번이라도 확인된 파일은 모두 건너뜀)
+        progress(done, total, relpath, status) – status: ok / mismatched / missing
+        """
+        report = VerifyReport()
+        t0 = time.perf_counter()
+        now = time.time()
+        todo = []
+        for rel, entry in sorted(self.files.items()):
+            full = self.root / rel
+            try:
+                st = os.stat(full)
+            except FileNotFoundError:
+                report.missing.append(rel)
+                continue
+            verified = entry.get("verified")          # verify() 로 디스크에서 확인한 시각
+            fresh = verified is not None and (max_age is None or now - verified <= max_age)
+            if (incremental and fresh and st.st_size == entry["size"]
+                    and st.st_mtime_ns == entry["mtime_ns"]):
+                report.skipped.append(rel)
+                continue
+            todo.append(rel)
+
+        def check(rel):
+            entry = self.files[rel]
+            full = self.root / rel
+            try:
+                digest = hash_file(full)
+            except FileNotFoundError:
+                return rel, "missing"
+            if digest != entry["hash"]:
+                with self._lock:
+                    entry.pop("verified", None)     # incremental 에서도 다시 확인하도록
+                return rel, "mismatched"
+            with self._lock:
+                entry["verified"] = time.time()
+            return rel, "ok"
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = [pool.submit(check, rel) for rel in todo]
+            for done, fut in enumerate(as_completed(futures), start=1):
+                rel, status = fut.result()
+                getattr(report, status).append(rel)
+                if status != "ok":
+                    print(f"[ERROR] checksum {status}: {rel}")
+                if progress is not None:
+                    progress(done, len(todo), rel, status)
+                if incremental and done % _SAVE_EVERY == 0:
+                    self.save()
+        if todo:
+            self.save()
+
+        report.elapsed = time.perf_counter() - t0
+        print(f"[INFO] checksum 확인 ({self.root}): {report.summary()}")
+        return report
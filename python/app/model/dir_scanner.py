@@ -0,0 +1,122 @@
+# model/dir_scanner.py
+"""
+Browse 용 디렉터리 스캐너.
+
+os.walk 대신 os.scandir 를 thread pool 에서 폴더 단위로 병렬 실행해
+EXR 이름 / 크기 / mtime 과 상위(seq) 폴더의 vNNN 버전 폴더 목록을 한 번에 수집한다.
+NFS 처럼 메타데이터 지연이 큰 볼륨에서 폴더 수만큼 왕복 대기가 겹치도록 하는 것이 목적.
+결과는 폴더 하나가 끝날 때마다 generator 로 바로 흘려보낸다.
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+SCAN_WORKERS = 16
+_VERSION_DIR = re.compile(r"v\d{3}")
+
+
+@dataclass
+class ExrFolder:
+    path: Path
+    mtime: float                                     # 폴더 자체의 mtime
+    exr_names: List[str] = field(default_factory=list)
+    sizes: List[int] = field(default_factory=list)
+    mtimes: List[float] = field(default_factory=list)
+    parent_versions: List[str] = field(default_factory=list)   # 상위 폴더의 v001, v002 ...
+
+    @property
+    def exr_paths(self) -> List[Path]:
+        return [self.path / name for name in self.exr_names]
+
+    @property
+    def total_size(self) -> int:
+        return sum(self.sizes)
+
+
+def _scan_dir(dir_path: str) -> Tuple[str, float, List[str], List[Tuple[str, int, float]]]:
+    """폴더 하나를 읽어 (경로, 폴더 mtime, 하위 폴더, [(exr 이름, 크기, mtime)]) 반환"""
+    subdirs, exrs = [], []
+    try:
+        mtime = os.stat(dir_path).st_mtime
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif entry.name.endswith(".exr"):
+                        st = entry.stat()
+                        exrs.append((entry.name, st.st_size, st.st_mtime))
+                except OSError:
+                    continue
+    except OSError as e:
+        print(f"[WARN] 폴더 읽기 실패: {dir_path} ({e})")
+        return dir_path, 0.0, [], []
+    return dir_path, mtime, subdirs, exrs
+
+
+def _list_subdirs(dir_path: str) -> List[str]:
+    try:
+        with os.scandir(dir_path) as it:
+            return [e.name for e in it if e.is_dir(follow_symlinks=False)]
+    except OSError:
+        return []
+
+
+def scan_exr_folders(roots: Iterable, max_workers: int = SCAN_WORKERS,
+                     recursive: bool = True) -> Iterator[ExrFolder]:
+    """
+    roots 아래에서 EXR 이 들어 있는 폴더를 찾는 대로 ExrFolder 로 yield.
+    (폴더 순서는 스캔이 끝난 순서)
+    recursive=False 면 roots 폴더 자체만 읽는다. (watch 모드에서 바뀐 폴더만 다시 읽을 때)
+    """
+    roots = [os.path.abspath(str(r)) for r in roots]
+    listing: Dict[str, List[str]] = {}        # 폴더 → 하위 폴더 이름 (버전 폴더 계산용)
+    seen = set()
+
+    def parent_versions(dir_path: str) -> List[str]:
+        parent = os.path.dirname(dir_path)
+        if parent not in listing:
+            listing[parent] = _list_subdirs(parent)
+        return sorted(n for n in listing[parent] if _VERSION_DIR.match(n))
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        pending = set()
+        for root in roots:
+            if root not in seen:
+                seen.add(root)
+                pending.add(pool.submit(_scan_dir, root))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                dir_path, mtime, subdirs, exrs = fut.result()
+                listing[dir_path] = subdirs
+                for name in (subdirs if recursive else ()):
+                    child = os.path.join(dir_path, name)
+                    if child not in seen:
+                        seen.add(child)
+                        pending.add(pool.submit(_scan_dir, child))
+                if not exrs:
+                    continue
+                exrs.sort()
+                yield ExrFolder(
+                    path=Path(dir_path),
+                    mtime=mtime,
+                    exr_names=[e[0] for e in exrs],
+                    sizes=[e[1] for e in exrs],
+                    mtimes=[e[2] for e in exrs],
+                    parent_versions=parent_versions(dir_path),
+                )
+    finally:
+        # generator 를 중간에 닫아도(취소) 남은 스캔은 기다리지 않는다
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def next_version(version_names: List[str]) -> str:
+    """['v001', 'v003'] → 'v004', 비어 있으면 'v001'"""
+    versions = [int(v[1:4]) for v in version_names if _VERSION_DIR.match(v)]
+    return f"v{max(versions) + 1:03d}" if versions else "v001"
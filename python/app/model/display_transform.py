@@ -0,0 +1,99 @@
+# model/display_transform.py
+"""
+linear float EXR 픽셀 → 화면용 8bit / 16bit 변환 (display transform).
+
+기존 np.clip(rgb, 0, 1) * 255 는 OETF(감마) 없이 linear 값을 그대로 잘라서 어둡게 보였고
+프레임마다 full-size 임시 배열을 여러 개 만들었다. 여기서는
+
+- transfer function (srgb / rec709 / gammaX.X / linear) 을 미리 LUT 로 만들어 두고
+- float32 비트 패턴의 상위 비트를 그대로 LUT index 로 사용한다
+  (8bit 출력: 상위 16bit = bfloat16 정밀도, 16bit 출력: 상위 19bit = half 정밀도 가수부)
+- 64행 단위 band 로 index 를 계산해 np.take(out=) 로 바로 결과 배열에 쓴다
+
+float16 으로 바꿔서 index 를 만드는 방법은 NumPy 의 float32→float16 변환이
+기존 clip 경로 전체보다 느려서 쓰지 않는다. 음수 / NaN 은 0, 1.0 이상은 최대값.
+"""
+import os
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+TRANSFERS = ("srgb", "rec709", "gamma2.2", "gamma2.4", "linear")
+DEFAULT_TRANSFER = os.environ.get("SCANDATA_DISPLAY_TRANSFER", "srgb")
+
+_INDEX_SHIFT = {8: 16, 16: 13}      # 출력 bit depth → float32 비트를 오른쪽으로 미는 양
+_BAND_ROWS = 64                     # index 버퍼가 캐시에 머무는 정도의 band 크기
+
+
+def _oetf(transfer: str, x: np.ndarray) -> np.ndarray:
+    """0~1 linear → 0~1 인코딩 값"""
+    if transfer == "srgb":
+        return np.where(x <= 0.0031308, 12.92 * x, 1.055 * np.power(x, 1 / 2.4) - 0.055)
+    if transfer == "rec709":
+        return np.where(x < 0.018, 4.5 * x, 1.099 * np.power(x, 0.45) - 0.099)
+    if transfer.startswith("gamma"):
+        return np.power(x, 1.0 / float(transfer[5:]))
+    if transfer == "linear":
+        return x
+    raise ValueError(f"알 수 없는 transfer function: {transfer} (지원: {', '.join(TRANSFERS)})")
+
+
+@lru_cache(maxsize=None)
+def build_lut(transfer: str, bit_depth: int = 8) -> np.ndarray:
+    """float32 상위 비트 → 출력 코드 LUT (8bit: 65536 x uint8, 16bit: 524288 x uint16)"""
+    shift = _INDEX_SHIFT[bit_depth]
+    codes = np.arange(1 << (32 - shift), dtype=np.uint64)
+    # 각 index 가 덮는 float 구간의 가운데 값으로 계산 (버림 오차를 반올림 수준으로)
+    centers = ((codes << np.uint64(shift)) | np.uint64(1 << (shift - 1))).astype(np.uint32)
+    with np.errstate(invalid="ignore"):
+        x = centers.view(np.float32).astype(np.float64)
+    x = np.clip(np.nan_to_num(x, nan=0.0, posinf=1.0, neginf=0.0), 0.0, 1.0)
+    x[0x7F800000 >> shift] = 1.0        # +inf 가 들어 있는 구간 (가운데 값은 NaN)
+    max_code = (1 << bit_depth) - 1
+    lut = np.round(_oetf(transfer, x) * max_code)
+    return lut.astype(np.uint8 if bit_depth == 8 else np.uint16)
+
+
+class DisplayTransform:
+    def __init__(self, transfer: str = DEFAULT_TRANSFER, bit_depth: int = 8):
+        if bit_depth not in _INDEX_SHIFT:
+            raise ValueError(f"bit_depth 는 8 또는 16: {bit_depth}")
+        self.transfer = transfer
+        self.bit_depth = bit_depth
+        self.lut = build_lut(transfer, bit_depth)
+        self.dtype = self.lut.dtype
+        self._shift = _INDEX_SHIFT[bit_depth]
+        self._local = threading.local()         # 스레드마다 index band 버퍼 재사용
+
+    def _index_buffer(self, width: int) -> np.ndarray:
+        buf = getattr(self._local, "index", None)
+        if buf is None or buf.shape[1] != width:
+            buf = self._local.index = np.empty((_BAND_ROWS, width, 3), dtype=np.intp)
+        return buf
+
+    def apply(self, pix: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        (h, w, c) float32 → (h, w, 3) uint8 / uint16. c 가 3 미만이면 첫 채널을 회색으로 복제.
+        out 을 주면 그 배열에 쓴다. (band index 버퍼 외의 임시 배열 없음)
+        """
+        if pix.dtype != np.float32:
+            pix = pix.astype(np.float32)
+        h, w = pix.shape[:2]
+        bits = pix.view(np.uint32)
+        bits = bits[:, :, :3] if pix.shape[2] >= 3 else np.broadcast_to(bits[:, :, :1], (h, w, 3))
+        if out is None:
+            out = np.empty((h, w, 3), dtype=self.dtype)
+
+        index = self._index_buffer(w)
+        for y in range(0, h, _BAND_ROWS):
+            n = min(_BAND_ROWS, h - y)
+            band = index[:n]
+            np.right_shift(bits[y:y + n], self._shift, out=band, casting="unsafe")
+            np.take(self.lut, band, out=out[y:y + n], mode="clip")
+        return out
+
+
+@lru_cache(maxsize=None)
+def get_display_transform(transfer: str = None, bit_depth: int = 8) -> DisplayTransform:
+    return DisplayTransform(transfer or DEFAULT_TRANSFER, bit_depth)
@@ -1,19 +1,108 @@
+# model/excel.py
+"""
+메타데이터 엑셀 저장 / 불러오기.
 
-
+pandas to_excel 은 openpyxl Workbook 에 셀마다 Cell 객체를 만든 뒤 한 번에 쓰므로
+행 수만큼 메모리가 늘었다. 여기서는
+- write_rows() : openpyxl write_only 시트에 행을 하나씩 흘려 쓰고 (셀 객체를 모아 두지 않음)
+- iter_rows()  : read_only 로 열어 첫 시트 행을 tuple 로 하나씩 돌려준다
+그래서 저장 / 읽기 메모리가 행 수와 거의 무관하다. DataFrame 이 꼭 필요한 곳만 load() 로 만든다.
+"""
+import os
 from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import openpyxl
 import pandas as pd
 
+SHEET_NAME = "Sheet1"
+
+
+def _cell_value(value):
+    # NaN / None 은 빈 셀, 나머지(str / int / float / datetime)는 그대로
+    if value is None or value != value:
+        return None
+    return value
+
+
+def write_rows(path: Path, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+    """열 이름 + 행 tuple 들을 엑셀로 저장 (write_only). 저장한 행 수를 돌려준다"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(SHEET_NAME)
+    ws.append([str(c) for c in columns])
+    count = 0
+    for row in rows:
+        ws.append([_cell_value(v) for v in row])
+        count += 1
+    try:
+        wb.save(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return count
+
+
+def write_frame(path: Path, df: pd.DataFrame) -> int:
+    """DataFrame 을 write_rows 로 저장 (df.to_excel 대신)"""
+    return write_rows(path, list(df.columns), df.itertuples(index=False, name=None))
+
+
+def write_records(path: Path, records: List[dict], columns: Optional[Sequence[str]] = None) -> int:
+    """dict 행 list 저장. 열 순서는 columns, 없으면 첫 행의 key 순서"""
+    if columns is None:
+        columns = list(records[0]) if records else []
+    return write_rows(path, columns, (tuple(r.get(c) for c in columns) for r in records))
+
+
+def iter_rows(path: Path) -> Iterator[Tuple]:
+    """첫 시트의 행을 tuple 로 하나씩 (첫 tuple = 열 이름). 짧은 행은 열 수만큼 None 으로 채움"""
+    wb = openpyxl.load_workbook(Path(path), read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        width = 0
+        for row in ws.iter_rows(values_only=True):
+            if not width:
+                # 헤더 뒤쪽의 빈 열은 버림
+                header = list(row)
+                while header and header[-1] is None:
+                    header.pop()
+                width = len(header)
+                if not width:
+                    continue
+                yield tuple(header)
+                continue
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            elif len(row) > width:
+                row = tuple(row[:width])
+            yield row
+    finally:
+        wb.close()
+
+
+def read_frame(path: Path) -> pd.DataFrame:
+    """iter_rows 로 읽어 DataFrame 생성 (pd.read_excel 대신)"""
+    rows = iter_rows(path)
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+    columns = [str(c) if c is not None else f"Unnamed: {i}" for i, c in enumerate(header)]
+    return pd.DataFrame.from_records(list(rows), columns=columns)
+
+
 class ExcelDataModel:
     def __init__(self, excel_path: str | Path):
         self.excel_path = Path(excel_path)
 
     def save(self, records: list[dict]) -> None:
         """
-        메타데이터 records 를 엑셀로 저장합니다.
+        메타데이터 records 를 엑셀로 저장합니다. (write_only 로 한 행씩 기록)
         """
-        df = pd.DataFrame(records)
-        self.excel_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_excel(self.excel_path, index=False)
+        write_records(self.excel_path, records)
 
     def load(self) -> pd.DataFrame:
         """
@@ -21,7 +110,15 @@ class ExcelDataModel:
         """
         if not self.excel_path.exists():
             raise FileNotFoundError(f"[ERROR] Excel 파일이 존재하지 않습니다: {self.excel_path}")
-        return pd.read_excel(self.excel_path)
+        return read_frame(self.excel_path)
+
+    def iter_rows(self) -> Iterator[Tuple]:
+        """
+        DataFrame 없이 행을 tuple 로 하나씩 읽습니다. (첫 tuple 은 열 이름)
+        """
+        if not self.excel_path.exists():
+            raise FileNotFoundError(f"[ERROR] Excel 파일이 존재하지 않습니다: {self.excel_path}")
+        return iter_rows(self.excel_path)
 
     def exists(self) -> bool:
         """
@@ -0,0 +1,263 @@
+# model/excel_diff.py
+"""
+편집한 셀만 반영하는 Excel 버전 저장.
+
+예전 Save 는 셀 하나만 고쳐도 DataFrame 전체를 다시 만들고 (astype(object), 모든 셀 text 읽기)
+metadata_*_vNNN.xlsx 를 처음부터 다시 썼다. 여기서는
+
+- DirtyCells      : model 의 dataChanged / store 변경 알림에서 받은 (행, 열) 을 set 으로 모아 둔다
+- patch_xlsx()    : 이전 버전 xlsx 를 복사하면서 첫 시트 XML 에서 바뀐 셀 요소만 바꿔 끼운다
+                    (다른 행의 셀은 해석하지 않고 bytes 그대로 복사 → Python 쪽 작업은 편집 수에 비례)
+- append_change_log() : 버전마다 무엇이 바뀌었는지 metadata_<seq>_changes.jsonl 에 한 줄씩 남긴다
+
+시트 구조가 예상과 다르면 (행 / 셀 요소가 없음, 수식 셀 등) ExcelPatchError 를 내고,
+호출하는 쪽은 예전처럼 전체를 다시 저장한다.
+"""
+import os
+import re
+import json
+import time
+import getpass
+import zipfile
+import posixpath
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+CHANGE_LOG_SUFFIX = "changes.jsonl"
+HEADER_ROWS = 1             # 엑셀 1행은 열 이름, 데이터는 2행부터
+
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_VERSIONED_NAME = re.compile(r"^(?P<base>.*?)v(?P<ver>\d{3})\.xlsx$")
+_CELL = re.compile(rb"<c\b(?P<attrs>[^>]*?)(?:/>|>(?P<body>.*?)</c>)", re.S)
+_ATTR_R = re.compile(rb'\br="([A-Z]+)(\d+)"')
+_ATTR_S = re.compile(rb'\bs="(\d+)"')
+
+
+class ExcelPatchError(Exception):
+    """바뀐 셀만 끼워 넣을 수 없는 시트 (전체 저장으로 대신해야 함)"""
+
+
+class CellChange(NamedTuple):
+    row: int            # 데이터 행 번호 (0 부터, 헤더 제외)
+    col: int            # 열 번호 (0 부터)
+    column: str         # 열 이름
+    old: str
+    new: str
+
+    @property
+    def ref(self) -> str:
+        return f"{column_letter(self.col)}{self.row + HEADER_ROWS + 1}"
+
+
+def column_letter(col: int) -> str:
+    """0 → A, 25 → Z, 26 → AA"""
+    letters = ""
+    col += 1
+    while col:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+def cell_text(value) -> str:
+    """DataFrame / 테이블 셀 값 → 비교용 문자열 (빈 셀(NaN / None)은 "")"""
+    if value is None or value != value:
+        return ""
+    return str(value)
+
+
+def versioned_seq_name(path: Optional[Path]) -> Optional[str]:
+    """metadata_S01_v003.xlsx → "S01", metadata_v003.xlsx → None"""
+    if path is None:
+        return None
+    m = _VERSIONED_NAME.match(Path(path).name)
+    if not m or not m.group("base").startswith("metadata_"):
+        return None
+    seq = m.group("base")[len("metadata_"):].rstrip("_")
+    return seq or None
+
+
+# ─── 편집 기록 ─────────────────────────────────────────────────
+class DirtyCells:
+    """편집된 셀 위치. 값은 저장할 때 model 에서 읽으므로 (행, 열) 만 기록"""
+
+    def __init__(self):
+        self.rows: Set[int] = set()
+        self.cols: Set[int] = set()
+        self.cells: Set[Tuple[int, int]] = set()
+
+    def mark(self, row: int, col: int):
+        self.rows.add(row)
+        self.cols.add(col)
+        self.cells.add((row, col))
+
+    def mark_range(self, top: int, bottom: int, left: int, right: int):
+        for row in range(top, bottom + 1):
+            for col in range(left, right + 1):
+                self.mark(row, col)
+
+    def clear(self):
+        self.rows.clear()
+        self.cols.clear()
+        self.cells.clear()
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(sorted(self.cells))
+
+
+# ─── xlsx 패치 ─────────────────────────────────────────────────
+def _first_sheet_member(zin: zipfile.ZipFile) -> str:
+    workbook = ElementTree.fromstring(zin.read("xl/workbook.xml"))
+    sheet = workbook.find(f"{{{_NS_MAIN}}}sheets/{{{_NS_MAIN}}}sheet")
+    if sheet is None:
+        raise ExcelPatchError("workbook 에 시트가 없습니다")
+    rel_id = sheet.get(f"{{{_NS_REL}}}id")
+    rels = ElementTree.fromstring(zin.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels.iter(f"{{{_NS_PKG_REL}}}Relationship"):
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target", "")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join("xl", target))
+    raise ExcelPatchError(f"시트 관계를 찾을 수 없습니다: {rel_id}")
+
+
+def _cell_xml(ref: str, style: bytes, text: str) -> bytes:
+    style_attr = b' s="' + style + b'"' if style else b""
+    head = b'<c r="' + ref.encode("ascii") + b'"' + style_attr
+    if text == "":
+        return head + b"/>"
+    # 숫자처럼 보여도 문자열로 (전체 저장도 테이블 문자열을 그대로 쓰므로 "1.50" 이 1.5 로 바뀌지 않게)
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return (head + b' t="inlineStr"><is><t' + space.encode("ascii") + b">"
+            + escape(text).encode("utf-8") + b"</t></is></c>")
+
+
+def _patch_row(row_xml: bytes, row_num: int, changes: List[CellChange]) -> bytes:
+    """<row> 요소 하나 안에서 바뀐 셀만 교체 / 추가"""
+    wanted = {column_letter(ch.col): ch for ch in changes}
+    pieces = []
+    open_end = row_xml.index(b">") + 1
+    if row_xml[open_end - 2:open_end] == b"/>":          # 빈 행 <row r="5"/>
+        row_xml = row_xml[:open_end - 2] + b"></row>"
+        open_end -= 1
+    body_end = row_xml.rindex(b"</row>")
+    pieces.append(row_xml[:open_end])
+    pos = open_end
+
+    def insert_before(letter: Optional[str]):
+        # 열 순서를 지키며 아직 없는 셀 추가
+        for key in sorted(wanted, key=lambda k: (len(k), k)):
+            if letter is None or (len(key), key) < (len(letter), letter):
+                ch = wanted.pop(key)
+                pieces.append(_cell_xml(ch.ref, b"", ch.new))
+
+    for m in _CELL.finditer(row_xml, open_end, body_end):
+        r = _ATTR_R.search(m.group("attrs"))
+        if r is None or int(r.group(2)) != row_num:
+            raise ExcelPatchError(f"{row_num}행 셀에 r 속성이 없습니다")
+        letter = r.group(1).decode("ascii")
+        pieces.append(row_xml[pos:m.start()])
+        insert_before(letter)
+        pos = m.end()
+        ch = wanted.pop(letter, None)
+        if ch is None:
+            pieces.append(m.group(0))
+            continue
+        if m.group("body") and b"<f" in m.group("body"):
+            raise ExcelPatchError(f"{ch.ref} 는 수식 셀입니다")
+        s = _ATTR_S.search(m.group("attrs"))
+        pieces.append(_cell_xml(ch.ref, s.group(1) if s else b"", ch.new))
+    pieces.append(row_xml[pos:body_end])
+    insert_before(None)
+    pieces.append(row_xml[body_end:])
+    return b"".join(pieces)
+
+
+def patch_sheet_xml(xml: bytes, changes: Iterable[CellChange]) -> bytes:
+    """시트 XML 에서 changes 가 있는 행만 잘라 고치고 나머지는 그대로 이어 붙인다"""
+    by_row = {}
+    for ch in changes:
+        by_row.setdefault(ch.row + HEADER_ROWS + 1, []).append(ch)
+    pieces = []
+    pos = 0
+    for row_num in sorted(by_row):
+        m = re.compile(rb'<row\b[^>]*?\br="%d"' % row_num).search(xml, pos)
+        if m is None:
+            raise ExcelPatchError(f"{row_num}행을 시트에서 찾을 수 없습니다")
+        tag_end = xml.index(b">", m.end()) + 1
+        end = tag_end if xml[tag_end - 2:tag_end] == b"/>" else xml.index(b"</row>", tag_end) + len(b"</row>")
+        pieces.append(xml[pos:m.start()])
+        pieces.append(_patch_row(xml[m.start():end], row_num, by_row[row_num]))
+        pos = end
+    pieces.append(xml[pos:])
+    return b"".join(pieces)
+
+
+def patch_xlsx(src: Path, dst: Path, changes: List[CellChange]) -> None:
+    """src 를 dst 로 복사하면서 첫 시트의 changes 셀만 바꾼다 (src 는 그대로 둠)"""
+    src, dst = Path(src), Path(dst)
+    tmp = dst.with_name(dst.name + ".tmp")
+    try:
+        with zipfile.ZipFile(src) as zin:
+            sheet = _first_sheet_member(zin)
+            patched = patch_sheet_xml(zin.read(sheet), changes)
+            with zipfile.ZipFile(tmp, "w") as zout:
+                for info in zin.infolist():
+                    zout.writestr(info, patched if info.filename == sheet else zin.read(info))
+        os.replace(tmp, dst)
+    except (KeyError, ValueError, ElementTree.ParseError) as e:
+        raise ExcelPatchError(str(e)) from e
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+# ─── 변경 기록 ─────────────────────────────────────────────────
+def change_log_path(excel_path: Path) -> Path:
+    """metadata_S01_v004.xlsx → metadata_S01_changes.jsonl (같은 seq 의 버전들이 한 파일을 같이 씀)"""
+    excel_path = Path(excel_path)
+    m = _VERSIONED_NAME.match(excel_path.name)
+    base = m.group("base") if m else excel_path.stem + "_"
+    return excel_path.with_name(base + CHANGE_LOG_SUFFIX)
+
+
+def append_change_log(excel_path: Path, base_path: Optional[Path], changes: List[CellChange],
+                      full: bool = False) -> Path:
+    """
+    버전 하나당 한 줄:
+    {"file": "metadata_S01_v004.xlsx", "base": "metadata_S01_v003.xlsx", "time": ..., "user": ...,
+     "full": false, "cells": [["C5", "VER", "v003", "v004"], ...]}
+    """
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = ""
+    entry = {
+        "file": Path(excel_path).name,
+        "base": Path(base_path).name if base_path else None,
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "user": user,
+        "full": full,
+        "cells": [[ch.ref, ch.column, ch.old, ch.new] for ch in changes],
+    }
+    log_path = change_log_path(excel_path)
+    with open(log_path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+    return log_path
+
+
+def read_change_log(excel_path: Path) -> List[dict]:
+    log_path = change_log_path(excel_path)
+    if not log_path.exists():
+        return []
+    with open(log_path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
@@ -0,0 +1,365 @@
+# model/exr_header.py
+"""
+OIIO 없이 EXR 파일 앞부분(보통 수 KB)만 읽어 header attribute 테이블을 해석한다.
+Browse 처럼 timecode / colorspace 만 필요할 때 OIIO(rez subprocess)를 띄우지 않기 위한 용도.
+multi-part 파일은 all_parts=True 로 모든 part 의 이름 / 채널 목록(layer)도 얻을 수 있다.
+
+이 모듈은 표준 라이브러리만 사용하며 패키지 상대 import 를 하지 않는다.
+(benchmarks/ 스크립트에서 파일 경로로 직접 로드)
+"""
+import struct
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+EXR_MAGIC = 20000630
+
+_FLAG_TILED = 0x200
+_FLAG_NON_IMAGE = 0x800
+_FLAG_MULTIPART = 0x1000
+
+_CHUNK = 16 * 1024          # 첫 read 크기, header 가 더 길면 이어서 읽는다
+_MAX_HEADER = 16 * 1024 * 1024
+
+COMPRESSION_NAMES = (
+    "none", "rle", "zips", "zip", "piz", "pxr24", "b44", "b44a", "dwaa", "dwab",
+)
+PIXEL_TYPES = ("uint", "half", "float")
+
+# part / layer 목록에 항상 필요한 attribute (wanted 를 줘도 같이 디코딩)
+_PART_ATTRS = {"name", "type", "channels", "dataWindow", "compression"}
+
+
+class ExrHeaderError(ValueError):
+    pass
+
+
+@dataclass
+class ExrChannel:
+    name: str
+    pixel_type: str           # 'uint' / 'half' / 'float'
+    x_sampling: int = 1
+    y_sampling: int = 1
+
+
+@dataclass
+class ExrLayer:
+    part: int                 # part(subimage) index
+    part_name: str
+    name: str                 # '' = 기본 layer (R, G, B, A …)
+    channels: List[str] = field(default_factory=list)
+    multipart: bool = False
+
+    @property
+    def selector(self) -> str:
+        """Format_Converter 의 channels= 에 그대로 넘기는 문자열 ('layer' 또는 'part:layer')"""
+        if self.multipart:
+            return f"{self.part_name or self.part}:{self.name}"
+        return self.name
+
+
+@dataclass
+class ExrPart:
+    index: int
+    name: str = ""
+    type: str = ""            # scanlineimage / tiledimage / deepscanline … (single part 는 '')
+    data_window: Optional[Tuple[int, int, int, int]] = None
+    compression: Optional[str] = None
+    channels: List[ExrChannel] = field(default_factory=list)
+
+    def layers(self, multipart: bool = False) -> List[ExrLayer]:
+        """채널 이름의 마지막 '.' 앞을 layer 로 묶는다. ('diffuse.R' → diffuse, 'R' → '')"""
+        grouped: Dict[str, List[str]] = {}
+        for ch in self.channels:
+            layer, _, _ = ch.name.rpartition(".")
+            grouped.setdefault(layer, []).append(ch.name)
+        return [ExrLayer(self.index, self.name, layer, names, multipart)
+                for layer, names in grouped.items()]
+
+
+@dataclass
+class ExrHeader:
+    path: str
+    version: int
+    tiled: bool = False
+    multipart: bool = False
+    deep: bool = False
+    data_window: Optional[Tuple[int, int, int, int]] = None      # xmin, ymin, xmax, ymax
+    display_window: Optional[Tuple[int, int, int, int]] = None
+    compression: Optional[str] = None
+    channels: List[ExrChannel] = field(default_factory=list)
+    timecode: Optional[Tuple[int, int]] = None                    # (timeAndFlags, userData)
+    chromaticities: Optional[Tuple[float, ...]] = None            # rx, ry, gx, gy, bx, by, wx, wy
+    frames_per_second: Optional[Tuple[int, int]] = None           # (num, den)
+    owner: Optional[str] = None
+    cap_date: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)      # 해석한 전체 attribute
+    parts: List[ExrPart] = field(default_factory=list)            # all_parts=False 면 첫 part 만
+
+    @property
+    def layers(self) -> List[ExrLayer]:
+        """모든 part 의 layer 목록"""
+        return [layer for part in self.parts for layer in part.layers(self.multipart)]
+
+    @property
+    def width(self) -> int:
+        if not self.data_window:
+            return 0
+        return self.data_window[2] - self.data_window[0] + 1
+
+    @property
+    def height(self) -> int:
+        if not self.data_window:
+            return 0
+        return self.data_window[3] - self.data_window[1] + 1
+
+    @property
+    def fps(self) -> Optional[float]:
+        if not self.frames_per_second or not self.frames_per_second[1]:
+            return None
+        num, den = self.frames_per_second
+        return num / den
+
+    @property
+    def colorspace(self) -> str:
+        for key in ("oiio:ColorSpace", "colorSpace", "colorspace"):
+            value = self.attributes.get(key)
+            if isinstance(value, str) and value:
+                return value
+        # OIIO 와 동일하게 EXR 기본값은 Linear
+        return "Linear"
+
+    def timecode_string(self) -> str:
+        """SMPTE timecode(BCD) → 'HH:MM:SS:FF', 없으면 빈 문자열"""
+        if not self.timecode:
+            return ""
+        t = self.timecode[0]
+
+        def bcd(shift, tens_bits):
+            units = (t >> shift) & 0xF
+            tens = (t >> (shift + 4)) & ((1 << tens_bits) - 1)
+            return tens * 10 + units
+
+        hh, mm, ss, ff = bcd(24, 2), bcd(16, 3), bcd(8, 3), bcd(0, 2)
+        sep = ";" if t & (1 << 6) else ":"        # drop frame
+        return f"{hh:02d}:{mm:02d}:{ss:02d}{sep}{ff:02d}"
+
+    def to_oiio_metadata(self) -> dict:
+        """
+        Format_Converter._get_exr_header 와 같은 OIIO 식 key 로 변환
+        (smpte:TimeCode, FramesPerSecond, oiio:ColorSpace ...)
+        """
+        meta = {}
+        for name, value in self.attributes.items():
+            if name in ("channels", "dataWindow", "displayWindow", "timeCode",
+                        "framesPerSecond", "capDate", "owner"):
+                continue
+            meta[name] = value
+        if self.compression:
+            meta["compression"] = self.compression
+        if self.timecode:
+            meta["smpte:TimeCode"] = self.timecode
+        if self.frames_per_second:
+            meta["FramesPerSecond"] = self.frames_per_second
+        if self.owner:
+            meta["Copyright"] = self.owner
+        if self.cap_date:
+            meta["DateTime"] = self.cap_date
+        meta["oiio:ColorSpace"] = self.colorspace
+        return meta
+
+
+# ---------------------------------------------------------------------
+# attribute 값 디코더
+# ---------------------------------------------------------------------
+def _decode_chlist(raw: bytes) -> List[ExrChannel]:
+    channels, pos = [], 0
+    while pos < len(raw) and raw[pos] != 0:
+        end = raw.index(b"\0", pos)
+        name = raw[pos:end].decode("utf-8", "replace")
+        pixel_type, _plinear, xs, ys = struct.unpack_from("<iB3xii", raw, end + 1)
+        pos = end + 1 + 16
+        ptype = PIXEL_TYPES[pixel_type] if 0 <= pixel_type < len(PIXEL_TYPES) else str(pixel_type)
+        channels.append(ExrChannel(name, ptype, xs, ys))
+    return channels
+
+
+def _decode_stringvector(raw: bytes) -> List[str]:
+    values, pos = [], 0
+    while pos + 4 <= len(raw):
+        (n,) = struct.unpack_from("<i", raw, pos)
+        values.append(raw[pos + 4:pos + 4 + n].decode("utf-8", "replace"))
+        pos += 4 + n
+    return values
+
+
+_STRUCT_TYPES = {
+    "int": "<i", "float": "<f", "double": "<d",
+    "box2i": "<4i", "box2f": "<4f",
+    "v2i": "<2i", "v2f": "<2f", "v2d": "<2d",
+    "v3i": "<3i", "v3f": "<3f", "v3d": "<3d",
+    "m33f": "<9f", "m44f": "<16f", "m33d": "<9d", "m44d": "<16d",
+    "chromaticities": "<8f", "timecode": "<2I", "rational": "<iI",
+    "keycode": "<7i", "tiledesc": "<IIB",
+    "compression": "<B", "lineOrder": "<B", "envmap": "<B", "deepImageState": "<B",
+}
+
+
+def _decode_value(type_name: str, raw: bytes):
+    if type_name == "string":
+        return raw.decode("utf-8", "replace")
+    if type_name == "chlist":
+        return _decode_chlist(raw)
+    if type_name == "stringvector":
+        return _decode_stringvector(raw)
+    fmt = _STRUCT_TYPES.get(type_name)
+    if fmt is None or struct.calcsize(fmt) > len(raw):
+        return raw            # preview 등 모르는 타입은 원본 bytes 유지
+    values = struct.unpack_from(fmt, raw)
+    return values[0] if len(values) == 1 else values
+
+
+# ---------------------------------------------------------------------
+# header 읽기
+# ---------------------------------------------------------------------
+class _HeaderReader:
+    """필요한 만큼만 파일을 이어서 읽는 작은 버퍼"""
+
+    def __init__(self, fh):
+        self._fh = fh
+        self.buf = fh.read(_CHUNK)
+        self.pos = 0
+
+    def _need(self, n: int):
+        while self.pos + n > len(self.buf):
+            if len(self.buf) >= _MAX_HEADER:
+                raise ExrHeaderError("EXR header 가 너무 큽니다.")
+            more = self._fh.read(max(_CHUNK, self.pos + n - len(self.buf)))
+            if not more:
+                raise ExrHeaderError("EXR header 가 중간에 끝났습니다.")
+            self.buf += more
+
+    def read(self, n: int) -> bytes:
+        self._need(n)
+        data = self.buf[self.pos:self.pos + n]
+        self.pos += n
+        return data
+
+    def cstring(self) -> str:
+        while True:
+            end = self.buf.find(b"\0", self.pos)
+            if end >= 0:
+                break
+            self._need(len(self.buf) - self.pos + 1)
+        text = self.buf[self.pos:end].decode("utf-8", "replace")
+        self.pos = end + 1
+        return text
+
+
+def _read_attributes(reader: _HeaderReader, wanted=None) -> Dict[str, Any]:
+    attrs = {}
+    while True:
+        name = reader.cstring()
+        if not name:                        # header 끝
+            return attrs
+        type_name = reader.cstring()
+        (size,) = struct.unpack("<i", reader.read(4))
+        if size < 0:
+            raise ExrHeaderError(f"잘못된 attribute 크기: {name}={size}")
+        raw = reader.read(size)
+        if wanted is None or name in wanted:
+            attrs[name] = _decode_value(type_name, raw)
+
+
+def _compression_name(comp) -> Optional[str]:
+    if isinstance(comp, int):
+        return COMPRESSION_NAMES[comp] if comp < len(COMPRESSION_NAMES) else str(comp)
+    return None
+
+
+def _make_part(index: int, attrs: Dict[str, Any]) -> ExrPart:
+    return ExrPart(
+        index=index,
+        name=attrs.get("name") or "",
+        type=attrs.get("type") or "",
+        data_window=attrs.get("dataWindow"),
+        compression=_compression_name(attrs.get("compression")),
+        channels=attrs.get("channels") or [],
+    )
+
+
+def read_exr_header(path, wanted=None, all_parts: bool = False) -> ExrHeader:
+    """
+    EXR 첫 번째 part 의 header 를 해석해 ExrHeader 로 반환.
+    wanted 에 attribute 이름 집합을 주면 그 값만 디코딩한다.
+    all_parts=True 면 multi-part 파일의 나머지 part header 도 읽어 parts / layers 를 채운다.
+    """
+    path = str(path)
+    part_wanted = None if wanted is None else set(wanted) | _PART_ATTRS
+    with open(path, "rb") as fh:
+        reader = _HeaderReader(fh)
+        magic, version = struct.unpack("<ii", reader.read(8))
+        if magic != EXR_MAGIC:
+            raise ExrHeaderError(f"EXR 파일이 아닙니다: {path}")
+        attrs = _read_attributes(reader, part_wanted)
+        parts = [_make_part(0, attrs)]
+        if all_parts and version & _FLAG_MULTIPART:
+            # part header 들이 이어지고 빈 header(null 1byte) 로 끝난다
+            while True:
+                start = reader.pos
+                part_attrs = _read_attributes(reader, _PART_ATTRS)
+                if reader.pos - start <= 1:
+                    break
+                parts.append(_make_part(len(parts), part_attrs))
+
+    header = ExrHeader(
+        path=path,
+        version=version & 0xFF,
+        tiled=bool(version & _FLAG_TILED),
+        multipart=bool(version & _FLAG_MULTIPART),
+        deep=bool(version & _FLAG_NON_IMAGE),
+        attributes=attrs,
+        parts=parts,
+    )
+    header.data_window = attrs.get("dataWindow")
+    header.display_window = attrs.get("displayWindow")
+    header.compression = _compression_name(attrs.get("compression"))
+    header.channels = attrs.get("channels") or []
+    header.timecode = attrs.get("timeCode")
+    header.chromaticities = attrs.get("chromaticities")
+    header.frames_per_second = attrs.get("framesPerSecond")
+    header.owner = attrs.get("owner")
+    header.cap_date = attrs.get("capDate")
+    return header
+
+
+def read_exr_layers(path) -> List[ExrLayer]:
+    """모든 part 의 layer 목록 (part 이름, layer 이름, 채널 이름들)"""
+    return read_exr_header(path, wanted=set(), all_parts=True).layers
+
+
+
+def timecode_to_frames(value, fps: int = 24) -> Optional[int]:
+    """
+    timecode 값을 절대 프레임 수로 변환.
+    (timeAndFlags, userData) 튜플, 그 문자열 표현, 'HH:MM:SS:FF' 모두 허용.
+    drop-frame('HH:MM:SS;FF', 29.97 / 59.94) 은 fps 가 30 / 60 일 때 10분 단위를 뺀 매 분 처음
+    2 / 4 프레임 번호를 건너뛰는 규칙으로 계산 (다른 fps 에서는 drop 표시를 무시)
+    """
+    if isinstance(value, str):
+        text = value.strip()
+        parts = text.replace(";", ":").split(":")
+        if len(parts) == 4 and all(p.isdigit() for p in parts):
+            hh, mm, ss, ff = map(int, parts)
+            frames = ((hh * 60 + mm) * 60 + ss) * fps + ff
+            if ";" in text and fps in (30, 60):
+                minutes = hh * 60 + mm
+                frames -= (fps // 15) * (minutes - minutes // 10)
+            return frames
+        try:
+            value = tuple(int(v) for v in text.strip("()[] ").split(","))
+        except ValueError:
+            return None
+    if not isinstance(value, (tuple, list)) or not value:
+        return None
+    header = ExrHeader(path="", version=2, timecode=(int(value[0]), 0))
+    return timecode_to_frames(header.timecode_string(), fps)
@@ -0,0 +1,206 @@
+# model/frame_set.py
+"""
+EXR 시퀀스를 프레임마다 경로 문자열로 들고 있지 않고
+'prefix%04d.exr' 템플릿 + 연속 구간(run) 리스트로 표현하는 FrameSet.
+
+    fs = FrameSet.from_paths(["/scan/SH010/SH010_1001.exr", ..., "/scan/SH010/SH010_1100.exr"])
+    fs.template   → '/scan/SH010/SH010_%04d.exr'
+    fs.runs       → [(1001, 1100)]
+    fs.first, fs.last, len(fs), 1050 in fs, fs.missing(), fs.path(1001)
+
+first / last / len 은 O(1), contains 는 O(log runs), missing 은 O(runs).
+생성 시 정렬 / 중복 / 구간 계산은 NumPy 배열(np.unique, np.diff)로 처리해
+1만 프레임 시퀀스도 빠르게 검사한다. (중복 프레임, 패딩 불일치 파일도 함께 기록)
+"""
+import os
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# 확장자 바로 앞의 숫자를 프레임 번호로 본다 (S01_SH010_1001.exr, plate.1001.exr)
+_FRAME_RE = re.compile(r"^(.*?)(\d+)(\.[^./]+)$")
+
+
+def parse_frame_path(path: str) -> Optional[Tuple[str, int]]:
+    """'/a/SH010_1001.exr' → ('/a/SH010_%04d.exr', 1001), 번호가 없으면 None"""
+    path = str(path)
+    head, name = os.path.split(path)
+    m = _FRAME_RE.match(name)
+    if not m:
+        return None
+    prefix, digits, suffix = m.groups()
+    head, prefix, suffix = (t.replace("%", "%%") for t in (head, prefix, suffix))
+    return os.path.join(head, f"{prefix}%0{len(digits)}d{suffix}"), int(digits)
+
+
+class FrameSet:
+    __slots__ = ("template", "runs", "duplicates", "padding_mismatches", "_overrides", "_starts", "_len")
+
+    def __init__(self, runs: Iterable[Tuple[int, int]] = (), template: str = "",
+                 duplicates: Iterable[int] = (), padding_mismatches: Dict[int, str] = None):
+        self.template = template
+        self.runs: List[Tuple[int, int]] = [(int(a), int(b)) for a, b in runs]
+        self.duplicates: Tuple[int, ...] = tuple(int(f) for f in duplicates)
+        # 템플릿 패딩과 맞지 않는 파일 {frame: 실제 파일 이름} – path() 에서 우선 사용
+        self.padding_mismatches: Dict[int, str] = dict(padding_mismatches or {})
+        self._overrides = self.padding_mismatches
+        self._starts = [a for a, _ in self.runs]
+        self._len = sum(b - a + 1 for a, b in self.runs)
+
+    # ------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------
+    @classmethod
+    def from_frames(cls, frames, template: str = "", padding_mismatches=None) -> "FrameSet":
+        """프레임 번호(리스트 / NumPy 배열) → FrameSet. 같은 번호가 두 번 이상이면 duplicates 에 기록"""
+        arr = np.asarray(frames if isinstance(frames, np.ndarray) else list(frames), dtype=np.int64)
+        if arr.size == 0:
+            return cls((), template)
+        uniq, counts = np.unique(arr, return_counts=True)      # 정렬 + 중복 제거
+        breaks = np.flatnonzero(np.diff(uniq) != 1)            # 연속이 끊기는 위치
+        starts = uniq[np.r_[0, breaks + 1]]
+        ends = uniq[np.r_[breaks, uniq.size - 1]]
+        return cls(
+            zip(starts.tolist(), ends.tolist()),
+            template,
+            duplicates=uniq[counts > 1].tolist(),
+            padding_mismatches=padding_mismatches,
+        )
+
+    @classmethod
+    def from_paths(cls, paths: Iterable, directory=None) -> "FrameSet":
+        """
+        경로(또는 directory 기준 파일 이름) 목록 → FrameSet.
+        템플릿이 여러 개 섞여 있으면 프레임이 가장 많은 시퀀스를 사용한다.
+        """
+        groups = group_sequences(paths, directory)
+        if not groups:
+            return cls()
+        if len(groups) > 1:
+            print(f"[WARN] 한 폴더에 시퀀스가 {len(groups)}개 있습니다 – 가장 긴 시퀀스 사용")
+        return max(groups.values(), key=len)
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+    @property
+    def first(self) -> Optional[int]:
+        return self.runs[0][0] if self.runs else None
+
+    @property
+    def last(self) -> Optional[int]:
+        return self.runs[-1][1] if self.runs else None
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __contains__(self, frame) -> bool:
+        i = bisect_right(self._starts, frame) - 1
+        return i >= 0 and frame <= self.runs[i][1]
+
+    def __iter__(self) -> Iterator[int]:
+        for a, b in self.runs:
+            yield from range(a, b + 1)
+
+    def __repr__(self) -> str:
+        return f"FrameSet({self.template!r}, {self})"
+
+    def __str__(self) -> str:
+        return ",".join(f"{a}" if a == b else f"{a}-{b}" for a, b in self.runs)
+
+    def missing(self) -> List[Tuple[int, int]]:
+        """first~last 사이에 빠진 구간 [(start, end), ...]"""
+        return [(b + 1, a2 - 1) for (_, b), (a2, _) in zip(self.runs, self.runs[1:])]
+
+    def missing_count(self) -> int:
+        return sum(b - a + 1 for a, b in self.missing())
+
+    @property
+    def is_clean(self) -> bool:
+        """빠진 프레임, 중복 프레임, 패딩 불일치가 하나도 없으면 True"""
+        return len(self.runs) <= 1 and not self.duplicates and not self.padding_mismatches
+
+    def problems(self) -> List[str]:
+        msgs = []
+        gaps = self.missing()
+        if gaps:
+            text = ",".join(f"{a}" if a == b else f"{a}-{b}" for a, b in gaps)
+            msgs.append(f"missing {self.missing_count()} ({text})")
+        if self.duplicates:
+            msgs.append(f"duplicate {len(self.duplicates)} ({','.join(map(str, self.duplicates))})")
+        if self.padding_mismatches:
+            msgs.append(f"padding {len(self.padding_mismatches)} ({','.join(sorted(self.padding_mismatches.values()))})")
+        return msgs
+
+    def check_text(self) -> str:
+        """테이블 표시용 한 줄 요약 – 문제 없으면 'OK'"""
+        return " / ".join(self.problems()) or "OK"
+
+    def frame_range(self) -> Tuple[Optional[int], Optional[int]]:
+        return self.first, self.last
+
+    def path(self, frame: int) -> str:
+        if frame in self._overrides:
+            return os.path.join(self.directory, self._overrides[frame])
+        return self.template % frame
+
+    def paths(self) -> Iterator[str]:
+        for f in self:
+            yield self.path(f)
+
+    @property
+    def directory(self) -> str:
+        return os.path.dirname(self.template).replace("%%", "%")
+
+
+def _natural_width(nums: np.ndarray) -> np.ndarray:
+    """패딩 없이 썼을 때의 자릿수 (0 → 1)"""
+    return np.floor(np.log10(np.maximum(nums, 1))).astype(np.int64) + 1
+
+
+def _build_sequence(head: str, prefix: str, suffix: str, digits: List[str]) -> FrameSet:
+    """
+    같은 prefix/suffix 를 가진 파일들의 숫자 부분 → FrameSet.
+    _0999 / _1000 처럼 자릿수가 섞여 있어도 하나의 시퀀스로 보고
+    패딩 폭은 '명시적으로 0 을 채운 파일'의 폭(없으면 최소 자릿수)으로 정한다.
+    """
+    nums = np.fromiter((int(d) for d in digits), dtype=np.int64, count=len(digits))
+    widths = np.fromiter((len(d) for d in digits), dtype=np.int64, count=len(digits))
+    natural = _natural_width(nums)
+
+    padded = widths[widths > natural]
+    if padded.size:
+        values, counts = np.unique(padded, return_counts=True)
+        pad = int(values[np.argmax(counts)])
+    else:
+        pad = int(widths.min())
+
+    bad = np.flatnonzero(widths != np.maximum(pad, natural))
+    mismatches = {int(nums[i]): f"{prefix}{digits[i]}{suffix}" for i in bad}
+
+    esc = [t.replace("%", "%%") for t in (head, prefix, suffix)]
+    template = os.path.join(esc[0], f"{esc[1]}%0{pad}d{esc[2]}")
+    return FrameSet.from_frames(nums, template, padding_mismatches=mismatches)
+
+
+def group_sequences(paths: Iterable, directory=None) -> Dict[str, FrameSet]:
+    """경로 목록을 템플릿별 FrameSet 으로 묶는다. 번호 없는 파일은 제외."""
+    groups: Dict[Tuple[str, str, str], List[str]] = {}
+    for p in paths:
+        p = os.path.join(str(directory), str(p)) if directory is not None else str(p)
+        head, name = os.path.split(p)
+        m = _FRAME_RE.match(name)
+        if m:
+            prefix, digits, suffix = m.groups()
+            groups.setdefault((head, prefix, suffix), []).append(digits)
+
+    result = {}
+    for (head, prefix, suffix), digits in groups.items():
+        fs = _build_sequence(head, prefix, suffix, digits)
+        result[fs.template] = fs
+    return result
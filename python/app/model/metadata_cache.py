@@ -0,0 +1,172 @@
+# model/metadata_cache.py
+"""
+Browse 때마다 다시 읽던 EXR header / 디렉터리 목록을 SQLite 에 저장해 두는 캐시.
+
+- key   : (path, kind) + 파일 identity (inode, size, mtime_ns)
+          identity 가 달라지면 (재전송, 덮어쓰기 등) 자동으로 miss 처리
+- 값    : JSON 으로 직렬화 가능한 dict / list
+- 제거  : last_access 기준 LRU, 항목 수 / 전체 크기 상한
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("SCANDATA_CACHE_DIR", Path.home() / ".cache" / "tk-multi-scandata")
+)
+DEFAULT_MAX_ENTRIES = 200_000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_EVICT_EVERY = 256          # put 몇 번마다 eviction 검사할지
+_MTIME_GUARD_NS = 2 * 10**9  # 방금 바뀐 디렉터리는 mtime 해상도 문제로 캐시하지 않음
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path        TEXT NOT NULL,
+    kind        TEXT NOT NULL,
+    inode       INTEGER NOT NULL,
+    size        INTEGER NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    payload     TEXT NOT NULL,
+    nbytes      INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (path, kind)
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+"""
+
+
+def file_identity(path):
+    """(inode, size, mtime_ns) – 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+class MetadataCache:
+    def __init__(self, db_path=None, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.db_path = Path(db_path) if db_path else DEFAULT_CACHE_DIR / "metadata_cache.db"
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------
+    def get(self, path, kind: str = "header", identity=None):
+        """identity 가 저장 당시와 같을 때만 값을 돌려준다 (아니면 None)"""
+        path = str(path)
+        identity = identity or file_identity(path)
+        with self._lock:
+            row = None
+            if identity is not None:
+                row = self._conn.execute(
+                    "SELECT inode, size, mtime_ns, payload FROM entries WHERE path=? AND kind=?",
+                    (path, kind),
+                ).fetchone()
+            if row is None or tuple(row[:3]) != tuple(identity):
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE entries SET last_access=? WHERE path=? AND kind=?",
+                (time.time(), path, kind),
+            )
+            self.hits += 1
+        return json.loads(row[3])
+
+    def put(self, path, value, kind: str = "header", identity=None) -> bool:
+        path = str(path)
+        identity = identity or file_identity(path)
+        if identity is None:
+            return False
+        if time.time_ns() - identity[2] < _MTIME_GUARD_NS:
+            return False
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, kind, identity[0], identity[1], identity[2],
+                 payload, len(payload), time.time()),
+            )
+            self._puts += 1
+            if self._puts % _EVICT_EVERY == 0:
+                self._evict_locked()
+        return True
+
+    def invalidate(self, prefix=None) -> int:
+        """prefix 아래 항목(없으면 전체)을 지우고 지운 개수를 반환"""
+        with self._lock:
+            if prefix:
+                prefix = str(prefix).rstrip("/")
+                cur = self._conn.execute(
+                    "DELETE FROM entries WHERE path=? OR substr(path, 1, ?)=?",
+                    (prefix, len(prefix) + 1, prefix + "/"),
+                )
+            else:
+                cur = self._conn.execute("DELETE FROM entries")
+            self.hits = self.misses = 0
+            return cur.rowcount
+
+    def evict(self):
+        with self._lock:
+            self._evict_locked()
+
+    def _evict_locked(self):
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM entries"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # 최근에 쓴 것부터 상한의 90% 까지만 남기고 나머지 제거
+        keep_n = int(self.max_entries * 0.9)
+        keep_bytes = int(self.max_bytes * 0.9)
+        kept, acc = 0, 0
+        for (nbytes,) in self._conn.execute(
+            "SELECT nbytes FROM entries ORDER BY last_access DESC"
+        ):
+            if kept >= keep_n or acc + nbytes > keep_bytes:
+                break
+            kept += 1
+            acc += nbytes
+        drop = count - kept
+        if drop:
+            self._conn.execute(
+                "DELETE FROM entries WHERE rowid IN "
+                "(SELECT rowid FROM entries ORDER BY last_access ASC LIMIT ?)",
+                (drop,),
+            )
+            print(f"[INFO] 메타데이터 캐시 정리: {drop}개 항목 제거")
+
+    def stats_text(self) -> str:
+        return f"cache hit {self.hits} / miss {self.misses}"
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_DEFAULT_CACHE = None
+
+
+def get_default_cache() -> MetadataCache:
+    """세션 전체에서 공유하는 캐시 (BrowserLoad, ScanModel 등)"""
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = MetadataCache()
+    return _DEFAULT_CACHE
@@ -1,38 +1,60 @@
 
 import re, os
 from pathlib import Path
+from .frame_set import FrameSet, group_sequences
 
 def extract_frame_range_from_sequence(file_list):  # exr 리스트만 반환 
-    frame_numbers = []
-    for file_path in file_list:
-        basename = os.path.basename(file_path)
-        match = re.search(r'(\d{4})\.(exr|dpx)$', basename)
-        if not match:
-            match = re.search(r'_(\d{4})\.', basename)
-        if match:
-            frame_numbers.append(int(match.group(1)))
-    if not frame_numbers:
+    # 빠진 프레임 / 중복 프레임이 있으면 범위 뒤에 함께 표시
+    frames = FrameSet.from_paths(file_list)
+    if not frames:
         return "Unknown"
-    return f"{min(frame_numbers):04d} ~ {max(frame_numbers):04d}"
+    text = f"{frames.first:04d} ~ {frames.last:04d}"
+    if not frames.is_clean:
+        text += f" ({frames.check_text()})"
+    return text
 
-def scan_exr_sequences(folder_path): # 프레임 범위만 추출 
+def _list_dir(dir_path, cache=None):
+    """
+    (하위 폴더 이름, exr 파일 이름) 반환.
+    폴더 identity(mtime) 가 캐시와 같으면 목록을 다시 읽지 않는다.
+    """
+    if cache is not None:
+        cached = cache.get(dir_path, kind="listdir")
+        if cached is not None:
+            return cached["dirs"], cached["exr"]
+
+    dirs, exrs = [], []
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(entry.name)
+            elif entry.name.endswith(".exr"):
+                exrs.append(entry.name)
+
+    if cache is not None:
+        cache.put(dir_path, {"dirs": dirs, "exr": exrs}, kind="listdir")
+    return dirs, exrs
+
+def scan_exr_sequences(folder_path, cache=None): # 프레임 범위만 추출 
+    # cache: model.metadata_cache.MetadataCache (없으면 매번 디렉터리를 읽음)
+    exr_files = []
+    stack = [str(folder_path)]
+    while stack:
+        dir_path = stack.pop()
+        dirs, exrs = _list_dir(dir_path, cache)
+        stack.extend(os.path.join(dir_path, d) for d in dirs)
+        exr_files.extend(Path(dir_path) / name for name in exrs)
+
+    # 폴더 + 파일 이름 템플릿 단위로 묶어 프레임마다 경로를 들고 있지 않는다
+    sequences = group_sequences(exr_files)
+    skipped = len(exr_files) - sum(len(fs) for fs in sequences.values())
+    if skipped:
+        print(f"[WARN] 프레임 번호가 없는 EXR {skipped}개는 시퀀스에서 제외")
 
-    exr_files = list(Path(folder_path).rglob("*.exr"))
-    sequences = {}
-    pattern = re.compile(r"(.*)_(\d+)$")  # 파일명 끝 숫자 시퀀스 분리용
-    
-    for f in exr_files:
-        stem = f.stem  # ex: '20241226_2_0001'
-        m = pattern.match(stem)
-        if m:
-            base_name = m.group(1)  # ex: '20241226_2'
-            sequences.setdefault(base_name, []).append(str(f))
-        else:
-            sequences.setdefault(stem, []).append(str(f))
-    
     result = []
-    for base, files in sequences.items():
-        files.sort()
-        result.append({"basename": base, "files": files})
+    for template in sorted(sequences):
+        frames = sequences[template]
+        base = os.path.basename(template).split("%")[0].rstrip("_.")   # ex: '20241226_2'
+        result.append({"basename": base, "frames": frames})
     
     return result
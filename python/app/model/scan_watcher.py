@@ -0,0 +1,215 @@
+# model/scan_watcher.py
+"""
+scan 루트 아래에서 내용이 바뀐 폴더만 알려주는 watcher.
+
+- Linux 로컬 파일시스템 : inotify (ctypes) 로 이벤트만 받아 처리
+- NFS 등 네트워크 볼륨이나 inotify 를 못 쓰는 환경 : 폴더 mtime polling
+  (파일 추가/삭제/이름 변경은 폴더 mtime 을 바꾸므로 폴더 수만큼의 stat 으로 충분)
+
+poll() 은 마지막 호출 이후 목록이 바뀐 폴더 경로 집합을 돌려준다.
+새로 생긴 폴더와 그 하위 폴더, 사라진 폴더도 포함된다.
+"""
+import os
+import struct
+import ctypes
+import ctypes.util
+from typing import Dict, Iterable, Set
+
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE
+               | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF)
+_EVENT = struct.Struct("iIII")
+
+_NETWORK_FS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "fuse.sshfs", "9p"}
+
+
+def _fs_type(path: str) -> str:
+    """/proc/mounts 에서 path 가 속한 마운트의 파일시스템 종류"""
+    path = os.path.realpath(path)
+    best, fstype = "", ""
+    try:
+        with open("/proc/mounts") as fh:
+            for line in fh:
+                parts = line.split()
+                if len(parts) < 3:
+                    continue
+                mnt = parts[1].replace("\\040", " ")
+                if (path == mnt or path.startswith(mnt.rstrip("/") + "/")) and len(mnt) > len(best):
+                    best, fstype = mnt, parts[2]
+    except OSError:
+        pass
+    return fstype
+
+
+def _walk_dirs(root: str):
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        yield d
+        try:
+            with os.scandir(d) as it:
+                stack.extend(e.path for e in it if e.is_dir(follow_symlinks=False))
+        except OSError:
+            continue
+
+
+class _PollingBackend:
+    def __init__(self, roots):
+        self.roots = roots
+        self.snapshot: Dict[str, int] = {}
+        for root in roots:
+            for d in _walk_dirs(root):
+                self._record(d)
+
+    def _record(self, d) -> bool:
+        try:
+            self.snapshot[d] = os.stat(d).st_mtime_ns
+            return True
+        except OSError:
+            return False
+
+    def poll(self) -> Set[str]:
+        changed = set()
+        for d, mtime in list(self.snapshot.items()):
+            try:
+                now = os.stat(d).st_mtime_ns
+            except OSError:
+                del self.snapshot[d]               # 사라진 폴더
+                changed.add(d)
+                continue
+            if now == mtime:
+                continue
+            self.snapshot[d] = now
+            changed.add(d)
+            # 목록이 바뀐 폴더 안에 새 하위 폴더가 생겼을 수 있음
+            try:
+                with os.scandir(d) as it:
+                    subdirs = [e.path for e in it if e.is_dir(follow_symlinks=False)]
+            except OSError:
+                continue
+            for sub in subdirs:
+                if sub not in self.snapshot:
+                    for new_dir in _walk_dirs(sub):
+                        if self._record(new_dir):
+                            changed.add(new_dir)
+        return changed
+
+    def close(self):
+        self.snapshot.clear()
+
+
+class _InotifyBackend:
+    def __init__(self, roots):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self.roots = roots
+        self._wd: Dict[int, str] = {}
+        self._dirs: Dict[str, int] = {}
+        for root in roots:
+            for d in _walk_dirs(root):
+                self._add(d)
+
+    def _add(self, d: str) -> bool:
+        if d in self._dirs:
+            return True
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(d), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == 28:   # ENOSPC: max_user_watches 초과
+                raise OSError(err, "inotify watch 개수 한도 초과")
+            return False
+        self._wd[wd] = d
+        self._dirs[d] = wd
+        return True
+
+    def _add_tree(self, root: str, changed: Set[str]):
+        for d in _walk_dirs(root):
+            if self._add(d):
+                changed.add(d)
+
+    def poll(self) -> Set[str]:
+        changed = set()
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buf:
+                break
+            pos = 0
+            while pos + _EVENT.size <= len(buf):
+                wd, mask, _cookie, length = _EVENT.unpack_from(buf, pos)
+                name = buf[pos + _EVENT.size:pos + _EVENT.size + length].rstrip(b"\0")
+                pos += _EVENT.size + length
+
+                if mask & _IN_Q_OVERFLOW:
+                    # 이벤트 유실 – 감시 중인 모든 폴더를 바뀐 것으로 처리
+                    changed.update(self._dirs)
+                    continue
+                d = self._wd.get(wd)
+                if d is None:
+                    continue
+                if mask & _IN_IGNORED:
+                    self._wd.pop(wd, None)
+                    self._dirs.pop(d, None)
+                    continue
+                changed.add(d)
+                if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                    continue
+                if name and mask & _IN_ISDIR:
+                    sub = os.path.join(d, os.fsdecode(name))
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        self._add_tree(sub, changed)
+                    else:
+                        changed.add(sub)          # 삭제 / 이동된 하위 폴더
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class ScanWatcher:
+    def __init__(self, roots: Iterable, use_inotify=None):
+        """
+        use_inotify: None 이면 자동 (Linux 로컬 FS 면 inotify, 아니면 polling)
+        """
+        self.roots = [os.path.abspath(str(r)) for r in roots]
+        self.backend = None
+        if use_inotify is None:
+            use_inotify = all(_fs_type(r) not in _NETWORK_FS for r in self.roots)
+        if use_inotify:
+            try:
+                self.backend = _InotifyBackend(self.roots)
+            except (OSError, AttributeError) as e:
+                print(f"[WARN] inotify 사용 불가 – polling 으로 전환: {e}")
+        if self.backend is None:
+            self.backend = _PollingBackend(self.roots)
+        print(f"[INFO] ScanWatcher 시작 ({self.mode}): {', '.join(self.roots)}")
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if isinstance(self.backend, _InotifyBackend) else "polling"
+
+    def poll(self) -> Set[str]:
+        return self.backend.poll()
+
+    def close(self):
+        self.backend.close()
@@ -0,0 +1,279 @@
+# model/sequence_index.py
+"""
+SequenceStore 위의 검색 / 필터 / 정렬 index.
+
+테이블 행이 수천 ~ 수만 개여도 검색어를 칠 때마다 모든 행을 문자열 비교하지 않도록
+store 변경 알림을 받아 아래 index 를 유지한다.
+
+- seq / shot 이름 prefix trie   : 노드마다 그 prefix 로 시작하는 행 번호 목록
+- 날짜(mtime) / 프레임 수        : 정렬된 NumPy 배열 → 범위 검색은 searchsorted 두 번
+- checked / validated / published : 행 수 길이의 bool 배열 (bitset) → & / ~ 로 결합
+- 열 정렬 순서                   : 키별 argsort 결과를 캐시 (행 구조가 바뀔 때만 다시 계산)
+
+query(SequenceQuery) 는 조건을 모두 만족하는 행의 bool mask 를,
+order(key, descending) 는 정렬된 행 번호 배열을 돌려준다.
+행 추가는 index 에 바로 반영하고, 삭제 / 전체 교체는 다음 조회 때 한 번에 다시 만든다.
+
+검색 문법 (parse_query):
+    SH010            seq 또는 shot 이름이 SH010 으로 시작 (대소문자 무시, 여러 단어는 AND)
+    seq:S01 shot:SH0 이름 종류를 지정한 prefix
+    is:checked  -is:published        상태 (validated 도 가능, - 는 반대)
+    frames>100  frames<=50           프레임 수
+    date>=2024-05-01  date<2024-06-01   스캔 폴더 수정 날짜
+"""
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .sequence_store import SequenceStore
+
+FLAGS = ("checked", "validated", "published")
+# order() 에 쓸 수 있는 키 – 날짜 / 프레임 수는 숫자 배열, 나머지는 문자열 argsort
+NUMERIC_KEYS = ("mtime", "frame_count", "first", "version")
+TEXT_KEYS = ("seq", "shot", "scan", "timecode", "colorspace", "camera", "version_path", "movie", "check")
+
+_COMPARE = re.compile(r"^(frames|date)(>=|<=|>|<|=)(.+)$")
+
+
+class PrefixTrie:
+    """소문자 이름 → 행 번호. 각 노드가 그 prefix 로 시작하는 행 번호를 모두 들고 있어 find 는 O(prefix 길이)"""
+
+    __slots__ = ("_root",)
+
+    def __init__(self):
+        self._root = ({}, [])          # (children, rows)
+
+    def add(self, name: str, row: int):
+        node = self._root
+        node[1].append(row)
+        for ch in name.lower():
+            child = node[0].get(ch)
+            if child is None:
+                child = node[0][ch] = ({}, [])
+            child[1].append(row)
+            node = child
+
+    def find(self, prefix: str) -> List[int]:
+        node = self._root
+        for ch in prefix.lower():
+            node = node[0].get(ch)
+            if node is None:
+                return []
+        return node[1]
+
+
+@dataclass
+class SequenceQuery:
+    names: List[str] = field(default_factory=list)          # seq 또는 shot prefix (AND)
+    seq: List[str] = field(default_factory=list)
+    shot: List[str] = field(default_factory=list)
+    flags: Dict[str, bool] = field(default_factory=dict)    # {"checked": True, "published": False}
+    frames: Tuple[Optional[int], Optional[int]] = (None, None)     # 프레임 수 [min, max]
+    date: Tuple[Optional[float], Optional[float]] = (None, None)   # mtime [min, max)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.names or self.seq or self.shot or self.flags
+                    or self.frames != (None, None) or self.date != (None, None))
+
+
+def _parse_date(text: str) -> float:
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d", "%Y%m%d"):
+        try:
+            return time.mktime(time.strptime(text, fmt))
+        except ValueError:
+            continue
+    raise ValueError(f"날짜 형식을 알 수 없습니다: {text} (예: 2024-05-01)")
+
+
+def parse_query(text: str) -> SequenceQuery:
+    """검색창 문자열 → SequenceQuery. 해석할 수 없는 조건은 ValueError"""
+    q = SequenceQuery()
+    frames_lo = frames_hi = date_lo = date_hi = None
+    for token in (text or "").split():
+        negate = token.startswith("-")
+        body = token[1:] if negate else token
+        key, sep, value = body.partition(":")
+        if sep and key == "is" and value in FLAGS:
+            q.flags[value] = not negate
+            continue
+        if sep and key in ("seq", "shot") and value:
+            getattr(q, key).append(value)
+            continue
+        m = _COMPARE.match(body)
+        if m:
+            name, op, value = m.groups()
+            if name == "frames":
+                if not value.isdigit():
+                    raise ValueError(f"프레임 수는 숫자여야 합니다: {token}")
+                n = int(value)
+                lo, hi = {">": (n + 1, None), ">=": (n, None), "<": (None, n - 1),
+                          "<=": (None, n), "=": (n, n)}[op]
+                frames_lo = lo if lo is not None else frames_lo
+                frames_hi = hi if hi is not None else frames_hi
+            else:
+                t = _parse_date(value)
+                day = 24 * 3600 if len(value) <= 10 else 0      # 날짜만 주면 그날 전체
+                lo, hi = {">": (t + max(day, 1), None), ">=": (t, None), "<": (None, t),
+                          "<=": (None, t + max(day, 1)), "=": (t, t + max(day, 1))}[op]
+                date_lo = lo if lo is not None else date_lo
+                date_hi = hi if hi is not None else date_hi
+            continue
+        q.names.append(token)
+    q.frames = (frames_lo, frames_hi)
+    q.date = (date_lo, date_hi)
+    return q
+
+
+class SequenceIndex:
+    def __init__(self, store: SequenceStore):
+        self.store = store
+        self._dirty = True
+        self._orders: Dict[str, np.ndarray] = {}
+        store.add_listener(self._on_store_changed, first=True)
+
+    # ─── store 알림 ─────────────────────────────────────────────
+    def _on_store_changed(self, event: str, first: int, last: int, fields: tuple):
+        if self._dirty:
+            return
+        if event == "inserted" and first == self._n:
+            for row in range(first, last + 1):
+                self._append(row)
+            self._orders.clear()
+        elif event == "updated":
+            if "seq" in fields or "shot" in fields:
+                self._dirty = True          # trie 는 지울 수 없으므로 다음 조회 때 다시 만듦
+                return
+            if any(f in FLAGS for f in fields):
+                for row in range(first, last + 1):
+                    record = self.store[row]
+                    for name in FLAGS:
+                        self._bits[name][row] = getattr(record, name)
+            if any(f in ("mtime", "frames", "version") for f in fields):
+                self._refresh_numbers(first, last)
+            self._orders.clear()
+        elif event in ("removed", "reset"):
+            self._dirty = True
+
+    # ─── index 만들기 ──────────────────────────────────────────
+    def _grow(self, size: int):
+        if size <= len(self._mtime):
+            return
+        cap = max(size, len(self._mtime) * 2, 64)
+        self._mtime = np.resize(self._mtime, cap)
+        self._frame_count = np.resize(self._frame_count, cap)
+        self._first = np.resize(self._first, cap)
+        self._version = np.resize(self._version, cap)
+        for name in FLAGS:
+            self._bits[name] = np.resize(self._bits[name], cap)
+
+    def _append(self, row: int):
+        record = self.store[row]
+        self._grow(row + 1)
+        self._seq.add(record.seq, row)
+        self._shot.add(record.shot, row)
+        self._n = row + 1
+        self._refresh_numbers(row, row)
+        for name in FLAGS:
+            self._bits[name][row] = getattr(record, name)
+
+    def _refresh_numbers(self, first: int, last: int):
+        for row in range(first, last + 1):
+            record = self.store[row]
+            self._mtime[row] = record.mtime
+            self._frame_count[row] = len(record.frames)
+            self._first[row] = record.frames.first if record.frames else 0
+            self._version[row] = record.version
+
+    def rebuild(self):
+        self._n = 0
+        self._seq = PrefixTrie()
+        self._shot = PrefixTrie()
+        self._mtime = np.zeros(0, dtype=np.float64)
+        self._frame_count = np.zeros(0, dtype=np.int64)
+        self._first = np.zeros(0, dtype=np.int64)
+        self._version = np.zeros(0, dtype=np.int64)
+        self._bits = {name: np.zeros(0, dtype=bool) for name in FLAGS}
+        self._orders = {}
+        self._grow(len(self.store))
+        for row in range(len(self.store)):
+            self._append(row)
+        self._dirty = False
+
+    def _ensure(self):
+        if self._dirty or self._n != len(self.store):
+            self.rebuild()
+
+    # ─── 조회 ─────────────────────────────────────────────────
+    def _prefix_mask(self, trie: PrefixTrie, prefix: str) -> np.ndarray:
+        mask = np.zeros(self._n, dtype=bool)
+        rows = trie.find(prefix)
+        if rows:
+            mask[rows] = True
+        return mask
+
+    def _range_mask(self, key: str, lo, hi, inclusive_hi: bool) -> np.ndarray:
+        values = self._numbers(key)
+        order = self.order(key)
+        sorted_values = values[order]
+        start = 0 if lo is None else np.searchsorted(sorted_values, lo, side="left")
+        side = "right" if inclusive_hi else "left"
+        stop = self._n if hi is None else np.searchsorted(sorted_values, hi, side=side)
+        mask = np.zeros(self._n, dtype=bool)
+        mask[order[start:stop]] = True
+        return mask
+
+    def query(self, q: SequenceQuery) -> np.ndarray:
+        """조건을 모두 만족하는 행 bool mask (길이 = 행 수)"""
+        self._ensure()
+        mask = np.ones(self._n, dtype=bool)
+        for name in q.names:
+            mask &= self._prefix_mask(self._seq, name) | self._prefix_mask(self._shot, name)
+        for name in q.seq:
+            mask &= self._prefix_mask(self._seq, name)
+        for name in q.shot:
+            mask &= self._prefix_mask(self._shot, name)
+        for name, wanted in q.flags.items():
+            bits = self._bits[name][:self._n]
+            mask &= bits if wanted else ~bits
+        if q.frames != (None, None):
+            mask &= self._range_mask("frame_count", q.frames[0], q.frames[1], inclusive_hi=True)
+        if q.date != (None, None):
+            mask &= self._range_mask("mtime", q.date[0], q.date[1], inclusive_hi=False)
+        return mask
+
+    def _numbers(self, key: str) -> np.ndarray:
+        return {"mtime": self._mtime, "frame_count": self._frame_count,
+                "first": self._first, "version": self._version}[key][:self._n]
+
+    def _text_keys(self, key: str) -> np.ndarray:
+        if key == "check":
+            values = [r.frames.check_text() for r in self.store]
+        else:
+            values = [getattr(r, key) or "" for r in self.store]
+        return np.array([v.lower() for v in values], dtype=object)
+
+    def order(self, key: str, descending: bool = False) -> np.ndarray:
+        """key 기준 정렬된 행 번호 (같은 값은 원래 순서 유지). 결과는 다음 구조 변경까지 캐시"""
+        self._ensure()
+        cache_key = (key, descending)
+        cached = self._orders.get(cache_key)
+        if cached is not None:
+            return cached
+        if key in FLAGS:
+            values = self._bits[key][:self._n]
+            order = np.argsort(~values if descending else values, kind="stable")
+        elif key in NUMERIC_KEYS:
+            values = self._numbers(key)
+            order = np.argsort(-values if descending else values, kind="stable")
+        elif key in TEXT_KEYS:
+            # 문자열은 순위(정수)로 바꿔 숫자와 같은 방식으로 정렬
+            _, ranks = np.unique(self._text_keys(key), return_inverse=True)
+            order = np.argsort(-ranks if descending else ranks, kind="stable")
+        else:
+            raise KeyError(f"정렬할 수 없는 키: {key}")
+        self._orders[cache_key] = order
+        return order
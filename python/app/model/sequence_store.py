@@ -0,0 +1,255 @@
+# model/sequence_store.py
+"""
+Browse 한 시퀀스(샷) 행들의 메모리 저장소 – 테이블, Validate, Excel 저장, Publish 가 모두 여기를 읽는다.
+
+예전에는 행 상태가 테이블 셀 문자열에만 있어서 Validate / Publish / Excel 저장이 각자
+셀을 다시 긁고 "1001-1100", "v003" 같은 문자열을 다시 파싱했다.
+여기서는 값을 원래 타입(FrameSet, int, float …)으로 SequenceRecord(__slots__)에 들고 있고
+scan 경로 / seq / shot 으로 바로 찾을 수 있는 index 를 유지한다.
+
+변경 알림: add_listener(fn) 로 등록한 fn(event, first, last, fields) 를 호출한다.
+  about_to_insert / inserted, about_to_remove / removed, about_to_reset / reset : 행 구조 변경 (앞뒤로 한 번씩)
+  updated : first~last 행의 fields 값이 바뀜
+Qt model 은 이 알림을 beginInsertRows / dataChanged 등으로 옮긴다. (GUI 스레드 전용)
+"""
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from .frame_set import FrameSet
+
+_VERSION_TEXT = re.compile(r"^\s*[vV]?(\d+)\s*$")
+
+
+def parse_version(text) -> Optional[int]:
+    """'v003' / 'V3' / '3' / 3 → 3, 해석할 수 없으면 None"""
+    if isinstance(text, int):
+        return text
+    m = _VERSION_TEXT.match(str(text or ""))
+    return int(m.group(1)) if m else None
+
+
+class SequenceRecord:
+    """시퀀스(스캔 폴더) 하나. scan 경로가 key"""
+
+    __slots__ = (
+        "scan", "seq", "shot", "frames", "version", "timecode", "colorspace",
+        "mtime", "date", "camera", "thumb_path", "tooltip_path",
+        "version_path", "movie", "mp4", "checked", "validated", "published",
+    )
+
+    def __init__(self, scan: str, seq: str = "", shot: str = "", frames: FrameSet = None,
+                 version: int = 1, timecode: str = "", colorspace: str = "",
+                 mtime: float = 0.0, date: str = "", camera: str = "",
+                 thumb_path: Optional[str] = None, tooltip_path: Optional[str] = None,
+                 version_path: str = "", movie: str = "", mp4: str = "",
+                 checked: bool = True, validated: bool = False, published: bool = False):
+        self.scan = str(scan)
+        self.seq = seq
+        self.shot = shot
+        self.frames = frames if frames is not None else FrameSet()
+        self.version = version                 # 다음에 만들 버전 번호 (3 → v003)
+        self.timecode = timecode or ""
+        self.colorspace = colorspace or ""
+        self.mtime = mtime                     # 스캔 폴더 mtime (정렬용)
+        self.date = date                       # 표시용 날짜 문자열
+        self.camera = camera
+        self.thumb_path = thumb_path
+        self.tooltip_path = tooltip_path
+        self.version_path = version_path       # Validate 가 정한 org/plate/org/vNNN 경로
+        self.movie = movie
+        self.mp4 = mp4
+        self.checked = checked
+        self.validated = validated
+        self.published = published
+
+    def __repr__(self) -> str:
+        return f"SequenceRecord({self.seq}/{self.shot} {self.version_text} {self.frames})"
+
+    @property
+    def version_text(self) -> str:
+        return f"v{self.version:03d}"
+
+    @property
+    def frame_range_text(self) -> str:
+        return f"{self.frames.first}-{self.frames.last}" if self.frames else ""
+
+    def as_row(self) -> Dict[str, str]:
+        """Excel 저장용 한 행 (열 이름은 기존 엑셀과 같음)"""
+        return {
+            "SEQ": self.seq,
+            "SHOT": self.shot,
+            "VER": self.version_text,
+            "SCAN": self.scan,
+            "FRANGE": self.frame_range_text,
+            "TCODE": self.timecode,
+            "COLORSPACE": self.colorspace,
+            "DATETIME": self.date,
+            "CAM": self.camera,
+            "MOVIE": self.movie,
+            "FCHECK": self.frames.check_text(),
+            "THUMB": "",
+        }
+
+
+# record 필드 → as_row() 열. Excel 저장 후 바뀐 필드로 다시 써야 할 셀을 찾을 때 사용
+ROW_FIELDS = {
+    "seq": ("SEQ",), "shot": ("SHOT",), "version": ("VER",), "frames": ("FRANGE", "FCHECK"),
+    "timecode": ("TCODE",), "colorspace": ("COLORSPACE",), "date": ("DATETIME",),
+    "camera": ("CAM",), "movie": ("MOVIE",),
+}
+
+
+# 다시 스캔해서 같은 scan 경로 행을 갱신할 때 사용자 / Validate / Publish 가 정한 값은 유지
+_KEEP_ON_RESCAN = ("checked", "version_path", "movie", "mp4", "validated", "published")
+
+
+class SequenceStore:
+    def __init__(self):
+        self._records: List[SequenceRecord] = []
+        self._rows: Dict[str, int] = {}                            # scan → 행 번호
+        self._by_seq: Dict[str, Dict[str, SequenceRecord]] = {}    # seq → {scan: record}
+        self._by_shot: Dict[str, Dict[str, SequenceRecord]] = {}
+        self._listeners: List[Callable] = []
+
+    # ─── 변경 알림 ─────────────────────────────────────────────
+    def add_listener(self, fn: Callable[[str, int, int, tuple], None], first: bool = False):
+        # first=True: 검색 index 처럼 Qt model 보다 먼저 갱신돼야 하는 listener
+        if first:
+            self._listeners.insert(0, fn)
+        else:
+            self._listeners.append(fn)
+
+    def remove_listener(self, fn):
+        if fn in self._listeners:
+            self._listeners.remove(fn)
+
+    def _notify(self, event: str, first: int = -1, last: int = -1, fields: tuple = ()):
+        for fn in list(self._listeners):
+            fn(event, first, last, fields)
+
+    # ─── 조회 ─────────────────────────────────────────────────
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[SequenceRecord]:
+        return iter(self._records)
+
+    def __getitem__(self, row: int) -> SequenceRecord:
+        return self._records[row]
+
+    def __contains__(self, scan) -> bool:
+        return str(scan) in self._rows
+
+    def get(self, scan) -> Optional[SequenceRecord]:
+        row = self._rows.get(str(scan))
+        return None if row is None else self._records[row]
+
+    def row_of(self, scan) -> int:
+        return self._rows.get(str(scan), -1)
+
+    def by_seq(self, seq: str) -> List[SequenceRecord]:
+        return list(self._by_seq.get(seq, {}).values())
+
+    def by_shot(self, shot: str) -> List[SequenceRecord]:
+        return list(self._by_shot.get(shot, {}).values())
+
+    def seqs(self) -> List[str]:
+        return sorted(self._by_seq)
+
+    def scans(self) -> List[str]:
+        return [r.scan for r in self._records]
+
+    def checked(self) -> List[SequenceRecord]:
+        return [r for r in self._records if r.checked]
+
+    # ─── index ────────────────────────────────────────────────
+    def _index(self, record: SequenceRecord):
+        self._by_seq.setdefault(record.seq, {})[record.scan] = record
+        self._by_shot.setdefault(record.shot, {})[record.scan] = record
+
+    def _unindex(self, record: SequenceRecord):
+        for index, name in ((self._by_seq, record.seq), (self._by_shot, record.shot)):
+            bucket = index.get(name)
+            if bucket is not None:
+                bucket.pop(record.scan, None)
+                if not bucket:
+                    del index[name]
+
+    # ─── 변경 ─────────────────────────────────────────────────
+    def upsert(self, record: SequenceRecord) -> int:
+        """같은 scan 경로가 있으면 값을 갱신 (체크 / 버전 경로 / 퍼블리시 상태는 유지), 없으면 맨 뒤에 추가"""
+        row = self._rows.get(record.scan)
+        if row is None:
+            row = len(self._records)
+            self._notify("about_to_insert", row, row)
+            self._records.append(record)
+            self._rows[record.scan] = row
+            self._index(record)
+            self._notify("inserted", row, row)
+            return row
+
+        old = self._records[row]
+        for name in _KEEP_ON_RESCAN:
+            setattr(record, name, getattr(old, name))
+        self._unindex(old)
+        self._records[row] = record
+        self._index(record)
+        self._notify("updated", row, row, SequenceRecord.__slots__)
+        return row
+
+    def update(self, scan, **fields) -> bool:
+        """scan 경로 행의 필드 값 변경. 없는 필드 이름이면 AttributeError"""
+        row = self._rows.get(str(scan))
+        if row is None:
+            return False
+        record = self._records[row]
+        for name in fields:
+            if name not in SequenceRecord.__slots__ or name == "scan":
+                raise AttributeError(f"바꿀 수 없는 필드: {name}")
+        reindex = "seq" in fields or "shot" in fields
+        if reindex:
+            self._unindex(record)
+        for name, value in fields.items():
+            setattr(record, name, value)
+        if reindex:
+            self._index(record)
+        self._notify("updated", row, row, tuple(fields))
+        return True
+
+    def set_checked(self, rows: Iterable[int], checked: bool):
+        rows = sorted(set(rows))
+        for row in rows:
+            self._records[row].checked = checked
+        if rows:
+            self._notify("updated", rows[0], rows[-1], ("checked",))
+
+    def remove(self, scan) -> bool:
+        row = self._rows.get(str(scan))
+        if row is None:
+            return False
+        self._notify("about_to_remove", row, row)
+        record = self._records.pop(row)
+        self._unindex(record)
+        del self._rows[record.scan]
+        for r in range(row, len(self._records)):      # 뒤쪽 행 번호가 하나씩 당겨짐
+            self._rows[self._records[r].scan] = r
+        self._notify("removed", row, row)
+        return True
+
+    def replace(self, records: Iterable[SequenceRecord]):
+        """전체 행을 한 번에 교체 (알림도 reset 한 번)"""
+        self._notify("about_to_reset")
+        self._records = []
+        self._rows.clear()
+        self._by_seq.clear()
+        self._by_shot.clear()
+        for record in records:
+            if record.scan in self._rows:
+                continue
+            self._rows[record.scan] = len(self._records)
+            self._records.append(record)
+            self._index(record)
+        self._notify("reset")
+
+    def clear(self):
+        self.replace(())
@@ -1,12 +1,13 @@
 # model/shotgrid_model.py
 
 from pathlib import Path
-import pandas as pd
+from typing import Iterator, List, Tuple
+from .excel import iter_rows
 
 class ShotGridModel:
     def __init__(self, project_id):
         self.project_id = project_id
-        self.df = None
+        self.columns: List[str] = []     # 엑셀 1행 열 이름 (iter_rows tuple 순서)
         self.excel_path = None
         self.webm_path = None
         self.mp4_path = None
@@ -18,7 +19,22 @@ class ShotGridModel:
     def load_excel(self):
         if not self.excel_path or not self.excel_path.exists():
             raise FileNotFoundError(f"엑셀 파일이 없습니다: {self.excel_path}")
-        self.df = pd.read_excel(self.excel_path)
+        # 헤더만 읽어 둔다. 데이터 행은 iter_rows 에서 한 행씩 읽음 (DataFrame 을 만들지 않음)
+        rows = iter_rows(self.excel_path)
+        try:
+            header = next(rows, None)
+        finally:
+            rows.close()
+        if header is None:
+            raise ValueError(f"엑셀에 데이터가 없습니다: {self.excel_path}")
+        self.columns = [str(c) if c is not None else "" for c in header]
+
+    def column_index(self, name: str) -> int:
+        """열 이름 → iter_rows tuple 의 위치 (없으면 KeyError)"""
+        try:
+            return self.columns.index(name)
+        except ValueError:
+            raise KeyError(f"엑셀에 '{name}' 열이 없습니다: {self.columns}") from None
 
     def set_webm(self, webm_path: Path):
         self.webm_path = Path(webm_path)
@@ -29,8 +45,10 @@ class ShotGridModel:
     def set_thumbnail(self, thumb_path: Path):
         self.thumb_path = Path(thumb_path)
 
-    def iter_rows(self):
-        if self.df is None:
+    def iter_rows(self) -> Iterator[Tuple]:
+        # 데이터 행을 tuple 로 (Series 를 만들지 않음). 값 위치는 self.columns / column_index 참고
+        if not self.columns:
             raise ValueError("Excel 데이터가 로드되지 않았습니다.")
-        for _, row in self.df.iterrows():
-            yield row
+        rows = iter_rows(self.excel_path)
+        next(rows, None)          # 헤더
+        yield from rows
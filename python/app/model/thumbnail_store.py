@@ -0,0 +1,160 @@
+# model/thumbnail_store.py
+"""
+원본 프레임 내용 기준으로 주소를 정하는 썸네일 저장소.
+
+스캔 폴더 옆 .thumb/ 에 쓰고 '파일이 있으면 유효' 로 보던 방식은 재전송된 plate 에도
+예전 썸네일이 남았다. 여기서는 원본 EXR 의 (크기, mtime_ns, 앞 64KB) 해시를 key 로
+캐시 폴더에 크기별 피라미드를 저장한다. (display transform 이름도 key 에 포함)
+
+    <cache>/thumbs/ab/abcdef0123….table.jpg      ← 테이블 (300x100 안에 맞춤)
+    <cache>/thumbs/ab/abcdef0123….tooltip.jpg    ← 툴팁 미리보기
+    <cache>/thumbs/ab/abcdef0123….shotgrid.jpg   ← ShotGrid 용
+
+원본이 바뀌면 key 가 달라지므로 무효화가 따로 필요 없고, 오래된 파일은 prune() 이 정리한다.
+"""
+import os
+import hashlib
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .metadata_cache import DEFAULT_CACHE_DIR
+from .display_transform import DEFAULT_TRANSFER
+
+# 이름 → 들어갈 상자 크기 (w, h). 작은 것부터
+THUMB_SIZES: Dict[str, Tuple[int, int]] = {
+    "table": (300, 100),
+    "tooltip": (640, 640),
+    "shotgrid": (1920, 1080),
+}
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+_SAMPLE_BYTES = 64 * 1024
+_PRUNE_EVERY = 512          # 썸네일 몇 개 저장할 때마다 용량 검사할지
+
+
+class ThumbnailStore:
+    def __init__(self, root=None, sizes: Dict[str, Tuple[int, int]] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES, variant: str = DEFAULT_TRANSFER):
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR / "thumbs"
+        self.sizes = dict(sizes or THUMB_SIZES)
+        self.max_bytes = max_bytes
+        self.variant = variant                  # display transform 이름 – 바뀌면 다른 key
+        self._keys: Dict[tuple, str] = {}      # (dev, inode, size, mtime_ns) → key (세션 내 재계산 방지)
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------
+    def key(self, source) -> Optional[str]:
+        """원본 프레임의 내용 key. 파일이 없으면 None"""
+        source = str(source)
+        try:
+            st = os.stat(source)
+        except OSError:
+            return None
+        ident = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            key = self._keys.get(ident)
+        if key is not None:
+            return key
+
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{self.variant}:{st.st_size}:{st.st_mtime_ns}:".encode())
+        try:
+            with open(source, "rb") as fh:
+                h.update(fh.read(_SAMPLE_BYTES))
+        except OSError:
+            return None
+        key = h.hexdigest()
+        with self._lock:
+            self._keys[ident] = key
+        return key
+
+    def path(self, key: str, size_name: str) -> Path:
+        return self.root / key[:2] / f"{key}.{size_name}.jpg"
+
+    def get(self, source, size_name: str = "table") -> Optional[str]:
+        key = self.key(source)
+        if key is None:
+            return None
+        path = self.path(key, size_name)
+        return str(path) if path.exists() else None
+
+    def ensure(self, source, size_name: str, read_rgb: Callable[[int], np.ndarray]) -> Optional[str]:
+        """
+        size_name 썸네일 경로를 돌려준다. 없으면 read_rgb(긴 변 크기) 로 (h, w, 3) uint8 을 한 번 읽어
+        size_name 과 그보다 작은 크기들을 함께 저장한다.
+        """
+        key = self.key(source)
+        if key is None:
+            return None
+        path = self.path(key, size_name)
+        if path.exists():
+            return str(path)
+
+        box = self.sizes[size_name]
+        rgb = read_rgb(max(box))
+        if rgb is None:
+            return None
+        self._write_pyramid(key, Image.fromarray(np.asarray(rgb), mode="RGB"), upto=size_name)
+        return str(path) if path.exists() else None
+
+    def _write_pyramid(self, key: str, image: Image.Image, upto: str):
+        # 큰 크기부터 만들고 그 결과를 다시 줄여 다음 크기를 만든다 (원본을 여러 번 리샘플하지 않음)
+        names = list(self.sizes)
+        names = names[:names.index(upto) + 1]
+        self.path(key, upto).parent.mkdir(parents=True, exist_ok=True)
+        for name in reversed(names):
+            image.thumbnail(self.sizes[name], Image.BILINEAR, reducing_gap=2.0)
+            dst = self.path(key, name)
+            tmp = dst.with_suffix(f".{os.getpid()}.{threading.get_ident()}.part")
+            image.save(tmp, "JPEG", quality=90)
+            os.replace(tmp, dst)
+
+        with self._lock:
+            self._puts += 1
+            prune = self._puts % _PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def prune(self, max_bytes: int = None) -> int:
+        """전체 용량이 max_bytes 를 넘으면 오래 안 쓴(atime, 없으면 mtime) 썸네일부터 삭제"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        files = []
+        total = 0
+        for entry in self.root.glob("*/*.jpg"):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            files.append((max(st.st_atime, st.st_mtime), st.st_size, entry))
+            total += st.st_size
+        if total <= max_bytes:
+            return 0
+        removed = 0
+        target = int(max_bytes * 0.9)
+        for _, size, entry in sorted(files):
+            if total <= target:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        print(f"[INFO] 썸네일 캐시 정리: {removed}개 삭제")
+        return removed
+
+
+_DEFAULT_STORE = None
+
+
+def get_default_thumbnail_store() -> ThumbnailStore:
+    global _DEFAULT_STORE
+    if _DEFAULT_STORE is None:
+        _DEFAULT_STORE = ThumbnailStore()
+    return _DEFAULT_STORE
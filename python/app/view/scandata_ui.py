@@ -24,17 +24,43 @@ class Ui_Dialog(object):
         self.path_edit.setText(last_open_dir)
         self.browse_button = QtGui.QPushButton("Browse Folder")
         self.load_data_button = QtGui.QPushButton("Load")
+        # 켜 두면 Browse 한 폴더를 감시해 새로 들어온 / 바뀐 시퀀스만 테이블에 반영
+        self.watch_check = QtGui.QCheckBox("Watch")
+
+        # Browse 스캔 진행 표시 + 취소 (스캔 중에만 보임)
+        self.scan_progress = QtGui.QProgressBar()
+        self.scan_progress.setFixedWidth(150)
+        self.scan_progress.setVisible(False)
+        self.scan_cancel_button = QtGui.QPushButton("Cancel")
+        self.scan_cancel_button.setVisible(False)
         
         path_layout.addWidget(label)
         path_layout.addWidget(self.path_edit)
         path_layout.addWidget(self.browse_button)
         path_layout.addWidget(self.load_data_button)
+        path_layout.addWidget(self.watch_check)
+        path_layout.addWidget(self.scan_progress)
+        path_layout.addWidget(self.scan_cancel_button)
         
         main_layout.addLayout(path_layout)
+
+        # 검색 / 필터 바 (문법은 model/sequence_index.py 참고)
+        search_layout = QtGui.QHBoxLayout()
+        self.search_edit = QtGui.QLineEdit()
+        self.search_edit.setPlaceholderText(
+            "SH010  seq:S01  is:checked  -is:published  frames>100  date>=2024-05-01")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_count = QtGui.QLabel("")
+        search_layout.addWidget(QtGui.QLabel("Search:"))
+        search_layout.addWidget(self.search_edit)
+        search_layout.addWidget(self.search_count)
+        main_layout.addLayout(search_layout)
         
-        # 테이블 위젯
-        self.table = QtGui.QTableWidget()
-        self.table.horizontalHeader().setSectionResizeMode(QtGui.QHeaderView.ResizeToContents)
+        # 테이블 (model 은 controller 에서 연결 – controller/table_model.py)
+        # ResizeToContents 는 행이 바뀔 때마다 모든 행을 다시 재므로 Interactive + 채운 뒤 한 번 맞춤
+        self.table = QtGui.QTableView()
+        self.table.horizontalHeader().setSectionResizeMode(QtGui.QHeaderView.Interactive)
+        self.table.verticalHeader().setSectionResizeMode(QtGui.QHeaderView.Fixed)
         self.table.setHorizontalScrollBarPolicy(QtGui.Qt.ScrollBarAsNeeded)
         self.table.setSizeAdjustPolicy(QtGui.QAbstractScrollArea.AdjustToContents)
         self.table.setHorizontalScrollMode(QtGui.QAbstractItemView.ScrollPerPixel)
@@ -52,6 +78,7 @@ class Ui_Dialog(object):
         self.excel_save = QtGui.QPushButton("Save")
         self.excel_edit = QtGui.QPushButton("Edit")
         self.publish_button = QtGui.QPushButton("Publish")
+        self.cache_clear_button = QtGui.QPushButton("Clear Cache")
   
        # ── Validate 라벨 + 버튼 그룹
         validate_group = QtGui.QVBoxLayout()  # 상단에 라벨 + 아래에 프레임
@@ -76,12 +103,14 @@ class Ui_Dialog(object):
         self.validate_version     = QtGui.QPushButton("Version")
         self.validate_src_version = QtGui.QPushButton("Source Ver")
         self.validate_editorial   = QtGui.QPushButton("Editorial")
+        self.validate_frames      = QtGui.QPushButton("Frames")
 
         # 버튼 크기 넉넉히 조절
         for btn in (self.validate_timecode,
                     self.validate_version,
                     self.validate_src_version,
-                    self.validate_editorial):
+                    self.validate_editorial,
+                    self.validate_frames):
             btn.setFixedSize(90, 26)
 
         # 버튼 2행 배치
@@ -89,6 +118,7 @@ class Ui_Dialog(object):
         grid_layout.addWidget(self.validate_version,     0, 1)
         grid_layout.addWidget(self.validate_src_version, 1, 0)
         grid_layout.addWidget(self.validate_editorial,   1, 1)
+        grid_layout.addWidget(self.validate_frames,      0, 2)
 
         validate_group.addWidget(validate_wrap)
 
@@ -100,6 +130,7 @@ class Ui_Dialog(object):
         bottom_layout.addWidget(self.excel_save)
         bottom_layout.addWidget(self.excel_edit)
         bottom_layout.addWidget(self.publish_button)
+        bottom_layout.addWidget(self.cache_clear_button)
         bottom_layout.addWidget(validate_wrap) 
         bottom_layout.addWidget(self.status_line)
         
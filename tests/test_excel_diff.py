@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+model/excel_diff.py 의 시트 XML 패치 회귀 테스트.
+
+    python -m pytest tests
+
+app 패키지는 sgtk 를 import 하므로 benchmarks 와 같이 모듈 파일만 직접 로드한다.
+"""
+import sys
+import zipfile
+import importlib.util
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+NS = {"m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def _load(name, rel_path):
+    spec = importlib.util.spec_from_file_location(name, ROOT / rel_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+excel_diff = _load("excel_diff", "python/app/model/excel_diff.py")
+CellChange = excel_diff.CellChange
+ExcelPatchError = excel_diff.ExcelPatchError
+
+
+def _sheet(rows_xml: str) -> bytes:
+    return (f'<worksheet xmlns="{NS["m"]}"><sheetData>{rows_xml}</sheetData></worksheet>').encode("utf-8")
+
+
+def _change(ref_row: int, col: int, new: str, old: str = "") -> CellChange:
+    # ref_row 는 엑셀 행 번호 (헤더가 1행이므로 데이터 행 = ref_row - 2)
+    return CellChange(ref_row - 2, col, f"col{col}", old, new)
+
+
+def _cells(xml: bytes, row_num: int) -> list:
+    root = ElementTree.fromstring(xml)
+    row = root.find(f"m:sheetData/m:row[@r='{row_num}']", NS)
+    return list(row.findall("m:c", NS))
+
+
+def _text(cell) -> str:
+    return "".join(t.text or "" for t in cell.iter(f"{{{NS['m']}}}t"))
+
+
+# ─── patch_sheet_xml ───────────────────────────────────────────
+def test_self_closing_row_gets_cell():
+    xml = _sheet('<row r="1"><c r="A1" t="inlineStr"><is><t>SEQ</t></is></c></row><row r="2"/>')
+    out = excel_diff.patch_sheet_xml(xml, [_change(2, 1, "S01")])
+    cells = _cells(out, 2)
+    assert [c.get("r") for c in cells] == ["B2"]
+    assert _text(cells[0]) == "S01"
+
+
+def test_missing_cells_are_inserted_in_column_order():
+    xml = _sheet('<row r="2"><c r="A2"><v>1</v></c><c r="C2"><v>3</v></c></row>')
+    out = excel_diff.patch_sheet_xml(xml, [_change(2, 27, "aa"), _change(2, 1, "b"), _change(2, 3, "d")])
+    assert [c.get("r") for c in _cells(out, 2)] == ["A2", "B2", "C2", "D2", "AB2"]
+
+
+def test_missing_row_raises():
+    xml = _sheet('<row r="2"><c r="A2"><v>1</v></c></row>')
+    with pytest.raises(ExcelPatchError):
+        excel_diff.patch_sheet_xml(xml, [_change(5, 0, "x")])
+
+
+def test_style_is_kept_on_replaced_cell():
+    xml = _sheet('<row r="2"><c r="A2" s="7" t="s"><v>0</v></c><c r="B2" s="3"><v>2</v></c></row>')
+    out = excel_diff.patch_sheet_xml(xml, [_change(2, 0, "new")])
+    a2, b2 = _cells(out, 2)
+    assert a2.get("s") == "7" and a2.get("t") == "inlineStr" and _text(a2) == "new"
+    assert b2.get("s") == "3"
+
+
+def test_text_is_escaped_and_kept_as_string():
+    xml = _sheet('<row r="2"><c r="A2"><v>1</v></c></row>')
+    value = ' <a> & "b" 1.50 '
+    out = excel_diff.patch_sheet_xml(xml, [_change(2, 0, value), _change(2, 1, "1.50")])
+    a2, b2 = _cells(out, 2)
+    assert _text(a2) == value
+    assert b2.get("t") == "inlineStr" and _text(b2) == "1.50"
+
+
+def test_empty_value_clears_cell_but_keeps_style():
+    xml = _sheet('<row r="2"><c r="A2" s="2"><v>1</v></c></row>')
+    out = excel_diff.patch_sheet_xml(xml, [_change(2, 0, "")])
+    (a2,) = _cells(out, 2)
+    assert a2.get("s") == "2" and a2.get("t") is None and len(a2) == 0
+
+
+def test_formula_cell_raises():
+    xml = _sheet('<row r="2"><c r="A2"><f>1+1</f><v>2</v></c></row>')
+    with pytest.raises(ExcelPatchError):
+        excel_diff.patch_sheet_xml(xml, [_change(2, 0, "3")])
+
+
+def test_untouched_rows_are_copied_byte_for_byte():
+    other = '<row r="3" spans="1:2"><c r="A3" s="1"><v>9</v></c></row>'
+    xml = _sheet('<row r="2"><c r="A2"><v>1</v></c></row>' + other)
+    out = excel_diff.patch_sheet_xml(xml, [_change(2, 0, "x")])
+    assert other.encode("utf-8") in out
+
+
+# ─── patch_xlsx ────────────────────────────────────────────────
+@pytest.fixture
+def workbook(tmp_path):
+    excel = _load("excel", "python/app/model/excel.py")
+    path = tmp_path / "metadata_S01_v001.xlsx"
+    excel.write_rows(path, ["SEQ", "SHOT", "VER"], [("S01", "S01_SH0010", "v001"), ("S01", "S01_SH0020", None)])
+    return excel, path
+
+
+def test_patch_xlsx_round_trip(workbook, tmp_path):
+    excel, src = workbook
+    dst = tmp_path / "metadata_S01_v002.xlsx"
+    excel_diff.patch_xlsx(src, dst, [CellChange(0, 2, "VER", "v001", "v002"),
+                                     CellChange(1, 2, "VER", "", "a & <b>")])
+    rows = list(excel.iter_rows(dst))
+    assert rows == [("SEQ", "SHOT", "VER"), ("S01", "S01_SH0010", "v002"), ("S01", "S01_SH0020", "a & <b>")]
+    assert list(excel.iter_rows(src))[1][2] == "v001"        # 이전 버전은 그대로
+
+
+def test_patch_xlsx_formula_leaves_no_output(workbook, tmp_path):
+    # 수식 셀이면 ExcelPatchError → 호출하는 쪽(ExcelController)이 전체 저장으로 대신한다
+    _, src = workbook
+    formula = tmp_path / "formula.xlsx"
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(formula, "w") as zout:
+        sheet = excel_diff._first_sheet_member(zin)
+        for info in zin.infolist():
+            data = zin.read(info)
+            if info.filename == sheet:
+                start = data.index(b'<c r="C2"')
+                end = data.index(b"</c>", start) + len(b"</c>")
+                data = data[:start] + b'<c r="C2"><f>"v"&amp;"001"</f><v>v001</v></c>' + data[end:]
+            zout.writestr(info, data)
+    dst = tmp_path / "metadata_S01_v002.xlsx"
+    with pytest.raises(ExcelPatchError):
+        excel_diff.patch_xlsx(formula, dst, [CellChange(0, 2, "VER", "v001", "v002")])
+    assert not dst.exists()
+    assert not dst.with_name(dst.name + ".tmp").exists()